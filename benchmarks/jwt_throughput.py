@@ -0,0 +1,77 @@
+"""
+Пропускная способность подписи и проверки JWT для RS256, ES256 и EdDSA.
+
+Для каждого алгоритма сравнивается ключ в виде PEM (разбирается PyJWT на каждый вызов) и заранее разобранный ключ
+cryptography, для проверки - также кэш проверенных токенов JWTokenManager. Ключи генерируются в памяти.
+
+Запуск:
+    python -m benchmarks.jwt_throughput --iterations 2000
+"""
+
+import argparse
+import datetime
+import time
+from typing import Callable
+
+import jwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+
+from src.auth.services.token_service import JWTokenManager
+from src.core.config import settings
+
+KEY_FACTORIES = {
+    "RS256": lambda: rsa.generate_private_key(public_exponent=65537, key_size=2048),
+    "ES256": lambda: ec.generate_private_key(ec.SECP256R1()),
+    "EdDSA": ed25519.Ed25519PrivateKey.generate,
+}
+
+PAYLOAD = {"type": "access", "sub": "1", "username": "reader", "role": "reader", "ver": 0}
+
+
+def to_pem(private_key) -> tuple[str, str]:
+    private_pem = private_key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    )
+    public_pem = private_key.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    )
+    return private_pem.decode(), public_pem.decode()
+
+
+def measure(operation: Callable[[], object], iterations: int) -> float:
+    """Количество операций в секунду."""
+    started = time.perf_counter()
+    for _ in range(iterations):
+        operation()
+    return iterations / (time.perf_counter() - started)
+
+
+def main(iterations: int) -> None:
+    payload = {**PAYLOAD, "exp": datetime.datetime.now(datetime.UTC) + datetime.timedelta(hours=1)}
+    print(f"{'algorithm':<10}{'operation':<16}{'pem ops/s':>12}{'key ops/s':>12}{'cached ops/s':>14}")
+    for algorithm, key_factory in KEY_FACTORIES.items():
+        private_key = key_factory()
+        public_key = private_key.public_key()
+        private_pem, public_pem = to_pem(private_key)
+        token = jwt.encode(payload, private_key, algorithm=algorithm)
+
+        sign_pem = measure(lambda: jwt.encode(payload, private_pem, algorithm=algorithm), iterations)
+        sign_key = measure(lambda: jwt.encode(payload, private_key, algorithm=algorithm), iterations)
+        print(f"{algorithm:<10}{'sign':<16}{sign_pem:>12.0f}{sign_key:>12.0f}{'-':>14}")
+
+        manager = JWTokenManager(verified_cache_size=1)
+        # Ключ подставляется вместо ключей из настроек.
+        manager.__dict__["public_keys"] = {settings.auth_jwt.key_id: public_key}
+        manager.decode_jwt(token)
+        verify_pem = measure(lambda: jwt.decode(token, public_pem, algorithms=[algorithm]), iterations)
+        verify_key = measure(lambda: jwt.decode(token, public_key, algorithms=[algorithm]), iterations)
+        verify_cached = measure(lambda: manager.decode_jwt(token), iterations)
+        print(f"{algorithm:<10}{'verify':<16}{verify_pem:>12.0f}{verify_key:>12.0f}{verify_cached:>14.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+    main(iterations=args.iterations)
@@ -0,0 +1,73 @@
+import asyncio
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import pool
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.core.config import settings
+from src.core.models.registry import Base
+
+config = context.config
+
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def get_url() -> str:
+    """
+    Адрес базы данных: sqlalchemy.url из конфигурации alembic (если задан), иначе settings.db.url.
+    """
+    return config.get_main_option("sqlalchemy.url") or settings.db.url
+
+
+def run_migrations_offline() -> None:
+    """
+    Генерация SQL миграций без подключения к базе данных (alembic upgrade --sql).
+    """
+    context.configure(
+        url=get_url(),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def do_run_migrations(connection: Connection) -> None:
+    # Транзакция на каждую миграцию: блоки autocommit_block (CREATE INDEX CONCURRENTLY) фиксируют только свою миграцию.
+    context.configure(connection=connection, target_metadata=target_metadata, transaction_per_migration=True)
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+async def run_async_migrations() -> None:
+    engine = create_async_engine(get_url(), poolclass=pool.NullPool)
+    async with engine.connect() as connection:
+        await connection.run_sync(do_run_migrations)
+
+    await engine.dispose()
+
+
+def run_migrations_online() -> None:
+    """
+    Применение миграций. Если в config.attributes передано соединение (connection), используется оно,
+    иначе создаётся отдельный движок.
+    """
+    connection = config.attributes.get("connection")
+    if connection is None:
+        asyncio.run(run_async_migrations())
+    else:
+        do_run_migrations(connection)
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
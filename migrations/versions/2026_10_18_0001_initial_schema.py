@@ -0,0 +1,82 @@
+"""initial schema
+
+Схема, которую создавал Base.metadata.create_all до перехода на миграции.
+Для существующей базы данных: alembic stamp 0001, затем alembic upgrade head.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 03:25:19.371047
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "authors",
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("biography", sa.String(), nullable=False),
+        sa.Column("birth_date", sa.Date(), nullable=False),
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("name", "birth_date"),
+    )
+    op.create_table(
+        "users",
+        sa.Column("username", sa.String(length=50), nullable=False),
+        sa.Column("hashed_password", postgresql.BYTEA(), nullable=False),
+        sa.Column(
+            "role",
+            sa.Enum("READER", "ADMIN", name="permissionsenum"),
+            server_default=sa.text("'READER'"),
+            nullable=False,
+        ),
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("username"),
+    )
+    op.create_table(
+        "books",
+        sa.Column("title", sa.String(), nullable=False),
+        sa.Column("description", sa.String(), nullable=False),
+        sa.Column("genres", sa.String(), nullable=False),
+        sa.Column("publication_date", sa.Date(), nullable=False),
+        sa.Column("available", sa.Integer(), sa.CheckConstraint("available >= 0"), nullable=False),
+        sa.Column("author_id", sa.Integer(), nullable=False),
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.ForeignKeyConstraint(["author_id"], ["authors.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("title", "author_id"),
+    )
+    op.create_table(
+        "borrows",
+        sa.Column("borrow_date", sa.DateTime(), server_default=sa.text("now()"), nullable=False),
+        sa.Column("return_date", sa.DateTime(), nullable=True),
+        sa.Column("book_id", sa.Integer(), nullable=False),
+        sa.Column("reader_id", sa.Integer(), nullable=False),
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.ForeignKeyConstraint(["book_id"], ["books.id"]),
+        sa.ForeignKeyConstraint(["reader_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("borrows")
+    op.drop_table("books")
+    op.drop_table("users")
+    op.drop_table("authors")
+    sa.Enum(name="permissionsenum").drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,130 @@
+"""indexes, book copies and active borrow counters
+
+Индексы для фильтрации (в том числе text_pattern_ops для оператора prefix) и выдач, учёт по экземплярам (book_copies) и счётчик users.active_borrows.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 03:40:02.118204
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, Sequence[str], None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("books", sa.Column("tracks_copies", sa.Boolean(), server_default=sa.text("false"), nullable=False))
+    op.create_table(
+        "book_copies",
+        sa.Column("book_id", sa.Integer(), nullable=False),
+        sa.Column("is_available", sa.Boolean(), server_default=sa.text("true"), nullable=False),
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.ForeignKeyConstraint(["book_id"], ["books.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_book_copies_available", "book_copies", ["book_id"], unique=False, postgresql_where=sa.text("is_available")
+    )
+    op.create_index(op.f("ix_book_copies_book_id"), "book_copies", ["book_id"], unique=False)
+    op.add_column("borrows", sa.Column("copy_id", sa.Integer(), nullable=True))
+    op.create_foreign_key("borrows_copy_id_fkey", "borrows", "book_copies", ["copy_id"], ["id"])
+
+    op.add_column("users", sa.Column("active_borrows", sa.Integer(), server_default=sa.text("0"), nullable=False))
+    op.create_check_constraint("users_active_borrows_check", "users", "active_borrows >= 0")
+    op.execute(
+        "UPDATE users SET active_borrows = active.count "
+        "FROM (SELECT reader_id, count(*) FROM borrows WHERE return_date IS NULL GROUP BY reader_id) AS active "
+        "WHERE users.id = active.reader_id"
+    )
+
+    # Индексы существующих таблиц строятся CREATE INDEX CONCURRENTLY, без блокировки записи (SHARE) на время
+    # построения. CONCURRENTLY не выполняется в транзакции, поэтому предыдущие изменения фиксируются до блока.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            op.f("ix_authors_birth_date"), "authors", ["birth_date"], unique=False, postgresql_concurrently=True
+        )
+        op.create_index(
+            "ix_authors_name_pattern",
+            "authors",
+            ["name"],
+            unique=False,
+            postgresql_ops={"name": "text_pattern_ops"},
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_books_title_pattern",
+            "books",
+            ["title"],
+            unique=False,
+            postgresql_ops={"title": "text_pattern_ops"},
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_users_username_pattern",
+            "users",
+            ["username"],
+            unique=False,
+            postgresql_ops={"username": "text_pattern_ops"},
+            postgresql_concurrently=True,
+        )
+        op.create_index(op.f("ix_books_author_id"), "books", ["author_id"], unique=False, postgresql_concurrently=True)
+        op.create_index(op.f("ix_books_available"), "books", ["available"], unique=False, postgresql_concurrently=True)
+        op.create_index(
+            op.f("ix_books_publication_date"), "books", ["publication_date"], unique=False, postgresql_concurrently=True
+        )
+        op.create_index(op.f("ix_borrows_book_id"), "borrows", ["book_id"], unique=False, postgresql_concurrently=True)
+        op.create_index(
+            op.f("ix_borrows_borrow_date"), "borrows", ["borrow_date"], unique=False, postgresql_concurrently=True
+        )
+        op.create_index(
+            "ix_borrows_active_reader_id",
+            "borrows",
+            ["reader_id"],
+            unique=False,
+            postgresql_where=sa.text("return_date IS NULL"),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_borrows_reader_id_borrow_date",
+            "borrows",
+            ["reader_id", sa.literal_column("borrow_date DESC")],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(op.f("ix_borrows_copy_id"), "borrows", ["copy_id"], unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(op.f("ix_borrows_copy_id"), table_name="borrows", postgresql_concurrently=True)
+        op.drop_index("ix_borrows_reader_id_borrow_date", table_name="borrows", postgresql_concurrently=True)
+        op.drop_index("ix_borrows_active_reader_id", table_name="borrows", postgresql_concurrently=True)
+        op.drop_index(op.f("ix_borrows_borrow_date"), table_name="borrows", postgresql_concurrently=True)
+        op.drop_index(op.f("ix_borrows_book_id"), table_name="borrows", postgresql_concurrently=True)
+        op.drop_index(op.f("ix_books_publication_date"), table_name="books", postgresql_concurrently=True)
+        op.drop_index(op.f("ix_books_available"), table_name="books", postgresql_concurrently=True)
+        op.drop_index(op.f("ix_books_author_id"), table_name="books", postgresql_concurrently=True)
+        op.drop_index("ix_users_username_pattern", table_name="users", postgresql_concurrently=True)
+        op.drop_index("ix_books_title_pattern", table_name="books", postgresql_concurrently=True)
+        op.drop_index("ix_authors_name_pattern", table_name="authors", postgresql_concurrently=True)
+        op.drop_index(op.f("ix_authors_birth_date"), table_name="authors", postgresql_concurrently=True)
+
+    op.drop_constraint("users_active_borrows_check", "users", type_="check")
+    op.drop_column("users", "active_borrows")
+
+    op.drop_constraint("borrows_copy_id_fkey", "borrows", type_="foreignkey")
+    op.drop_column("borrows", "copy_id")
+    op.drop_index(op.f("ix_book_copies_book_id"), table_name="book_copies")
+    op.drop_index("ix_book_copies_available", table_name="book_copies")
+    op.drop_table("book_copies")
+    op.drop_column("books", "tracks_copies")
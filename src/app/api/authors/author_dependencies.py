@@ -18,3 +18,29 @@ async def get_author_service(session: AsyncSession = Depends(db.session_getter))
     """
     author_repository = AuthorRepository(session=session)
     return AuthorService(author_repository=author_repository)
+
+
+async def get_bulk_author_service(session: AsyncSession = Depends(db.bulk_session_getter)) -> AuthorService:
+    """
+    Получение сервиса для работы с авторами с сессией пула bulk (пакетные операции).
+
+    Args:
+        session (AsyncSession): Асинхронная сессия базы данных.
+
+    Returns:
+        AuthorService: Экземпляр сервиса для работы с авторами.
+    """
+    return await get_author_service(session=session)
+
+
+async def get_read_author_service(session: AsyncSession = Depends(db.read_session_getter)) -> AuthorService:
+    """
+    Получение сервиса для работы с авторами с сессией для чтения (реплика или primary).
+
+    Args:
+        session (AsyncSession): Асинхронная сессия базы данных.
+
+    Returns:
+        AuthorService: Экземпляр сервиса для работы с авторами.
+    """
+    return await get_author_service(session=session)
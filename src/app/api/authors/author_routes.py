@@ -1,13 +1,23 @@
-from fastapi import APIRouter, Depends, status
+from typing import Annotated
 
-from src.app.api.authors.author_dependencies import get_author_service
+from fastapi import APIRouter, Body, Depends, Query, status
+
+from src.app.api.authors.author_dependencies import (
+    get_author_service,
+    get_bulk_author_service,
+    get_read_author_service,
+)
 from src.app.models.author_model import Author
-from src.app.schemas.author_schema import AuthorCreate, AuthorUpdate, AuthorPagination, AuthorDB
+from src.app.schemas.author_schema import AuthorCreate, AuthorUpdate, AuthorPagination, AuthorDB, AuthorDBPartial
 from src.app.services.author_service import AuthorService
 
 from src.auth.api.auth_dependencies import has_reader_permissions, has_admin_permissions
+from src.core.dependencies.export_dependencies import get_exporter
 from src.core.dependencies.fetcher_dependencies import get_paginated_fetcher
 from src.core.models.user_model import User
+from src.core.schemas.batch_schema import MAX_BATCH_SIZE, BatchDelete, BatchResult
+from src.core.schemas.pagination_schema import FieldsParams
+from src.core.services.exporter import Exporter
 from src.core.services.paginated_fetcher import PaginatedFetcher
 
 router = APIRouter(prefix="/authors", tags=["API для управления авторами."])
@@ -45,6 +55,7 @@ async def create_author_endpoint(
     "/",
     summary="Получение всех авторов",
     response_model=AuthorPagination,
+    response_model_exclude_unset=True,
     status_code=status.HTTP_200_OK,
 )
 async def get_authors_endpoint(
@@ -59,9 +70,14 @@ async def get_authors_endpoint(
     + **Description**: Возвращает список всех авторов из базы данных с пагинацией и фильтрацией.
     + **Parameters**:
         - **limit** (int) - Количество объектов для пагинации.
-        - **offset** (int) - Начальный индекс для пагинации.
+        - **offset** (int, optional) - Начальный индекс для пагинации.
+        - **after** (str, optional) - Курсор из nextCursor предыдущего ответа, заменяет offset.
+        - **include_total** (bool, optional) - Считать ли totalCount (по умолчанию true).
+        - **approximate_total** (bool, optional) - Приблизительный totalCount для списка без фильтра.
         - **field** (str, optional) - Поле для фильтрации.
         - **value** (Any, optional) - Значение для фильтрации.
+        - **filter** (list[str], optional) - Условия field:operator:value, объединяемые через AND.
+        - **fields** (str, optional) - Поля ответа через запятую (id возвращается всегда).
     + **Response**: **AuthorPagination** (List[AuthorDB])
     + **Status Code**: 200 OK
     + **Errors**:
@@ -70,15 +86,123 @@ async def get_authors_endpoint(
     return await paginated_fetcher.get_paginated_list(model=Author)
 
 
+@router.post(
+    "/batch/",
+    summary="Пакетное добавление авторов",
+    response_model=BatchResult,
+    status_code=status.HTTP_200_OK,
+)
+async def create_authors_batch_endpoint(
+    authors_in: Annotated[list[AuthorCreate], Body(min_length=1, max_length=MAX_BATCH_SIZE)],
+    author_service: AuthorService = Depends(get_bulk_author_service),
+    user: User = Depends(has_admin_permissions),
+):
+    """
+    ### Пакетное добавление авторов
+    ----------------
+
+    * **POST /authors/batch/**
+    + **Description**: Добавляет до MAX_BATCH_SIZE авторов одним запросом. Дубликаты не отменяют добавление остальных.
+    + **Request**: **List[AuthorCreate]**
+    + **Response**: **BatchResult** (статус created, conflict или not_found для каждого элемента)
+    + **Status Code**: 200 OK
+    + **Errors**:
+        - **401 (Unauthorized):** Пользователь не авторизован.
+        - **403 (Forbidden):** Пользователь не имеет прав администратора.
+    """
+    return await author_service.bulk_create(objs_in=authors_in, user=user)
+
+
+@router.put(
+    "/batch/",
+    summary="Пакетное обновление авторов",
+    response_model=BatchResult,
+    status_code=status.HTTP_200_OK,
+)
+async def update_authors_batch_endpoint(
+    authors_in: Annotated[list[AuthorUpdate], Body(min_length=1, max_length=MAX_BATCH_SIZE)],
+    author_service: AuthorService = Depends(get_bulk_author_service),
+    user: User = Depends(has_admin_permissions),
+):
+    """
+    ### Пакетное обновление авторов
+    ----------------
+
+    * **PUT /authors/batch/**
+    + **Description**: Обновляет до MAX_BATCH_SIZE авторов одним запросом.
+    + **Request**: **List[AuthorUpdate]**
+    + **Response**: **BatchResult** (статус updated, conflict или not_found для каждого элемента)
+    + **Status Code**: 200 OK
+    + **Errors**:
+        - **401 (Unauthorized):** Пользователь не авторизован.
+        - **403 (Forbidden):** Пользователь не имеет прав администратора.
+    """
+    return await author_service.bulk_update(objs_in=authors_in, user=user)
+
+
+@router.post(
+    "/batch/delete/",
+    summary="Пакетное удаление авторов",
+    response_model=BatchResult,
+    status_code=status.HTTP_200_OK,
+)
+async def delete_authors_batch_endpoint(
+    batch_in: BatchDelete,
+    author_service: AuthorService = Depends(get_bulk_author_service),
+    user: User = Depends(has_admin_permissions),
+):
+    """
+    ### Пакетное удаление авторов
+    ----------------
+
+    * **POST /authors/batch/delete/**
+    + **Description**: Удаляет авторов по списку ID одним запросом.
+    + **Request**: **BatchDelete**
+    + **Response**: **BatchResult** (статус deleted, conflict или not_found для каждого элемента)
+    + **Status Code**: 200 OK
+    + **Errors**:
+        - **401 (Unauthorized):** Пользователь не авторизован.
+        - **403 (Forbidden):** Пользователь не имеет прав администратора.
+    """
+    return await author_service.bulk_delete(ids=batch_in.ids, user=user)
+
+
+@router.get(
+    "/export/",
+    summary="Выгрузка всех авторов",
+    status_code=status.HTTP_200_OK,
+)
+async def export_authors_endpoint(
+    exporter: Exporter = Depends(get_exporter),
+    user: User = Depends(has_reader_permissions),
+):
+    """
+    ### Выгрузка всех авторов
+    ----------------------
+
+    * **GET /authors/export/**
+    + **Description**: Потоково выгружает все авторов из базы данных, отсортированные по id.
+    + **Parameters**:
+        - **format** (str, optional) - Формат выгрузки: ndjson (по умолчанию) или csv.
+    + **Response**: Файл NDJSON (AuthorDB на строку) или CSV с заголовком.
+    + **Status Code**: 200 OK
+    + **Errors**:
+        - **401 (Unauthorized):** Пользователь не авторизован.
+    """
+    return exporter.get_response(model=Author, schema=AuthorDB, filename="authors")
+
+
 @router.get(
     "/{author_id}/",
     summary="Получение информации об авторе",
-    response_model=AuthorDB,
+    response_model=AuthorDBPartial,
+    response_model_exclude_unset=True,
     status_code=status.HTTP_200_OK,
 )
 async def get_author_endpoint(
     author_id: int,
-    author_service: AuthorService = Depends(get_author_service),
+    fields_params: Annotated[FieldsParams, Query()],
+    author_service: AuthorService = Depends(get_read_author_service),
     user: User = Depends(has_reader_permissions),
 ):
     """
@@ -89,13 +213,14 @@ async def get_author_endpoint(
     + **Description**: Возвращает информацию об авторе по входящему ID.
     + **Parameters**:
         - **author_id** (int) - ID автора
+        - **fields** (str, optional) - Поля ответа через запятую (id возвращается всегда).
     + **Response**: **AuthorDB**
     + **Status Code**: 200 OK
     + **Errors**:
         - **401 (Unauthorized):** Пользователь не авторизован.
         - **404 (Not Found)**: Автор с указанным ID не найден.
     """
-    return await author_service.get_obj_by_id_or_404(obj_id=author_id)
+    return await author_service.get_obj_by_id_or_404(obj_id=author_id, fields=fields_params.get_fields())
 
 
 @router.put(
@@ -34,3 +34,29 @@ async def get_book_service_with_author(session: AsyncSession = Depends(db.sessio
     book_repository = BookRepository(session=session)
     author_service = await get_author_service(session=session)
     return BookService(book_repository=book_repository, author_service=author_service)
+
+
+async def get_bulk_book_service_with_author(session: AsyncSession = Depends(db.bulk_session_getter)) -> BookService:
+    """
+    Получение сервиса для работы с книгами с сервисом авторов и сессией пула bulk (пакетные операции).
+
+    Args:
+        session (AsyncSession): Асинхронная сессия базы данных.
+
+    Returns:
+        BookService: Сервис для работы с книгами.
+    """
+    return await get_book_service_with_author(session=session)
+
+
+async def get_read_book_service(session: AsyncSession = Depends(db.read_session_getter)) -> BookService:
+    """
+    Получение сервиса для работы с книгами с сессией для чтения (реплика или primary).
+
+    Args:
+        session (AsyncSession): Асинхронная сессия базы данных.
+
+    Returns:
+        BookService: Сервис для работы с книгами.
+    """
+    return await get_book_service(session=session)
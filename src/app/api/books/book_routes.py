@@ -1,12 +1,23 @@
-from fastapi import APIRouter, Depends, status
+from typing import Annotated
 
-from src.app.api.books.book_dependencies import get_book_service, get_book_service_with_author
+from fastapi import APIRouter, Body, Depends, Query, status
+
+from src.app.api.books.book_dependencies import (
+    get_book_service,
+    get_book_service_with_author,
+    get_bulk_book_service_with_author,
+    get_read_book_service,
+)
 from src.app.models.book_model import Book
-from src.app.schemas.book_schema import BookCreate, BookUpdate, BookPagination, BookDB
+from src.app.schemas.book_schema import BookCopiesCreate, BookCreate, BookUpdate, BookPagination, BookDB, BookDBPartial
 from src.app.services.book_service import BookService
 from src.auth.api.auth_dependencies import has_reader_permissions, has_admin_permissions
+from src.core.dependencies.export_dependencies import get_exporter
 from src.core.dependencies.fetcher_dependencies import get_paginated_fetcher
 from src.core.models.user_model import User
+from src.core.schemas.batch_schema import MAX_BATCH_SIZE, BatchDelete, BatchResult
+from src.core.schemas.pagination_schema import FieldsParams
+from src.core.services.exporter import Exporter
 from src.core.services.paginated_fetcher import PaginatedFetcher
 
 router = APIRouter(prefix="/books", tags=["API для управления книгами."])
@@ -44,6 +55,7 @@ async def create_book_endpoint(
     "/",
     summary="Получение списка книг",
     response_model=BookPagination,
+    response_model_exclude_unset=True,
     status_code=status.HTTP_200_OK,
 )
 async def get_books_endpoint(
@@ -58,9 +70,14 @@ async def get_books_endpoint(
     + **Description**: Возвращает список всех книг из базы данных с пагинацией и фильтрацией.
     + **Parameters**:
         - **limit** (int) - Количество объектов для пагинации.
-        - **offset** (int) - Начальный индекс для пагинации.
+        - **offset** (int, optional) - Начальный индекс для пагинации.
+        - **after** (str, optional) - Курсор из nextCursor предыдущего ответа, заменяет offset.
+        - **include_total** (bool, optional) - Считать ли totalCount (по умолчанию true).
+        - **approximate_total** (bool, optional) - Приблизительный totalCount для списка без фильтра.
         - **field** (str, optional) - Поле для фильтрации.
         - **value** (Any, optional) - Значение для фильтрации.
+        - **filter** (list[str], optional) - Условия field:operator:value, объединяемые через AND.
+        - **fields** (str, optional) - Поля ответа через запятую (id возвращается всегда).
     + **Response**: **BookPagination**: (List[BookDB])
     + **Status Code**: 200 OK
     + **Errors**:
@@ -69,15 +86,123 @@ async def get_books_endpoint(
     return await paginated_fetcher.get_paginated_list(model=Book)
 
 
+@router.post(
+    "/batch/",
+    summary="Пакетное добавление книг",
+    response_model=BatchResult,
+    status_code=status.HTTP_200_OK,
+)
+async def create_books_batch_endpoint(
+    books_in: Annotated[list[BookCreate], Body(min_length=1, max_length=MAX_BATCH_SIZE)],
+    book_service: BookService = Depends(get_bulk_book_service_with_author),
+    user: User = Depends(has_admin_permissions),
+):
+    """
+    ### Пакетное добавление книг
+    ----------------
+
+    * **POST /books/batch/**
+    + **Description**: Добавляет до MAX_BATCH_SIZE книг одним запросом. Дубликаты не отменяют добавление остальных.
+    + **Request**: **List[BookCreate]**
+    + **Response**: **BatchResult** (статус created, conflict или not_found для каждого элемента)
+    + **Status Code**: 200 OK
+    + **Errors**:
+        - **401 (Unauthorized):** Пользователь не авторизован.
+        - **403 (Forbidden):** Пользователь не имеет прав администратора.
+    """
+    return await book_service.bulk_create(objs_in=books_in, user=user)
+
+
+@router.put(
+    "/batch/",
+    summary="Пакетное обновление книг",
+    response_model=BatchResult,
+    status_code=status.HTTP_200_OK,
+)
+async def update_books_batch_endpoint(
+    books_in: Annotated[list[BookUpdate], Body(min_length=1, max_length=MAX_BATCH_SIZE)],
+    book_service: BookService = Depends(get_bulk_book_service_with_author),
+    user: User = Depends(has_admin_permissions),
+):
+    """
+    ### Пакетное обновление книг
+    ----------------
+
+    * **PUT /books/batch/**
+    + **Description**: Обновляет до MAX_BATCH_SIZE книг одним запросом.
+    + **Request**: **List[BookUpdate]**
+    + **Response**: **BatchResult** (статус updated, conflict или not_found для каждого элемента)
+    + **Status Code**: 200 OK
+    + **Errors**:
+        - **401 (Unauthorized):** Пользователь не авторизован.
+        - **403 (Forbidden):** Пользователь не имеет прав администратора.
+    """
+    return await book_service.bulk_update(objs_in=books_in, user=user)
+
+
+@router.post(
+    "/batch/delete/",
+    summary="Пакетное удаление книг",
+    response_model=BatchResult,
+    status_code=status.HTTP_200_OK,
+)
+async def delete_books_batch_endpoint(
+    batch_in: BatchDelete,
+    book_service: BookService = Depends(get_bulk_book_service_with_author),
+    user: User = Depends(has_admin_permissions),
+):
+    """
+    ### Пакетное удаление книг
+    ----------------
+
+    * **POST /books/batch/delete/**
+    + **Description**: Удаляет книг по списку ID одним запросом.
+    + **Request**: **BatchDelete**
+    + **Response**: **BatchResult** (статус deleted, conflict или not_found для каждого элемента)
+    + **Status Code**: 200 OK
+    + **Errors**:
+        - **401 (Unauthorized):** Пользователь не авторизован.
+        - **403 (Forbidden):** Пользователь не имеет прав администратора.
+    """
+    return await book_service.bulk_delete(ids=batch_in.ids, user=user)
+
+
+@router.get(
+    "/export/",
+    summary="Выгрузка всех книг",
+    status_code=status.HTTP_200_OK,
+)
+async def export_books_endpoint(
+    exporter: Exporter = Depends(get_exporter),
+    user: User = Depends(has_reader_permissions),
+):
+    """
+    ### Выгрузка всех книг
+    ----------------------
+
+    * **GET /books/export/**
+    + **Description**: Потоково выгружает все книг из базы данных, отсортированные по id.
+    + **Parameters**:
+        - **format** (str, optional) - Формат выгрузки: ndjson (по умолчанию) или csv.
+    + **Response**: Файл NDJSON (BookDB на строку) или CSV с заголовком.
+    + **Status Code**: 200 OK
+    + **Errors**:
+        - **401 (Unauthorized):** Пользователь не авторизован.
+    """
+    return exporter.get_response(model=Book, schema=BookDB, filename="books")
+
+
 @router.get(
     "/{book_id}/",
     summary="Получение информации о книге",
-    response_model=BookDB,
+    response_model=BookDBPartial,
+    response_model_exclude_unset=True,
     status_code=status.HTTP_200_OK,
 )
 async def get_book_endpoint(
     book_id: int,
-    book_service: BookService = Depends(get_book_service),
+    fields_params: Annotated[FieldsParams, Query()],
+    book_service: BookService = Depends(get_read_book_service),
     user: User = Depends(has_reader_permissions),
 ):
     """
@@ -88,13 +213,46 @@ async def get_book_endpoint(
     + **Description**: Возвращает информацию о книге по входящему ID.
     + **Parameters**:
         - **book_id** (int) - Идентификатор книги
+        - **fields** (str, optional) - Поля ответа через запятую (id возвращается всегда).
     + **Response**: **BookDB**
     + **Status Code**: 200 OK
     + **Errors**:
         - **401 (Unauthorized):** Пользователь не авторизован.
         - **404 (Not Found)**: Книга с указанным ID не найдена.
     """
-    return await book_service.get_obj_by_id_or_404(obj_id=book_id)
+    return await book_service.get_obj_by_id_or_404(obj_id=book_id, fields=fields_params.get_fields())
+
+
+@router.post(
+    "/{book_id}/copies/",
+    summary="Добавление экземпляров книги",
+    response_model=BookDB,
+    status_code=status.HTTP_201_CREATED,
+)
+async def add_book_copies_endpoint(
+    book_id: int,
+    copies_in: BookCopiesCreate,
+    book_service: BookService = Depends(get_book_service),
+    user: User = Depends(has_admin_permissions),
+):
+    """
+    ### Добавление экземпляров книги
+    ----------------
+
+    * **POST /books/{book_id}/copies/**
+    + **Description**: Добавляет экземпляры книги и переводит книгу на учёт по экземплярам: выдача занимает
+        свободный экземпляр, available пересчитывается по свободным экземплярам периодически.
+    + **Parameters**:
+        - **book_id** (int) - Идентификатор книги
+    + **Request**: **BookCopiesCreate**
+    + **Response**: **BookDB**
+    + **Status Code**: 201 Created
+    + **Errors**:
+        - **401 (Unauthorized):** Пользователь не авторизован.
+        - **403 (Forbidden):** Пользователь не имеет прав администратора.
+        - **404 (Not Found)**: Книга с указанным ID не найдена.
+    """
+    return await book_service.add_copies(book_id=book_id, count=copies_in.count, user=user)
 
 
 @router.put(
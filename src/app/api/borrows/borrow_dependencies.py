@@ -1,7 +1,6 @@
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.app.api.books.book_dependencies import get_book_service
 from src.app.repository.borrow_repository import BorrowRepository
 from src.core.database.db import db
 from src.app.services.borrow_service import BorrowService
@@ -21,9 +20,9 @@ async def get_borrow_service(session: AsyncSession = Depends(db.session_getter))
     return BorrowService(borrow_repository=borrow_repository)
 
 
-async def get_borrow_service_with_book(session: AsyncSession = Depends(db.session_getter)) -> BorrowService:
+async def get_read_borrow_service(session: AsyncSession = Depends(db.read_session_getter)) -> BorrowService:
     """
-    Получение сервиса для работы с выдачами книг с внедрённой зависимостью, сервисом для работы с книгами
+    Получение сервиса для работы с выдачами книг с сессией для чтения (реплика или primary).
 
     Args:
         session (AsyncSession): Асинхронная сессия базы данных.
@@ -31,6 +30,4 @@ async def get_borrow_service_with_book(session: AsyncSession = Depends(db.sessio
     Returns:
         BorrowService: Сервис для работы с выдачами книг.
     """
-    borrow_repository = BorrowRepository(session=session)
-    book_service = await get_book_service(session=session)
-    return BorrowService(borrow_repository=borrow_repository, book_service=book_service)
+    return await get_borrow_service(session=session)
@@ -1,12 +1,24 @@
-from fastapi import APIRouter, Depends, status
+from typing import Annotated
 
-from src.app.api.borrows.borrow_dependencies import get_borrow_service, get_borrow_service_with_book
+from fastapi import APIRouter, Depends, Query, status
+
+from src.app.api.borrows.borrow_dependencies import get_borrow_service, get_read_borrow_service
 from src.app.models.borrow_model import Borrow
-from src.app.schemas.borrow_schema import BorrowDB, BorrowPagination
+from src.app.schemas.borrow_schema import (
+    BorrowBatchCreate,
+    BorrowBatchReturn,
+    BorrowDB,
+    BorrowDBPartial,
+    BorrowPagination,
+)
 from src.app.services.borrow_service import BorrowService
 from src.auth.api.auth_dependencies import has_reader_permissions, has_admin_permissions
+from src.core.dependencies.export_dependencies import get_exporter
 from src.core.dependencies.fetcher_dependencies import get_paginated_fetcher
 from src.core.models.user_model import User
+from src.core.schemas.batch_schema import BatchResult
+from src.core.schemas.pagination_schema import FieldsParams
+from src.core.services.exporter import Exporter
 from src.core.services.paginated_fetcher import PaginatedFetcher
 
 router = APIRouter(prefix="/borrows", tags=["API для управления выдачами книг."])
@@ -21,7 +33,7 @@ router = APIRouter(prefix="/borrows", tags=["API для управления в
 )
 async def create_borrow_endpoint(
     book_id: int,
-    borrow_service: BorrowService = Depends(get_borrow_service_with_book),
+    borrow_service: BorrowService = Depends(get_borrow_service),
     user: User = Depends(has_reader_permissions),
 ):
     """
@@ -36,16 +48,71 @@ async def create_borrow_endpoint(
     + **Errors**:
         - **400 (Bad Request):** Превышен лимит выдач книг.
         - **401 (Unauthorized):** Пользователь не авторизован.
-        - **404 (Not Found):** Книга не найдена.
+        - **404 (Not Found):** Книга или читатель не найдены.
         - **409 (Conflict):** Нет свободных экземпляров книги.
     """
     return await borrow_service.create_borrow(book_id=book_id, user=user)
 
 
+@router.post(
+    "/batch/",
+    summary="Выдача нескольких книг",
+    response_model=BatchResult,
+    status_code=status.HTTP_200_OK,
+)
+async def create_borrows_batch_endpoint(
+    batch_in: BorrowBatchCreate,
+    borrow_service: BorrowService = Depends(get_borrow_service),
+    user: User = Depends(has_reader_permissions),
+):
+    """
+    ### Выдача нескольких книг
+    ----------------
+
+    * **POST /borrows/batch/**
+    + **Description**: Выдаёт несколько книг одной транзакцией. Лимит выдач действует на весь пакет.
+    + **Request**: **BorrowBatchCreate**
+    + **Response**: **BatchResult** (статус created, conflict или not_found для каждой книги, id - ID выдачи)
+    + **Status Code**: 200 OK
+    + **Errors**:
+        - **401 (Unauthorized):** Пользователь не авторизован.
+        - **422 (Unprocessable Entity):** Пустой список, повторяющиеся ID или слишком много ID.
+    """
+    return await borrow_service.create_borrows(book_ids=batch_in.book_ids, user=user)
+
+
+@router.post(
+    "/return-batch/",
+    summary="Возврат нескольких книг",
+    response_model=BatchResult,
+    status_code=status.HTTP_200_OK,
+)
+async def return_borrows_batch_endpoint(
+    batch_in: BorrowBatchReturn,
+    borrow_service: BorrowService = Depends(get_borrow_service),
+    user: User = Depends(has_reader_permissions),
+):
+    """
+    ### Возврат нескольких книг
+    ----------------
+
+    * **POST /borrows/return-batch/**
+    + **Description**: Завершает несколько выдач одной транзакцией, устанавливает время сдачи.
+    + **Request**: **BorrowBatchReturn**
+    + **Response**: **BatchResult** (статус updated, conflict или not_found для каждой выдачи)
+    + **Status Code**: 200 OK
+    + **Errors**:
+        - **401 (Unauthorized):** Пользователь не авторизован.
+        - **422 (Unprocessable Entity):** Пустой список, повторяющиеся ID или слишком много ID.
+    """
+    return await borrow_service.close_borrows(borrow_ids=batch_in.borrow_ids, user=user)
+
+
 @router.get(
     "/user-borrows/",
     summary="Получение списка всех выдач книг пользователя",
     response_model=BorrowPagination,
+    response_model_exclude_unset=True,
     response_model_exclude_none=True,
     status_code=status.HTTP_200_OK,
 )
@@ -61,9 +128,14 @@ async def get_borrows_endpoint(
     + **Description**: Возвращает список всех выдач книг пользователя из базы данных с пагинацией и фильтрацией.
     + **Parameters**:
         - **limit** (int) - Количество объектов для пагинации.
-        - **offset** (int) - Начальный индекс для пагинации.
+        - **offset** (int, optional) - Начальный индекс для пагинации.
+        - **after** (str, optional) - Курсор из nextCursor предыдущего ответа, заменяет offset.
+        - **include_total** (bool, optional) - Считать ли totalCount (по умолчанию true).
+        - **approximate_total** (bool, optional) - Приблизительный totalCount для списка без фильтра.
         - **field** (str, optional) - Поле для фильтрации.
         - **value** (Any, optional) - Значение для фильтрации.
+        - **filter** (list[str], optional) - Условия field:operator:value, объединяемые через AND.
+        - **fields** (str, optional) - Поля ответа через запятую (id возвращается всегда).
     + **Response**: **BorrowPagination** (List[BorrowDB])
     + **Status Code**: 200 OK
     + **Errors**:
@@ -76,6 +148,7 @@ async def get_borrows_endpoint(
     "/",
     summary="Получение списка всех выдач книг",
     response_model=BorrowPagination,
+    response_model_exclude_unset=True,
     response_model_exclude_none=True,
     status_code=status.HTTP_200_OK,
 )
@@ -91,9 +164,14 @@ async def get_borrows_endpoint(
     + **Description**: Возвращает список всех выдач книг из базы данных с пагинацией и фильтрацией.
     + **Parameters**:
         - **limit** (int) - Количество объектов для пагинации.
-        - **offset** (int) - Начальный индекс для пагинации.
+        - **offset** (int, optional) - Начальный индекс для пагинации.
+        - **after** (str, optional) - Курсор из nextCursor предыдущего ответа, заменяет offset.
+        - **include_total** (bool, optional) - Считать ли totalCount (по умолчанию true).
+        - **approximate_total** (bool, optional) - Приблизительный totalCount для списка без фильтра.
         - **field** (str, optional) - Поле для фильтрации.
         - **value** (Any, optional) - Значение для фильтрации.
+        - **filter** (list[str], optional) - Условия field:operator:value, объединяемые через AND.
+        - **fields** (str, optional) - Поля ответа через запятую (id возвращается всегда).
     + **Response**: **BorrowPagination** (List[BorrowDB])
     + **Status Code**: 200 OK
     + **Errors**:
@@ -103,16 +181,44 @@ async def get_borrows_endpoint(
     return await paginated_fetcher.get_paginated_list(model=Borrow)
 
 
+@router.get(
+    "/export/",
+    summary="Выгрузка всех выдач книг",
+    status_code=status.HTTP_200_OK,
+)
+async def export_borrows_endpoint(
+    exporter: Exporter = Depends(get_exporter),
+    user: User = Depends(has_admin_permissions),
+):
+    """
+    ### Выгрузка всех выдач книг
+    ----------------------
+
+    * **GET /borrows/export/**
+    + **Description**: Потоково выгружает все выдач книг из базы данных, отсортированные по id.
+    + **Parameters**:
+        - **format** (str, optional) - Формат выгрузки: ndjson (по умолчанию) или csv.
+    + **Response**: Файл NDJSON (BorrowDB на строку) или CSV с заголовком.
+    + **Status Code**: 200 OK
+    + **Errors**:
+        - **401 (Unauthorized):** Пользователь не авторизован.
+        - **403 (Forbidden):** Пользователь не имеет прав администратора.
+    """
+    return exporter.get_response(model=Borrow, schema=BorrowDB, filename="borrows")
+
+
 @router.get(
     "/{borrow_id}/",
     summary="Получение информации о выдаче книги",
-    response_model=BorrowDB,
+    response_model=BorrowDBPartial,
+    response_model_exclude_unset=True,
     response_model_exclude_none=True,
     status_code=status.HTTP_200_OK,
 )
 async def get_borrow_endpoint(
     borrow_id: int,
-    borrow_service: BorrowService = Depends(get_borrow_service),
+    fields_params: Annotated[FieldsParams, Query()],
+    borrow_service: BorrowService = Depends(get_read_borrow_service),
     user: User = Depends(has_admin_permissions),
 ):
     """
@@ -123,6 +229,7 @@ async def get_borrow_endpoint(
     + **Description**: Возвращает информацию о выдаче книги по входящему ID.
     + **Parameters**:
         - **borrow_id** (int): ID выдачи книги, которую нужно получить.
+        - **fields** (str, optional) - Поля ответа через запятую (id возвращается всегда).
     + **Response**: **BorrowDB**
     + **Status Code**: 200 OK
     + **Errors**:
@@ -130,7 +237,7 @@ async def get_borrow_endpoint(
         - **403 (Forbidden):** Пользователь не имеет прав администратора.
         - **404 (Not Found)**: Выдача книги с указанным ID не найдена.
     """
-    return await borrow_service.get_obj_by_id_or_404(obj_id=borrow_id)
+    return await borrow_service.get_obj_by_id_or_404(obj_id=borrow_id, fields=fields_params.get_fields())
 
 
 @router.patch(
@@ -141,7 +248,7 @@ async def get_borrow_endpoint(
 )
 async def borrow_completion_endpoint(
     borrow_id: int,
-    borrow_service: BorrowService = Depends(get_borrow_service_with_book),
+    borrow_service: BorrowService = Depends(get_borrow_service),
     user: User = Depends(has_reader_permissions),
 ):
     """
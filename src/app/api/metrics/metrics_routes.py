@@ -0,0 +1,35 @@
+from fastapi import APIRouter, Depends
+
+from src.auth.api.auth_dependencies import has_admin_permissions
+from src.core.database.db import db
+from src.core.metrics import get_pool_status, metrics
+from src.core.models.user_model import User
+from src.core.services.entity_cache import entity_cache
+
+router = APIRouter(prefix="/metrics", tags=["API метрик приложения."])
+
+
+@router.get(
+    "/",
+    summary="Метрики процесса",
+    status_code=200,
+)
+async def get_metrics_endpoint(user: User = Depends(has_admin_permissions)):
+    """
+    ### Метрики процесса
+    ----------------
+
+    * **GET /metrics/**
+    + **Description**: Метрики процесса, обработавшего запрос: счётчики, сводки (count, total, max, avg) времени
+        удержания соединений с базой данных и использования соединений запросами, состояние пулов соединений,
+        попадания в кэш объектов каталога.
+    + **Response**: **dict**
+    + **Status Code**: 200 OK
+    + **Errors**:
+        - **401 (Unauthorized):** Пользователь не авторизован.
+        - **403 (Forbidden):** Пользователь не имеет прав администратора.
+    """
+    pools = {name.value: get_pool_status(engine) for name, engine in db.engines.items()}
+    pools.update({f"replica_{index}": get_pool_status(engine) for index, engine in enumerate(db.replicas.engines)})
+
+    return {**metrics.snapshot(), "pools": pools, "entity_cache": entity_cache.get_stats()}
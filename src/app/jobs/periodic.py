@@ -0,0 +1,24 @@
+import asyncio
+from typing import Awaitable, Callable
+
+from src.core.log_config import logger
+
+
+async def run_periodic(job: Callable[..., Awaitable], *args, interval: int) -> None:
+    """
+    Периодический запуск фоновой задачи, запускается в lifespan приложения.
+
+    Ошибка задачи логируется и не останавливает следующие запуски.
+
+    Args:
+        job (Callable): Фоновая задача.
+        *args: Аргументы задачи.
+        interval (int): Интервал между запусками в секундах.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await job(*args)
+
+        except Exception:
+            logger.exception(f"Background job {job.__name__} failed")
@@ -0,0 +1,56 @@
+import argparse
+import asyncio
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.app.repository.borrow_repository import BorrowRepository
+from src.core.database.advisory_lock import try_advisory_xact_lock
+from src.core.log_config import logger
+
+# Ключ pg_try_advisory_xact_lock: проверку в одно время выполняет один процесс.
+RECONCILE_ACTIVE_BORROWS_LOCK_KEY = 1401
+
+
+async def reconcile_active_borrows(
+    session_factory: async_sessionmaker[AsyncSession], fix: bool = True
+) -> list[tuple[int, int, int]]:
+    """
+    Проверка счётчиков users.active_borrows: пересчёт по таблице borrows и отчёт о расхождениях.
+
+    Проверка выполняется в транзакции с блокировкой RECONCILE_ACTIVE_BORROWS_LOCK_KEY, если её удерживает другой
+    процесс, запуск пропускается.
+
+    Args:
+        session_factory (async_sessionmaker): Фабрика сессий базы данных.
+        fix (bool): Исправлять ли расхождения, False - только отчёт.
+
+    Returns:
+        list: Идентификатор читателя, значение счётчика и фактическое количество выдач для каждого расхождения.
+    """
+    async with session_factory() as session:
+        if not await try_advisory_xact_lock(session, RECONCILE_ACTIVE_BORROWS_LOCK_KEY):
+            return []
+
+        drift = await BorrowRepository(session=session).reconcile_active_borrows(fix=fix)
+
+    for reader_id, stored, actual in drift:
+        logger.warning(f"Active borrows counter of User with id {reader_id} drifted: stored {stored}, actual {actual}")
+
+    return drift
+
+
+if __name__ == "__main__":
+    from src.core.database.db import db
+
+    parser = argparse.ArgumentParser(description="Check users.active_borrows counters against borrows")
+    parser.add_argument("--dry-run", action="store_true", help="only report drift, don't fix counters")
+    args = parser.parse_args()
+
+    async def main() -> None:
+        drift = await reconcile_active_borrows(db.bulk_session_factory, fix=not args.dry_run)
+        for reader_id, stored, actual in drift:
+            print(f"reader {reader_id}: stored {stored}, actual {actual}")
+        print(f"Drifted counters: {len(drift)}")
+        await db.dispose()
+
+    asyncio.run(main())
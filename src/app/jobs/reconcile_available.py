@@ -0,0 +1,52 @@
+import asyncio
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.app.models.book_model import Book
+from src.app.repository.book_repository import BookRepository
+from src.core.database.advisory_lock import try_advisory_xact_lock
+from src.core.log_config import logger
+from src.core.services.count_cache import count_cache
+from src.core.services.entity_cache import entity_cache
+from src.core.services.invalidation_bus import invalidation_bus
+
+# Ключ pg_try_advisory_xact_lock: пересчёт в одно время выполняет один процесс.
+RECONCILE_AVAILABLE_LOCK_KEY = 1301
+
+
+async def reconcile_available(session_factory: async_sessionmaker[AsyncSession]) -> int:
+    """
+    Пересчёт books.available для книг с учётом по экземплярам.
+
+    Пересчёт выполняется в транзакции с блокировкой RECONCILE_AVAILABLE_LOCK_KEY, если её удерживает другой процесс,
+    запуск пропускается.
+
+    Args:
+        session_factory (async_sessionmaker): Фабрика сессий базы данных.
+
+    Returns:
+        int: Количество книг, у которых значение available изменилось.
+    """
+    async with session_factory() as session:
+        if not await try_advisory_xact_lock(session, RECONCILE_AVAILABLE_LOCK_KEY):
+            return 0
+
+        updated = await BookRepository(session=session).reconcile_available()
+
+    if updated:
+        count_cache.invalidate(Book)
+        await entity_cache.invalidate_model(Book)
+        await invalidation_bus.publish(Book, None)
+        logger.info(f"Reconciled available copies of {updated} books")
+
+    return updated
+
+
+if __name__ == "__main__":
+    from src.core.database.db import db
+
+    async def main() -> None:
+        print(f"Reconciled books: {await reconcile_available(db.bulk_session_factory)}")
+        await db.dispose()
+
+    asyncio.run(main())
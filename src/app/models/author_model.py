@@ -1,6 +1,6 @@
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Date, UniqueConstraint
+from sqlalchemy import Date, Index, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.core.models.base_model import Base
@@ -21,10 +21,15 @@ class Author(Base):
         books (list[Book]): Книги, связанные с автором.
     """
 
+    filter_fields = ("id", "name", "birth_date")
+
     name: Mapped[str]
     biography: Mapped[str]
-    birth_date: Mapped[Date] = mapped_column(Date)
+    birth_date: Mapped[Date] = mapped_column(Date, index=True)
 
     books: Mapped[list["Book"]] = relationship("Book", back_populates="author", cascade="all, delete-orphan")
 
-    __table_args__ = (UniqueConstraint("name", "birth_date"),)
+    __table_args__ = (
+        UniqueConstraint("name", "birth_date"),
+        Index("ix_authors_name_pattern", "name", postgresql_ops={"name": "text_pattern_ops"}),
+    )
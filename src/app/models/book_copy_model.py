@@ -0,0 +1,34 @@
+from typing import TYPE_CHECKING
+
+from sqlalchemy import ForeignKey, Index, text
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from src.core.models.base_model import Base
+
+if TYPE_CHECKING:
+    from src.app.models.book_model import Book
+
+
+class BookCopy(Base):
+    """
+    Модель экземпляра книги.
+
+    Используется для книг с учётом по экземплярам (Book.tracks_copies): выдача занимает свободный экземпляр
+    через SELECT ... FOR UPDATE SKIP LOCKED вместо изменения строки books, books.available пересчитывается
+    периодически (см. src.app.jobs.reconcile_available).
+
+    Attributes:
+        book_id (int): Идентификатор книги.
+        is_available (bool): Свободен ли экземпляр.
+
+        book (Book): Книга, связанная с экземпляром.
+    """
+
+    __tablename__ = "book_copies"
+
+    book_id: Mapped[int] = mapped_column(ForeignKey("books.id"), index=True)
+    is_available: Mapped[bool] = mapped_column(default=True, server_default=text("true"))
+
+    book: Mapped["Book"] = relationship("Book")
+
+    __table_args__ = (Index("ix_book_copies_available", "book_id", postgresql_where=text("is_available")),)
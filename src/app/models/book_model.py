@@ -1,9 +1,9 @@
 from typing import TYPE_CHECKING
 
-from sqlalchemy import ForeignKey, UniqueConstraint, Date, CheckConstraint
+from sqlalchemy import ForeignKey, UniqueConstraint, Date, CheckConstraint, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from src.core.models.base_model import Base
+from src.core.models.base_model import Base, CountStrategy
 
 
 if TYPE_CHECKING:
@@ -21,20 +21,29 @@ class Book(Base):
         publication_date (Date): Дата публикации книги.
         genres (str): Жанры книги.
         author_id (int): Идентификатор автора книги.
-        available (int): Количество доступных экземпляров книги.
+        available (int): Количество доступных экземпляров книги. Для книг с учётом по экземплярам
+            пересчитывается периодически по book_copies.
+        tracks_copies (bool): Учитываются ли экземпляры книги по отдельности (таблица book_copies).
 
         author (Author): Автор, связанный с книгой.
         borrows (list[Borrow]): Выдачи, связанные с книгой.
     """
 
+    count_strategy = CountStrategy.COMBINED
+    filter_fields = ("id", "title", "publication_date", "available", "author_id")
+
     title: Mapped[str]
     description: Mapped[str]
     genres: Mapped[str]
-    publication_date: Mapped[Date] = mapped_column(Date)
-    available: Mapped[int] = mapped_column(CheckConstraint("available >= 0"))
-    author_id: Mapped[int] = mapped_column(ForeignKey("authors.id"))
+    publication_date: Mapped[Date] = mapped_column(Date, index=True)
+    available: Mapped[int] = mapped_column(CheckConstraint("available >= 0"), index=True)
+    author_id: Mapped[int] = mapped_column(ForeignKey("authors.id"), index=True)
+    tracks_copies: Mapped[bool] = mapped_column(default=False, server_default=text("false"))
 
     author: Mapped["Author"] = relationship("Author", back_populates="books")
     borrows: Mapped[list["Borrow"]] = relationship("Borrow", back_populates="book", cascade="all, delete-orphan")
 
-    __table_args__ = (UniqueConstraint("title", "author_id"),)
+    __table_args__ = (
+        UniqueConstraint("title", "author_id"),
+        Index("ix_books_title_pattern", "title", postgresql_ops={"title": "text_pattern_ops"}),
+    )
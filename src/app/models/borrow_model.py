@@ -1,10 +1,11 @@
 from datetime import datetime
 from typing import TYPE_CHECKING
 
-from sqlalchemy import DateTime, ForeignKey, func
+from sqlalchemy import DateTime, ForeignKey, Index, func, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from src.core.models.base_model import Base
+from src.app.models.book_copy_model import BookCopy  # noqa: F401
+from src.core.models.base_model import Base, CountStrategy
 from src.core.models.user_model import User
 
 if TYPE_CHECKING:
@@ -20,16 +21,28 @@ class Borrow(Base):
         return_date (datetime | None): Дата возврата книги.
         book_id (int): Идентификатор книги.
         reader_id (int): Идентификатор читателя.
+        copy_id (int | None): Идентификатор выданного экземпляра (для книг с учётом по экземплярам).
 
         book (Book): Книга, связанная с выдачей.
         reader (User): Читатель, связанный с выдачей.
     """
 
-    borrow_date: Mapped[datetime] = mapped_column(DateTime(), server_default=func.now())
+    count_strategy = CountStrategy.COMBINED
+    filter_fields = ("id", "borrow_date", "book_id", "reader_id")
+
+    borrow_date: Mapped[datetime] = mapped_column(DateTime(), server_default=func.now(), index=True)
     return_date: Mapped[datetime | None]
 
-    book_id: Mapped[int] = mapped_column(ForeignKey("books.id"))
+    book_id: Mapped[int] = mapped_column(ForeignKey("books.id"), index=True)
     reader_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
+    copy_id: Mapped[int | None] = mapped_column(ForeignKey("book_copies.id"), index=True)
 
     book: Mapped["Book"] = relationship("Book", back_populates="borrows")
     reader: Mapped["User"] = relationship("User", backref="books")
+
+    __table_args__ = (
+        # Активные выдачи читателя (return_date IS NULL) и история выдач читателя, новые первыми.
+        # Составной индекс также заменяет отдельный индекс по внешнему ключу reader_id.
+        Index("ix_borrows_active_reader_id", "reader_id", postgresql_where=text("return_date IS NULL")),
+        Index("ix_borrows_reader_id_borrow_date", "reader_id", text("borrow_date DESC")),
+    )
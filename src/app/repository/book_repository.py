@@ -1,7 +1,8 @@
-from sqlalchemy import update
+from sqlalchemy import bindparam, case, func, insert, literal, select, update
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.app.models.book_copy_model import BookCopy
 from src.app.models.book_model import Book
 from src.core.repository.base_repository import BaseRepository
 
@@ -19,21 +20,36 @@ class BookRepository(BaseRepository):
         super().__init__(session=session, model=Book)
         self.session = session
 
+    def get_update_stmt(self, values: dict | None = None):
+        """
+        Запрос UPDATE, не изменяющий available книг с учётом по экземплярам: для них значение вычисляется
+        по book_copies (см. reconcile_available).
+
+        Args:
+            values (dict, optional): Значения книги, None - значения передаются параметрами executemany.
+        """
+        available = bindparam("available") if values is None else values["available"]
+        return (
+            super()
+            .get_update_stmt(values)
+            .values(available=case((Book.tracks_copies, Book.available), else_=available))
+        )
+
     async def update_available(self, book_id: int, delta: int) -> bool | None:
         """
-        Обновляет количество доступных книг.
+        Обновляет количество доступных книг без учёта по экземплярам.
 
         Args:
             book_id (int): Идентификатор книги.
             delta (int): Изменение количества доступных книг.
 
         Returns:
-            None: Eсли книга не была найдена.
+            None: Eсли книга не была найдена или учитывается по экземплярам.
             True: Количество доступных книг успешно обновлено.
             False: Если произошла ошибка обновления.
         """
         try:
-            stmt = update(Book).where(Book.id == book_id).values(available=Book.available + delta)
+            stmt = update(Book).where(Book.id == book_id, ~Book.tracks_copies).values(available=Book.available + delta)
             result = await self.session.execute(stmt)
             if result.rowcount == 0:
                 return None
@@ -42,3 +58,62 @@ class BookRepository(BaseRepository):
 
         except IntegrityError:
             return False
+
+    async def add_copies(self, book_id: int, count: int) -> Book | None:
+        """
+        Добавление экземпляров книги и перевод книги на учёт по экземплярам.
+
+        books.available пересчитывается по свободным экземплярам книги.
+
+        Args:
+            book_id (int): Идентификатор книги.
+            count (int): Количество добавляемых экземпляров.
+
+        Returns:
+            Book: Обновлённая книга.
+            None: Если книга не найдена.
+        """
+        copies = (
+            select(Book.id, literal(True)).join(func.generate_series(1, count), literal(True)).where(Book.id == book_id)
+        )
+        await self.session.execute(insert(BookCopy).from_select(["book_id", "is_available"], copies))
+
+        free_copies = (
+            select(func.count(BookCopy.id)).where(BookCopy.book_id == book_id, BookCopy.is_available).scalar_subquery()
+        )
+        stmt = (
+            update(Book)
+            .where(Book.id == book_id)
+            .values(tracks_copies=True, available=free_copies)
+            .returning(Book)
+            .execution_options(populate_existing=True)
+        )
+        book = await self.session.scalar(stmt)
+        if book is None:
+            await self.session.rollback()
+            return None
+
+        await self.session.commit()
+        return book
+
+    async def reconcile_available(self) -> int:
+        """
+        Пересчёт books.available по свободным экземплярам для книг с учётом по экземплярам.
+
+        Returns:
+            int: Количество книг, у которых значение available изменилось.
+        """
+        free_copies = (
+            select(BookCopy.book_id, func.count().filter(BookCopy.is_available).label("free"))
+            .group_by(BookCopy.book_id)
+            .subquery("free_copies")
+        )
+        stmt = (
+            update(Book)
+            .where(Book.id == free_copies.c.book_id, Book.tracks_copies, Book.available != free_copies.c.free)
+            .values(available=free_copies.c.free)
+        )
+        result = await self.session.execute(stmt)
+        await self.session.commit()
+
+        return result.rowcount
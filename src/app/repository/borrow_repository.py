@@ -1,7 +1,32 @@
-from sqlalchemy import select, func
+import enum
+from typing import Sequence
+
+from sqlalchemy import (
+    ARRAY,
+    and_,
+    any_,
+    CTE,
+    Integer,
+    bindparam,
+    case,
+    cast,
+    exists,
+    func,
+    insert,
+    literal,
+    null,
+    select,
+    union_all,
+    update,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 
+from src.app.models.book_copy_model import BookCopy
+from src.app.models.book_model import Book
 from src.app.models.borrow_model import Borrow
+from src.app.schemas.borrow_schema import CheckoutOutcome, ReturnOutcome
+from src.core.models.user_model import User
 from src.core.repository.base_repository import BaseRepository
 
 
@@ -20,7 +45,7 @@ class BorrowRepository(BaseRepository):
 
     async def get_borrows_count(self, reader_id: int) -> int:
         """
-        Возвращает количество выданных пользователю книг.
+        Возвращает количество выданных пользователю книг (счётчик users.active_borrows).
 
         Args:
             reader_id (int): Идентификатор пользователя.
@@ -28,7 +53,318 @@ class BorrowRepository(BaseRepository):
         Returns:
             int: Колтчество выданных пользователю книг.
         """
-        filter_dict = {"reader_id": reader_id, "return_date": None}
-        stmt = select(func.count(self.model.id)).filter_by(**filter_dict)
+        stmt = select(User.active_borrows).where(User.id == reader_id)
 
         return await self.session.scalar(stmt)
+
+    async def checkout(self, book_id: int, reader_id: int, limit: int) -> tuple[CheckoutOutcome, Borrow | None]:
+        """
+        Выдача одной книги (см. checkout_batch).
+
+        Args:
+            book_id (int): Идентификатор книги.
+            reader_id (int): Идентификатор читателя.
+            limit (int): Максимальное количество активных выдач читателя.
+
+        Returns:
+            tuple: Результат выдачи и созданная выдача (None, если книга не выдана).
+        """
+        results = await self.checkout_batch(book_ids=[book_id], reader_id=reader_id, limit=limit)
+        return results[0]
+
+    async def checkout_batch(
+        self, book_ids: Sequence[int], reader_id: int, limit: int
+    ) -> list[tuple[CheckoutOutcome, Borrow | None]]:
+        """
+        Выдача нескольких книг одним запросом.
+
+        CTE выбирает книги в наличии в порядке запроса, не больше, чем осталось до лимита активных выдач читателя,
+        и создаёт выдачи. Для книг с учётом по экземплярам (Book.tracks_copies) занимается свободный экземпляр
+        через FOR UPDATE SKIP LOCKED, строка books не изменяется. Для остальных книг уменьшается books.available.
+
+        Количество активных выдач читается из счётчика users.active_borrows под блокировкой строки читателя
+        (SELECT ... FOR UPDATE), поэтому выдачи одного читателя сериализуются, а счётчик увеличивается
+        тем же запросом, что создаёт выдачи. Строка читателя блокируется раньше строк книг, как и при возврате
+        (см. close_batch).
+
+        Args:
+            book_ids (Sequence[int]): Идентификаторы книг без повторов.
+            reader_id (int): Идентификатор читателя.
+            limit (int): Максимальное количество активных выдач читателя.
+
+        Returns:
+            list: Результат выдачи и созданная выдача (None, если книга не выдана) для каждого элемента book_ids.
+        """
+        active_count = await self.session.scalar(
+            select(User.active_borrows).where(User.id == reader_id).with_for_update()
+        )
+        if active_count is None:
+            return [(CheckoutOutcome.READER_NOT_FOUND, None) for _ in book_ids]
+
+        requested = self.get_requested_ids_cte(name="requested", ids=book_ids)
+        in_stock = case(
+            (Book.tracks_copies, exists().where(BookCopy.book_id == Book.id, BookCopy.is_available)),
+            else_=Book.available > 0,
+        )
+        candidates = (
+            select(requested.c.id, requested.c.idx, Book.tracks_copies)
+            .join(Book, Book.id == requested.c.id)
+            .where(in_stock)
+            .order_by(requested.c.idx)
+            .limit(max(limit - active_count, 0))
+            .cte("candidates")
+        )
+        taken = (
+            update(Book)
+            .where(Book.id == candidates.c.id, Book.tracks_copies.is_(False), Book.available > 0)
+            .values(available=Book.available - 1)
+            .returning(Book.id)
+            .cte("taken")
+        )
+        free_copy = BookCopy.__table__.alias("free_copy")
+        free_copy_id = (
+            select(free_copy.c.id)
+            .where(free_copy.c.book_id == candidates.c.id, free_copy.c.is_available)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        claimed = (
+            update(BookCopy)
+            .where(BookCopy.id.in_(select(free_copy_id).where(candidates.c.tracks_copies)), BookCopy.is_available)
+            .values(is_available=False)
+            .returning(BookCopy.id, BookCopy.book_id)
+            .cte("claimed")
+        )
+        inserted = (
+            insert(Borrow)
+            .from_select(
+                ["book_id", "reader_id", "copy_id"],
+                union_all(
+                    select(taken.c.id, literal(reader_id), cast(null(), Integer)),
+                    select(claimed.c.book_id, literal(reader_id), claimed.c.id),
+                ),
+            )
+            .returning(*Borrow.__table__.c)
+            .cte("inserted")
+        )
+        # Выдач создаётся столько же, сколько строк в taken и claimed. Подсчёт по inserted недоступен:
+        # CTE inserted уже используется в запросе через aliased.
+        borrowed = (
+            select(func.count()).select_from(taken).scalar_subquery()
+            + select(func.count()).select_from(claimed).scalar_subquery()
+        )
+        counted = (
+            update(User)
+            .where(User.id == reader_id)
+            .values(active_borrows=User.active_borrows + borrowed)
+            .returning(User.id)
+            .cte("counted")
+        )
+        borrow = aliased(Borrow, inserted)
+        stmt = (
+            select(
+                Book.id,
+                in_stock,
+                candidates.c.idx,
+                borrow,
+                # Ссылка нужна, чтобы CTE counted попал в запрос.
+                select(func.count()).select_from(counted).scalar_subquery(),
+            )
+            .select_from(requested)
+            .outerjoin(Book, Book.id == requested.c.id)
+            .outerjoin(candidates, candidates.c.idx == requested.c.idx)
+            .outerjoin(borrow, borrow.book_id == requested.c.id)
+            .order_by(requested.c.idx)
+        )
+        rows = (await self.session.execute(stmt)).all()
+
+        results = []
+        for found_id, book_in_stock, candidate_idx, created, _ in rows:
+            if created is not None:
+                results.append((CheckoutOutcome.OK, created))
+            elif found_id is None:
+                results.append((CheckoutOutcome.BOOK_NOT_FOUND, None))
+            elif candidate_idx is None and book_in_stock:
+                results.append((CheckoutOutcome.LIMIT_EXCEEDED, None))
+            else:
+                results.append((CheckoutOutcome.NO_COPIES, None))
+
+        await self.commit_if_any(results, success=CheckoutOutcome.OK)
+        return results
+
+    async def close(self, borrow_id: int) -> tuple[ReturnOutcome, Borrow | None]:
+        """
+        Возврат одной книги (см. close_batch).
+
+        Args:
+            borrow_id (int): Идентификатор выдачи.
+
+        Returns:
+            tuple: Результат возврата и закрытая выдача (None, если выдача не закрыта).
+        """
+        results = await self.close_batch(borrow_ids=[borrow_id])
+        return results[0]
+
+    async def close_batch(self, borrow_ids: Sequence[int]) -> list[tuple[ReturnOutcome, Borrow | None]]:
+        """
+        Возврат нескольких книг одним запросом.
+
+        CTE закрывает только ещё не закрытые выдачи (return_date IS NULL), поэтому повторный запрос не вернёт
+        экземпляр книги дважды. Экземпляры закрытых выдач освобождаются, для выдач без экземпляра
+        books.available увеличивается на количество закрытых выдач каждой книги, users.active_borrows
+        уменьшается на количество закрытых выдач каждого читателя.
+
+        Строки читателей блокируются отдельным запросом до изменения книг, в порядке id: выдача (checkout_batch)
+        тоже блокирует строку читателя раньше строк книг, поэтому одновременные выдача и возврат не приводят
+        к взаимной блокировке.
+
+        Args:
+            borrow_ids (Sequence[int]): Идентификаторы выдач без повторов.
+
+        Returns:
+            list: Результат возврата и закрытая выдача (None, если выдача не закрыта) для каждого элемента borrow_ids.
+        """
+        readers = select(Borrow.reader_id).where(
+            Borrow.id == any_(bindparam("ids", list(borrow_ids), type_=ARRAY(Integer))), Borrow.return_date.is_(None)
+        )
+        await self.session.execute(select(User.id).where(User.id.in_(readers)).order_by(User.id).with_for_update())
+
+        requested = self.get_requested_ids_cte(name="requested", ids=borrow_ids)
+        closed = (
+            update(Borrow)
+            .where(Borrow.id == requested.c.id, Borrow.return_date.is_(None))
+            .values(return_date=func.now())
+            .returning(*Borrow.__table__.c)
+            .cte("closed")
+        )
+        restock = (
+            select(closed.c.book_id, func.count().label("returned"))
+            .where(closed.c.copy_id.is_(None))
+            .group_by(closed.c.book_id)
+            .cte("restock")
+        )
+        restocked = (
+            update(Book)
+            .where(Book.id == restock.c.book_id)
+            .values(available=Book.available + restock.c.returned)
+            .returning(Book.id)
+            .cte("restocked")
+        )
+        released = (
+            update(BookCopy)
+            .where(BookCopy.id == closed.c.copy_id)
+            .values(is_available=True)
+            .returning(BookCopy.id)
+            .cte("released")
+        )
+        returned_by_reader = (
+            select(closed.c.reader_id, func.count().label("returned")).group_by(closed.c.reader_id).cte("returned")
+        )
+        uncounted = (
+            update(User)
+            .where(User.id == returned_by_reader.c.reader_id)
+            .values(active_borrows=User.active_borrows - returned_by_reader.c.returned)
+            .returning(User.id)
+            .cte("uncounted")
+        )
+        stmt = (
+            select(
+                Borrow.id.label("found_id"),
+                *closed.c,
+                # Ссылки нужны, чтобы CTE restocked, released и uncounted попали в запрос.
+                select(func.count()).select_from(restocked).scalar_subquery(),
+                select(func.count()).select_from(released).scalar_subquery(),
+                select(func.count()).select_from(uncounted).scalar_subquery(),
+            )
+            .select_from(requested)
+            .outerjoin(Borrow, Borrow.id == requested.c.id)
+            .outerjoin(closed, closed.c.id == requested.c.id)
+            .order_by(requested.c.idx)
+        )
+        rows = (await self.session.execute(stmt)).all()
+
+        results = []
+        for row in rows:
+            if row._mapping[closed.c.id] is not None:
+                returned = Borrow(**{column.key: row._mapping[column] for column in closed.c})
+                results.append((ReturnOutcome.OK, returned))
+            elif row.found_id is None:
+                results.append((ReturnOutcome.BORROW_NOT_FOUND, None))
+            else:
+                results.append((ReturnOutcome.ALREADY_RETURNED, None))
+
+        await self.commit_if_any(results, success=ReturnOutcome.OK)
+        return results
+
+    async def reconcile_active_borrows(self, fix: bool = True) -> list[tuple[int, int, int]]:
+        """
+        Сверка счётчиков users.active_borrows с количеством незакрытых выдач.
+
+        Счётчик исправляется, только если не изменился с момента подсчёта (повторная проверка в WHERE),
+        поэтому параллельная выдача или возврат не перезаписывается устаревшим значением.
+
+        Args:
+            fix (bool): Исправлять ли расхождения, False - только найти.
+
+        Returns:
+            list: Идентификатор читателя, значение счётчика и фактическое количество выдач
+                для каждого расхождения (при fix=True - только исправленные).
+        """
+        drift = (
+            select(
+                User.id,
+                User.active_borrows.label("stored"),
+                func.count(Borrow.id).label("actual"),
+            )
+            .outerjoin(Borrow, and_(Borrow.reader_id == User.id, Borrow.return_date.is_(None)))
+            .group_by(User.id)
+            .having(User.active_borrows != func.count(Borrow.id))
+            .subquery("drift")
+        )
+        if not fix:
+            rows = await self.session.execute(select(drift.c.id, drift.c.stored, drift.c.actual).order_by(drift.c.id))
+            return [tuple(row) for row in rows]
+
+        stmt = (
+            update(User)
+            .where(User.id == drift.c.id, User.active_borrows == drift.c.stored)
+            .values(active_borrows=drift.c.actual)
+            .returning(User.id, drift.c.stored, drift.c.actual)
+        )
+        rows = (await self.session.execute(stmt)).all()
+        await self.session.commit()
+
+        return sorted(tuple(row) for row in rows)
+
+    @staticmethod
+    def get_requested_ids_cte(name: str, ids: Sequence[int]) -> CTE:
+        """
+        Создание CTE из массива id с позицией каждого id в запросе (unnest ... WITH ORDINALITY).
+
+        Args:
+            name (str): Имя CTE.
+            ids (Sequence[int]): Идентификаторы.
+
+        Returns:
+            CTE: CTE с колонками id и idx.
+        """
+        unnested = (
+            func.unnest(bindparam("ids", list(ids), type_=ARRAY(Integer)))
+            .table_valued("id", with_ordinality="idx")
+            .render_derived(name="ids")
+        )
+        return select(unnested.c.id, unnested.c.idx).cte(name)
+
+    async def commit_if_any(self, results: list[tuple], success: enum.Enum) -> None:
+        """
+        Фиксация транзакции, если хотя бы один элемент обработан успешно, иначе откат.
+
+        Args:
+            results (list[tuple]): Результаты обработки, первый элемент кортежа - результат.
+            success (enum.Enum): Значение результата, означающее успех.
+        """
+        if any(outcome == success for outcome, _ in results):
+            await self.session.commit()
+        else:
+            await self.session.rollback()
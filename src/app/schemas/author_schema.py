@@ -3,6 +3,7 @@ from datetime import date
 from pydantic import BaseModel, ConfigDict
 
 from src.core.schemas.pagination_schema import Pagination
+from src.core.schemas.partial_schema import make_partial
 
 
 class AuthorCreate(BaseModel):
@@ -21,5 +22,8 @@ class AuthorDB(AuthorUpdate):
     pass
 
 
+AuthorDBPartial = make_partial(AuthorDB)
+
+
 class AuthorPagination(Pagination):
-    data: list[AuthorDB]
+    data: list[AuthorDBPartial]
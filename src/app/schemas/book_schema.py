@@ -2,7 +2,9 @@ from datetime import datetime
 
 from pydantic import BaseModel, conint, ConfigDict
 
+from src.core.schemas.batch_schema import MAX_BATCH_SIZE
 from src.core.schemas.pagination_schema import Pagination
+from src.core.schemas.partial_schema import make_partial
 
 
 class BookCreate(BaseModel):
@@ -21,8 +23,15 @@ class BookUpdate(BookCreate):
 
 
 class BookDB(BookUpdate):
-    pass
+    tracks_copies: bool = False
+
+
+class BookCopiesCreate(BaseModel):
+    count: conint(gt=0, le=MAX_BATCH_SIZE)
+
+
+BookDBPartial = make_partial(BookDB)
 
 
 class BookPagination(Pagination):
-    data: list[BookDB]
+    data: list[BookDBPartial]
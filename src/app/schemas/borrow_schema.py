@@ -1,8 +1,11 @@
+import enum
 from datetime import datetime
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
+from src.core.schemas.batch_schema import MAX_BATCH_SIZE
 from src.core.schemas.pagination_schema import Pagination
+from src.core.schemas.partial_schema import make_partial
 
 
 class BorrowCreate(BaseModel):
@@ -26,7 +29,44 @@ class BorrowClose(BaseModel):
 
 class BorrowDB(BorrowUpdate):
     return_date: datetime | None
+    copy_id: int | None = None
+
+
+BorrowDBPartial = make_partial(BorrowDB)
 
 
 class BorrowPagination(Pagination):
-    data: list[BorrowDB]
+    data: list[BorrowDBPartial]
+
+
+class CheckoutOutcome(str, enum.Enum):
+    OK = "ok"
+    LIMIT_EXCEEDED = "limit_exceeded"
+    NO_COPIES = "no_copies"
+    BOOK_NOT_FOUND = "book_not_found"
+    READER_NOT_FOUND = "reader_not_found"
+
+
+class ReturnOutcome(str, enum.Enum):
+    OK = "ok"
+    ALREADY_RETURNED = "already_returned"
+    BORROW_NOT_FOUND = "borrow_not_found"
+
+
+def validate_unique_ids(ids: list[int]) -> list[int]:
+    if len(set(ids)) != len(ids):
+        raise ValueError("Ids must be unique")
+
+    return ids
+
+
+class BorrowBatchCreate(BaseModel):
+    book_ids: list[int] = Field(min_length=1, max_length=MAX_BATCH_SIZE)
+
+    _validate_book_ids = field_validator("book_ids")(validate_unique_ids)
+
+
+class BorrowBatchReturn(BaseModel):
+    borrow_ids: list[int] = Field(min_length=1, max_length=MAX_BATCH_SIZE)
+
+    _validate_borrow_ids = field_validator("borrow_ids")(validate_unique_ids)
@@ -12,5 +12,7 @@ class AuthorService(BaseService):
         repository (AuthorRepository): Репозиторий для работы с авторами.
     """
 
+    cache_entities = True
+
     def __init__(self, author_repository: AuthorRepository):
         super().__init__(repository=author_repository)
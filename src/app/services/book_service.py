@@ -1,9 +1,15 @@
+from typing import Sequence
+
 from src.app.models.book_model import Book
 from src.app.repository.book_repository import BookRepository
 from src.app.schemas.book_schema import BookCreate, BookUpdate
 from src.app.services.author_service import AuthorService
+from src.core.errors.repository_errors import OBJECT_NOT_FOUND
+from src.core.log_config import logger
 from src.core.models.user_model import User
+from src.core.schemas.batch_schema import BatchItemResult, BatchItemStatus
 from src.core.services.base_service import BaseService
+from src.core.services.count_cache import count_cache
 
 
 class BookService(BaseService):
@@ -14,6 +20,8 @@ class BookService(BaseService):
         repository (BookRepository): Репозиторий для работы с книгами.
     """
 
+    cache_entities = True
+
     def __init__(self, book_repository: BookRepository, author_service: AuthorService = None):
         super().__init__(repository=book_repository)
         self.author_service = author_service
@@ -40,7 +48,7 @@ class BookService(BaseService):
 
     async def update(self, book_in: BookUpdate, obj_id: int = None, user: User = None) -> Book:
         """
-        Обновление данных книги.
+        Обновление данных книги. Для книг с учётом по экземплярам available не изменяется.
 
         Args:
             obj_id (int, optional): Идентификатор книги.
@@ -58,20 +66,70 @@ class BookService(BaseService):
 
         return await super().update(obj_in=book_in, user=user)
 
+    async def get_rejected_items(self, objs_in: Sequence[BookCreate]) -> list[BatchItemResult]:
+        """
+        Отклонение книг, автора которых нет в базе данных.
+
+        Args:
+            objs_in (Sequence[BookCreate]): Книги из пакета.
+
+        Returns:
+            list[BatchItemResult]: Результаты для книг с несуществующим автором.
+        """
+        existing_ids = await self.author_service.repository.get_existing_ids({book.author_id for book in objs_in})
+
+        return [
+            BatchItemResult(index=index, status=BatchItemStatus.NOT_FOUND, detail="Author not found")
+            for index, book in enumerate(objs_in)
+            if book.author_id not in existing_ids
+        ]
+
     async def update_book_available(self, book_id: int, delta: int) -> bool | None:
         """
-        Обновление количеста доступных экземпляров книги.
+        Обновление количеста доступных экземпляров книги без учёта по экземплярам.
 
         Args:
             book_id (int): Идентификатор книги.
             delta (int): Изменение количеста доступных экземпляров книги.
 
         Returns:
-            None: Eсли книга не была найдена.
+            None: Eсли книга не была найдена или учитывается по экземплярам.
             True: Количество доступных книг успешно обновлено.
             False: Если произошла ошибка обновления.
 
         Raises:
             404 (not found): Если книга не была найдена.
         """
-        return await self.repository.update_available(book_id=book_id, delta=delta)
+        result = await self.repository.update_available(book_id=book_id, delta=delta)
+        if result:
+            count_cache.invalidate(self.repository.model)
+            await self.invalidate_cached([book_id])
+
+        return result
+
+    async def add_copies(self, book_id: int, count: int, user: User = None) -> Book:
+        """
+        Добавление экземпляров книги, книга переводится на учёт по экземплярам.
+
+        Args:
+            book_id (int): Идентификатор книги.
+            count (int): Количество добавляемых экземпляров.
+            user (User, optional): Пользователь, добавляющий экземпляры.
+
+        Returns:
+            Book: Модель обновлённой книги.
+
+        Raises:
+            404 (not found): Если книга не была найдена.
+        """
+        book = await self.repository.add_copies(book_id=book_id, count=count)
+        if book is None:
+            raise OBJECT_NOT_FOUND
+
+        count_cache.invalidate(self.repository.model)
+        await self.invalidate_cached([book_id])
+
+        if user:
+            logger.info(f"User with id {user.id} added {count} copies of Book with id {book_id}")
+
+        return book
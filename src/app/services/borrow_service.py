@@ -1,13 +1,32 @@
-from datetime import datetime
-
+from src.app.models.book_model import Book
 from src.app.models.borrow_model import Borrow
 from src.app.repository.borrow_repository import BorrowRepository
-from src.app.schemas.borrow_schema import BorrowCreate, BorrowClose
+from src.app.schemas.borrow_schema import CheckoutOutcome, ReturnOutcome
 from src.core.errors.repository_errors import OBJECT_NOT_FOUND
 from src.core.errors.service_errors import NO_COPIES, BOOK_BEEN_RETURNED, BORROW_LIMIT_EXCEEDED
+from src.core.log_config import logger
 from src.core.models.user_model import User
+from src.core.schemas.batch_schema import BatchItemResult, BatchItemStatus, BatchResult
 from src.core.services.base_service import BaseService
-from src.app.services.book_service import BookService
+from src.core.services.count_cache import count_cache
+from src.core.services.entity_cache import entity_cache
+from src.core.services.invalidation_bus import invalidation_bus
+
+MAX_ACTIVE_BORROWS = 5
+
+CHECKOUT_ITEM_STATUSES = {
+    CheckoutOutcome.OK: (BatchItemStatus.CREATED, None),
+    CheckoutOutcome.LIMIT_EXCEEDED: (BatchItemStatus.CONFLICT, BORROW_LIMIT_EXCEEDED.detail),
+    CheckoutOutcome.NO_COPIES: (BatchItemStatus.CONFLICT, NO_COPIES.detail),
+    CheckoutOutcome.BOOK_NOT_FOUND: (BatchItemStatus.NOT_FOUND, OBJECT_NOT_FOUND.detail),
+    CheckoutOutcome.READER_NOT_FOUND: (BatchItemStatus.NOT_FOUND, "Reader not found"),
+}
+
+RETURN_ITEM_STATUSES = {
+    ReturnOutcome.OK: (BatchItemStatus.UPDATED, None),
+    ReturnOutcome.ALREADY_RETURNED: (BatchItemStatus.CONFLICT, BOOK_BEEN_RETURNED.detail),
+    ReturnOutcome.BORROW_NOT_FOUND: (BatchItemStatus.NOT_FOUND, OBJECT_NOT_FOUND.detail),
+}
 
 
 class BorrowService(BaseService):
@@ -16,17 +35,15 @@ class BorrowService(BaseService):
 
     Attributes:
         repository (BorrowRepository): Репозиторий для операций с выдачами книг.
-        book_service (BookService, optional): Сервис для работы с книгами.
     """
 
-    def __init__(self, borrow_repository: BorrowRepository, book_service: BookService = None):
+    def __init__(self, borrow_repository: BorrowRepository):
         super().__init__(repository=borrow_repository)
-        self.book_service = book_service
         self.repository = borrow_repository
 
     async def create_borrow(self, book_id: int, user: User = None) -> Borrow:
         """
-        Создает новую выдачу.
+        Создает новую выдачу одной атомарной операцией в базе данных (см. BorrowRepository.checkout).
 
         Args:
             book_id (int): Идентификатор книги.
@@ -36,27 +53,86 @@ class BorrowService(BaseService):
             Borrow: Созданный объект выдачи.
 
         Raises:
-            400 (Bad request): Если книга не была найдена.
-            404 (Not found): Если книга не была найдена.
+            400 (Bad request): Если превышен лимит активных выдач читателя.
+            404 (Not found): Если книга или читатель не были найдены.
             409 (Сonflict): Если нет доступных экземпляров книги.
         """
-        borrow_count = await self.repository.get_borrows_count(reader_id=user.id)
-        if borrow_count >= 5:
-            raise BORROW_LIMIT_EXCEEDED
+        outcome, borrow = await self.repository.checkout(book_id=book_id, reader_id=user.id, limit=MAX_ACTIVE_BORROWS)
+        match outcome:
+            case CheckoutOutcome.LIMIT_EXCEEDED:
+                raise BORROW_LIMIT_EXCEEDED
+            case CheckoutOutcome.NO_COPIES:
+                raise NO_COPIES
+            case CheckoutOutcome.BOOK_NOT_FOUND | CheckoutOutcome.READER_NOT_FOUND:
+                raise OBJECT_NOT_FOUND
+
+        count_cache.invalidate(Borrow)
+        count_cache.invalidate(Book)
+        await self.invalidate_cached([borrow.id])
+        await self.invalidate_books([book_id])
+        logger.info(f"User with id {user.id} created Borrow with id {borrow.id}")
+
+        return borrow
+
+    async def create_borrows(self, book_ids: list[int], user: User) -> BatchResult:
+        """
+        Выдача нескольких книг одной транзакцией (см. BorrowRepository.checkout_batch).
+
+        Лимит активных выдач действует на весь пакет: книги сверх лимита не выдаются.
+
+        Args:
+            book_ids (list[int]): Идентификаторы книг без повторов.
+            user (User): Пользователь, который получает книги.
+
+        Returns:
+            BatchResult: Результат по каждой книге, id - идентификатор созданной выдачи.
+        """
+        results = await self.repository.checkout_batch(book_ids=book_ids, reader_id=user.id, limit=MAX_ACTIVE_BORROWS)
+        items = []
+        for index, (outcome, borrow) in enumerate(results):
+            status, detail = CHECKOUT_ITEM_STATUSES[outcome]
+            items.append(BatchItemResult(index=index, status=status, id=borrow.id if borrow else None, detail=detail))
+
+        batch_result = self.make_batch_result(items=items, action="created", user=user)
+        if batch_result.succeeded:
+            count_cache.invalidate(Book)
+            await self.invalidate_cached(
+                [item.id for item in batch_result.items if item.status == BatchItemStatus.CREATED]
+            )
+            await self.invalidate_books(
+                [book_ids[item.index] for item in batch_result.items if item.status == BatchItemStatus.CREATED]
+            )
+
+        return batch_result
+
+    async def close_borrows(self, borrow_ids: list[int], user: User = None) -> BatchResult:
+        """
+        Возврат нескольких книг одной транзакцией (см. BorrowRepository.close_batch).
 
-        borrow_in = BorrowCreate(book_id=book_id, reader_id=user.id)
-        result = await self.book_service.update_book_available(book_id=book_id, delta=-1)
-        if result is False:
-            raise NO_COPIES
+        Args:
+            borrow_ids (list[int]): Идентификаторы выдач без повторов.
+            user (User, optional): Пользователь, закрывающий выдачи.
+
+        Returns:
+            BatchResult: Результат по каждой выдаче.
+        """
+        results = await self.repository.close_batch(borrow_ids=borrow_ids)
+        items = []
+        for index, (outcome, borrow) in enumerate(results):
+            status, detail = RETURN_ITEM_STATUSES[outcome]
+            items.append(BatchItemResult(index=index, status=status, id=borrow.id if borrow else None, detail=detail))
 
-        if result is None:
-            raise OBJECT_NOT_FOUND
+        batch_result = self.make_batch_result(items=items, action="updated", user=user)
+        if batch_result.succeeded:
+            count_cache.invalidate(Book)
+            await self.invalidate_cached([borrow.id for outcome, borrow in results if outcome == ReturnOutcome.OK])
+            await self.invalidate_books([borrow.book_id for outcome, borrow in results if outcome == ReturnOutcome.OK])
 
-        return await super().create(obj_in=borrow_in, user=user)
+        return batch_result
 
     async def close_borrow(self, borrow_id: int, user: User = None) -> Borrow:
         """
-        Закрывает выдачу.
+        Закрывает выдачу и возвращает экземпляр книги одной операцией в базе данных (см. BorrowRepository.close).
 
         Args:
             borrow_id (int): Идентификатор выдачи.
@@ -67,13 +143,30 @@ class BorrowService(BaseService):
 
         Raises:
             400 (Bad request): Если книга уже возвращена.
+            404 (Not found): Если выдача не была найдена.
         """
-        borrow_db = await super().get_obj_by_id_or_404(obj_id=borrow_id)
-        returned_book = await self.book_service.get_obj_by_id_or_404(obj_id=borrow_db.book_id)
-        if borrow_db.return_date:
-            raise BOOK_BEEN_RETURNED
-
-        await self.book_service.update_book_available(book_id=returned_book.id, delta=1)
-        borrow_return = BorrowClose(return_date=datetime.now(), id=borrow_id)
+        outcome, borrow = await self.repository.close(borrow_id=borrow_id)
+        match outcome:
+            case ReturnOutcome.ALREADY_RETURNED:
+                raise BOOK_BEEN_RETURNED
+            case ReturnOutcome.BORROW_NOT_FOUND:
+                raise OBJECT_NOT_FOUND
+
+        count_cache.invalidate(Borrow)
+        count_cache.invalidate(Book)
+        await self.invalidate_cached([borrow.id])
+        await self.invalidate_books([borrow.book_id])
+        if user:
+            logger.info(f"User with id {user.id} updated Borrow with id {borrow.id}")
+
+        return borrow
+
+    async def invalidate_books(self, book_ids: list[int]) -> None:
+        """
+        Сброс кэшей книг, у которых изменилось количество доступных экземпляров.
 
-        return await super().update(obj_in=borrow_return, user=user)
+        Args:
+            book_ids (list[int]): Идентификаторы книг.
+        """
+        await entity_cache.invalidate(Book, book_ids)
+        await invalidation_bus.publish(Book, book_ids)
@@ -23,6 +23,16 @@ async def get_auth_repository(session: AsyncSession = Depends(db.session_getter)
     return AuthRepository(session=session)
 
 
+async def get_read_auth_repository(session: AsyncSession = Depends(db.read_session_getter)) -> AuthRepository:
+    """
+    Получение репозитория управления доступом с сессией для чтения (реплика или primary).
+
+    Args:
+        session (AsyncSession): Асинхронная сессия базы данных.
+    """
+    return AuthRepository(session=session)
+
+
 async def get_auth_service(
     token_service: JWTokenManager = Depends(get_token_service),
     token_repository: TokenRepository = Depends(get_token_repository),
@@ -49,15 +59,41 @@ async def get_auth_service(
     )
 
 
+async def get_read_auth_service(
+    token_service: JWTokenManager = Depends(get_token_service),
+    token_repository: TokenRepository = Depends(get_token_repository),
+    passwords_manager: PasswordManager = Depends(get_password_manager),
+    auth_repository: AuthRepository = Depends(get_read_auth_repository),
+) -> AuthService:
+    """
+    Получение сервиса управления доступом, читающего пользователей с реплики (проверка прав по токену).
+
+    Args:
+        token_service (JWTokenManager): Сервис управления токенами.
+        token_repository (TokenRepository): Репозиторий управления токенами.
+        passwords_manager (PasswordManager): Сервис управления паролями.
+        auth_repository (AuthRepository): Репозиторий управления пользователями с сессией для чтения.
+
+    Returns:
+        AuthService: Сервис управления доступом.
+    """
+    return await get_auth_service(
+        token_service=token_service,
+        token_repository=token_repository,
+        passwords_manager=passwords_manager,
+        auth_repository=auth_repository,
+    )
+
+
 async def has_admin_permissions(
-    auth_service: AuthService = Depends(get_auth_service), access_token: str = Depends(oauth2_scheme)
+    auth_service: AuthService = Depends(get_read_auth_service), access_token: str = Depends(oauth2_scheme)
 ) -> User:
     """Проверка действительности access токена и ограничение доступа к ресурсам по роли"""
     return await auth_service.has_permissions(access_token=access_token, permissions=["admin"])
 
 
 async def has_reader_permissions(
-    auth_service: AuthService = Depends(get_auth_service), access_token: str = Depends(oauth2_scheme)
+    auth_service: AuthService = Depends(get_read_auth_service), access_token: str = Depends(oauth2_scheme)
 ) -> User:
     """Проверка действительности access токена и ограничение доступа к ресурсам по роли"""
     return await auth_service.has_permissions(access_token=access_token, permissions=["admin", "reader"])
@@ -41,7 +41,7 @@ async def update_password(
         - **401 (Unauthorized):** Неправильный старый пароль.
         - **401 (Unauthorized):** Пользователь не авторизован.
     """
-    await auth_service.update_password(user=user, credentials=credentials)
+    user = await auth_service.update_password(user=user, credentials=credentials)
     tokens = await auth_service.issue_tokens(user=user)
 
     return set_auth_tokens(response, tokens)
@@ -78,6 +78,7 @@ async def user_update(
     summary="Просмотр списка пользователей",
     status_code=200,
     response_model=UserPagination,
+    response_model_exclude_unset=True,
 )
 async def users_list(
     paginated_fetcher: PaginatedFetcher = Depends(get_paginated_fetcher),
@@ -91,9 +92,14 @@ async def users_list(
     + **Description**: Возвращает список всех пользователей из базы данных с пагинацией и фильтрацией.
     + **Parameters**:
         - **limit** (int) - Количество объектов для пагинации.
-        - **offset** (int) - Начальный индекс для пагинации.
+        - **offset** (int, optional) - Начальный индекс для пагинации.
+        - **after** (str, optional) - Курсор из nextCursor предыдущего ответа, заменяет offset.
+        - **include_total** (bool, optional) - Считать ли totalCount (по умолчанию true).
+        - **approximate_total** (bool, optional) - Приблизительный totalCount для списка без фильтра.
         - **field** (str, optional) - Поле для фильтрации.
         - **value** (Any, optional) - Значение для фильтрации.
+        - **filter** (list[str], optional) - Условия field:operator:value, объединяемые через AND.
+        - **fields** (str, optional) - Поля ответа через запятую (id возвращается всегда).
     + **Response**: **UserPagination** (List[UserDB])
     + **Status Code**: 200 OK
     + **Errors**:
@@ -1,18 +1,36 @@
-from redis import Redis
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import TYPE_CHECKING
 
-from src.core.database.redis import redis_client
+from src.core.config import settings
+from src.core.database.redis import get_redis_client
+from src.core.errors.auth_errors import AUTHENTICATION_UNAVAILABLE
+from src.core.log_config import logger
+
+if TYPE_CHECKING:
+    from redis import Redis
 
 
 class TokenRepository:
     """
     Репозиторий для работы с токенами
 
+    Версия токенов пользователя хранится в Redis и входит в access токен (claim ver), увеличение версии отзывает
+    выданные access токены. Прочитанные версии кэшируются в процессе на version_cache_seconds. Если Redis недоступен,
+    проверка токенов использует версию из кэша процесса, даже устаревшую.
+
     Args:
         redis_client (Redis): Клиент Redis
+        version_cache_seconds (float): Время жизни версии в кэше процесса.
+        version_cache_max_size (int): Максимальное количество версий в кэше процесса.
     """
 
-    def __init__(self, redis_client: Redis):
+    def __init__(self, redis_client: "Redis", version_cache_seconds: float = 0, version_cache_max_size: int = 10_000):
         self.redis_client = redis_client
+        self.version_cache_seconds = version_cache_seconds
+        self.version_cache_max_size = version_cache_max_size
+        self._versions: OrderedDict[int, tuple[int, float]] = OrderedDict()
 
     async def add_token(self, token: str, user_id: int, expire_delta: int) -> None:
         """
@@ -49,9 +67,93 @@ class TokenRepository:
         if token:
             return token.decode("utf-8")
 
+    @staticmethod
+    def get_version_key(user_id: int) -> str:
+        return f"token_version:{user_id}"
+
+    async def get_token_version(self, user_id: int, use_cache: bool = True) -> int:
+        """
+        Получение версии токенов пользователя
+
+        Args:
+            user_id (int): Идентификатор пользователя
+            use_cache (bool): Использовать ли кэш процесса, False - всегда читать из redis
+
+        Returns:
+            int: Версия токенов, 0 - если версия ещё не увеличивалась
+
+        Raises:
+            503 (service unavailable): Если Redis недоступен и версии нет в кэше процесса
+        """
+        from redis.exceptions import RedisError
+
+        cached = self._versions.get(user_id)
+        if use_cache and cached is not None and cached[1] > time.monotonic():
+            return cached[0]
+
+        try:
+            version = await self.redis_client.get(self.get_version_key(user_id))
+
+        except RedisError as exc:
+            if cached is None:
+                logger.error(f"Token version of User with id {user_id} is unavailable: {exc!r}")
+                raise AUTHENTICATION_UNAVAILABLE
+
+            logger.warning(f"Token version of User with id {user_id} was read from process cache: {exc!r}")
+            return cached[0]
+
+        version = int(version) if version else 0
+        self.cache_token_version(user_id=user_id, version=version)
+
+        return version
+
+    async def increment_token_version(self, user_id: int) -> int:
+        """
+        Увеличение версии токенов пользователя, выданные ранее access токены перестают приниматься
+
+        Args:
+            user_id (int): Идентификатор пользователя
+
+        Returns:
+            int: Новая версия токенов
+        """
+        version = await self.redis_client.incr(self.get_version_key(user_id))
+        self.cache_token_version(user_id=user_id, version=version)
+
+        return version
+
+    def apply_invalidation(self, table: str | None, ids: list[int] | None) -> None:
+        """
+        Обработчик событий шины инвалидации (см. InvalidationBus): сброс кэша версий изменённых пользователей
 
-token_repository = TokenRepository(redis_client=redis_client)
+        Args:
+            table (str | None): Имя таблицы, None - сбросить весь кэш.
+            ids (list[int] | None): id изменённых пользователей, None - всех.
+        """
+        if table is None or (table == "users" and ids is None):
+            self._versions.clear()
+        elif table == "users":
+            for user_id in ids:
+                self._versions.pop(user_id, None)
+
+    def cache_token_version(self, user_id: int, version: int) -> None:
+        """
+        Сохранение версии токенов в кэш процесса, при превышении размера вытесняются самые старые записи
+
+        Args:
+            user_id (int): Идентификатор пользователя
+            version (int): Версия токенов
+        """
+        self._versions[user_id] = (version, time.monotonic() + self.version_cache_seconds)
+        self._versions.move_to_end(user_id)
+        while len(self._versions) > self.version_cache_max_size:
+            self._versions.popitem(last=False)
 
 
+@lru_cache
 def get_token_repository() -> TokenRepository:
-    return token_repository
+    return TokenRepository(
+        redis_client=get_redis_client(),
+        version_cache_seconds=settings.auth_jwt.token_version_cache_seconds,
+        version_cache_max_size=settings.auth_jwt.token_version_cache_max_size,
+    )
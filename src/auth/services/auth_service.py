@@ -7,11 +7,12 @@ from src.core.errors.auth_errors import (
 )
 from src.auth.repository.token_repository import TokenRepository
 from src.auth.services.password_service import PasswordManager
-from src.core.models.user_model import User
+from src.core.models.user_model import PermissionsEnum, User
 from src.core.schemas.user_schema import UserCreate, UserBase, UserChangePassword, PasswordSchema, UserRegister
 from src.auth.services.token_service import JWTokenManager
 from src.core.config import settings
 from src.core.services.base_service import BaseService
+from src.core.services.invalidation_bus import invalidation_bus
 from src.auth.repository.auth_repository import AuthRepository
 
 
@@ -54,7 +55,7 @@ class AuthService(BaseService):
         """
         user_create = UserCreate(
             username=form_data.username,
-            hashed_password=self.passwords_manager.hash_password(form_data.password),
+            hashed_password=await self.passwords_manager.hash_password(form_data.password),
         )
 
         return await super().create(obj_in=user_create)
@@ -89,14 +90,16 @@ class AuthService(BaseService):
 
         return refresh_token
 
-    def issue_access(self, user: User) -> str:
+    async def issue_access(self, user: User) -> str:
         """
-        Выпуск нового access токена
+        Выпуск нового access токена с текущей версией токенов пользователя
 
         Args:
             user (User): Пользователь, которому нужно выдать access токен
         """
-        return self.token_service.create_access_token(user)
+        token_version = await self.token_repository.get_token_version(user_id=user.id, use_cache=False)
+
+        return self.token_service.create_access_token(user, token_version=token_version)
 
     async def issue_tokens(self, user: User) -> dict:
         """
@@ -109,7 +112,7 @@ class AuthService(BaseService):
             dict: Словарь с refresh и access токенами
         """
         refresh_token = await self.issue_refresh(user=user)
-        access_token = self.issue_access(user=user)
+        access_token = await self.issue_access(user=user)
 
         return {"refresh_token": refresh_token, "access_token": access_token}
 
@@ -128,7 +131,7 @@ class AuthService(BaseService):
         """
         user = await self.repository.get_one_by_field(value=form_data.username, field="username")
         if user:
-            if self.passwords_manager.validate_password(
+            if await self.passwords_manager.validate_password(
                 password=form_data.password, hashed_password=user.hashed_password
             ):
                 return await self.issue_tokens(user=user)
@@ -180,26 +183,51 @@ class AuthService(BaseService):
         """
         Проверка действительности access токена и ограничение доступа к ресурсам по роли
 
+        Права проверяются по ролям из токена без запроса к базе данных. Токен принимается, только если его версия
+        совпадает с текущей версией токенов пользователя (см. revoke_tokens).
+
         Args:
             access_token (str): Access токен
 
         Returns:
-            User: Пользователь
+            User: Пользователь, построенный по данным токена (id, username, role), не связан с сессией
 
         Raises:
-            401 (unauthorized): Если access токен неверный
+            401 (unauthorized): Если access токен неверный или отозван
             403 (forbidden): Если у пользователя недостаточно прав
+            503 (service unavailable): Если версию токенов не удалось получить (см. TokenRepository.get_token_version)
         """
         if access_token:
-            user = await self.get_user_by_token(access_token)
-            if user:
-                if user.role in permissions:
-                    return user
+            payload = self.token_service.decode_jwt(token=access_token)
+            if payload and payload.get("type") == "access" and "ver" in payload:
+                user_id = int(payload["sub"])
+                token_version = await self.token_repository.get_token_version(user_id=user_id)
+                if payload["ver"] != token_version:
+                    # Версия в кэше процесса могла устареть, например, после входа через другой процесс.
+                    token_version = await self.token_repository.get_token_version(user_id=user_id, use_cache=False)
+
+                if payload["ver"] == token_version:
+                    if payload["role"] in permissions:
+                        return User(id=user_id, username=payload["username"], role=PermissionsEnum(payload["role"]))
 
-                raise FORBIDDEN
+                    raise FORBIDDEN
 
         raise INVALID_ACCESS_TOKEN
 
+    async def revoke_tokens(self, user_id: int) -> None:
+        """
+        Отзыв токенов пользователя: увеличение версии токенов и удаление refresh токена.
+
+        Нужен при смене пароля или роли. Другие процессы сбрасывают кэш версии по событию шины инвалидации,
+        а если событие не доставлено - не позже, чем через token_version_cache_seconds.
+
+        Args:
+            user_id (int): Идентификатор пользователя
+        """
+        await self.token_repository.increment_token_version(user_id=user_id)
+        await self.token_repository.delete_token(user_id=user_id)
+        await invalidation_bus.publish(User, [user_id])
+
     async def update_password(self, user: User, credentials: UserChangePassword) -> User:
         """
         Обновление пароля
@@ -218,10 +246,16 @@ class AuthService(BaseService):
         if credentials.new_password != credentials.confirm_password:
             raise PASSWORDS_MISMATCH
 
-        if user.hashed_password != self.passwords_manager.hash_password(credentials.old_password):
+        db_user = await self.repository.get_obj_by_id(obj_id=user.id)
+        if not db_user or not await self.passwords_manager.validate_password(
+            password=credentials.old_password, hashed_password=db_user.hashed_password
+        ):
             raise INVALID_AUTHENTICATION_CREDENTIALS
 
         password_schema = PasswordSchema(
-            hashed_password=self.passwords_manager.hash_password(credentials.new_password),
+            hashed_password=await self.passwords_manager.hash_password(credentials.new_password),
         )
-        return await super().update(obj_id=user.id, obj_in=password_schema)
+        updated_user = await super().update(obj_id=user.id, obj_in=password_schema)
+        await self.revoke_tokens(user_id=user.id)
+
+        return updated_user
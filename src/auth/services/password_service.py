@@ -1,8 +1,68 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, TypeVar
+
 import bcrypt
 
+from src.core.config import settings
+from src.core.metrics import metrics
+
+T = TypeVar("T")
+
 
 class PasswordManager:
-    def hash_password(self, password: str) -> bytes:
+    """
+    Хэширование и проверка паролей bcrypt в пуле потоков.
+
+    bcrypt отпускает GIL, поэтому вычисление в отдельном потоке не блокирует цикл событий. Размер пула ограничивает
+    количество одновременных вычислений, остальные ждут в очереди пула.
+
+    Attributes:
+        max_workers (int): Максимальное количество одновременных вычислений bcrypt.
+        in_flight (int): Количество вычислений в очереди и в работе.
+    """
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self.in_flight = 0
+        self._executor: ThreadPoolExecutor | None = None
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """Пул потоков, создаётся при первом использовании."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="bcrypt")
+        return self._executor
+
+    async def run(self, func: Callable[..., T], *args) -> T:
+        """
+        Выполнение вычисления bcrypt в пуле потоков с записью метрик очереди.
+
+        Args:
+            func (Callable): Функция bcrypt.
+            *args: Аргументы функции.
+
+        Returns:
+            Результат функции.
+        """
+        metrics.observe("passwords.queue_depth", max(self.in_flight - self.max_workers + 1, 0))
+        self.in_flight += 1
+        submitted = time.perf_counter()
+
+        def call() -> tuple[float, T]:
+            # Метрики пишутся в потоке цикла событий, здесь только замер ожидания в очереди.
+            return time.perf_counter() - submitted, func(*args)
+
+        try:
+            wait_seconds, result = await asyncio.get_running_loop().run_in_executor(self.executor, call)
+        finally:
+            self.in_flight -= 1
+
+        metrics.observe("passwords.wait_seconds", wait_seconds)
+        return result
+
+    async def hash_password(self, password: str) -> bytes:
         """
         Хэширует пароль с помощью bcrypt.
 
@@ -12,11 +72,9 @@ class PasswordManager:
         Returns:
             bytes: Хэшированный пароль.
         """
-        salt = bcrypt.gensalt()
-        pwd_bytes: bytes = password.encode()
-        return bcrypt.hashpw(pwd_bytes, salt)
+        return await self.run(bcrypt.hashpw, password.encode(), bcrypt.gensalt())
 
-    def validate_password(self, password: str, hashed_password: bytes) -> bool:
+    async def validate_password(self, password: str, hashed_password: bytes) -> bool:
         """
         Проверяет, совпадает ли обычный пароль с хэшированным.
 
@@ -28,10 +86,16 @@ class PasswordManager:
             True: если пароли совпадают,
             False: если пароли разные.
         """
-        return bcrypt.checkpw(password.encode(), hashed_password)
+        return await self.run(bcrypt.checkpw, password.encode(), hashed_password)
+
+    def shutdown(self) -> None:
+        """Остановка пула потоков."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
 
 
-passwords_manager = PasswordManager()
+passwords_manager = PasswordManager(max_workers=settings.passwords.bcrypt_workers)
 
 
 def get_password_manager() -> PasswordManager:
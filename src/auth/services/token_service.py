@@ -1,32 +1,94 @@
 import datetime
+import time
+from collections import OrderedDict
+from functools import cached_property
+from pathlib import Path
 
 import jwt
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+from cryptography.hazmat.primitives.asymmetric.types import PrivateKeyTypes, PublicKeyTypes
+from cryptography.hazmat.primitives.serialization import load_pem_private_key, load_pem_public_key
 from jwt import InvalidTokenError
 
 from src.core.models.user_model import User
 from src.core.config import settings
 
 
+def get_key_algorithm(key: PrivateKeyTypes | PublicKeyTypes) -> str:
+    """
+    Определение алгоритма подписи JWT по типу ключа.
+
+    Args:
+        key: Приватный или публичный ключ.
+
+    Returns:
+        str: RS256 для RSA, ES256 для EC P-256, EdDSA для Ed25519.
+
+    Raises:
+        ValueError: Если тип ключа не поддерживается.
+    """
+    if isinstance(key, (rsa.RSAPrivateKey, rsa.RSAPublicKey)):
+        return "RS256"
+    if isinstance(key, (ec.EllipticCurvePrivateKey, ec.EllipticCurvePublicKey)) and key.curve.name == "secp256r1":
+        return "ES256"
+    if isinstance(key, (ed25519.Ed25519PrivateKey, ed25519.Ed25519PublicKey)):
+        return "EdDSA"
+
+    raise ValueError(f"Unsupported JWT key type: {type(key).__name__}")
+
+
 class JWTokenManager:
     """
     Сервисный класс для работы с токенами.
+
+    Ключи читаются из файлов и разбираются один раз при первом использовании, а не при импорте и не на каждый токен.
+    Токен подписывается текущим ключом (заголовок kid), проверяется ключом с kid из заголовка: текущим или одним из
+    предыдущих (previous_public_key_paths) на время ротации ключей. Алгоритм проверки определяется типом ключа.
+
+    Проверенные токены кэшируются (токен -> данные) до истечения exp, размер кэша - verified_cache_size.
+
+    Attributes:
+        verified_cache_size (int): Максимальное количество проверенных токенов в кэше, 0 - без кэша.
     """
 
+    def __init__(self, verified_cache_size: int = 0):
+        self.verified_cache_size = verified_cache_size
+        self._verified: OrderedDict[str, dict] = OrderedDict()
+
+    @cached_property
+    def private_key(self) -> PrivateKeyTypes:
+        private_key = load_pem_private_key(settings.auth_jwt.private_key_path.read_bytes(), password=None)
+        if get_key_algorithm(private_key) != settings.auth_jwt.algorithm:
+            raise ValueError(f"Private key does not match JWT algorithm {settings.auth_jwt.algorithm}")
+        return private_key
+
+    @cached_property
+    def public_keys(self) -> dict[str, PublicKeyTypes]:
+        key_paths: dict[str, Path] = {
+            **settings.auth_jwt.previous_public_key_paths,
+            settings.auth_jwt.key_id: settings.auth_jwt.public_key_path,
+        }
+        return {key_id: load_pem_public_key(path.read_bytes()) for key_id, path in key_paths.items()}
+
+    @property
+    def public_key(self) -> PublicKeyTypes:
+        return self.public_keys[settings.auth_jwt.key_id]
+
     def encode_jwt(
         self,
         payload: dict,
         expire_seconds: int,
-        private_key=settings.auth_jwt.private_key_path.read_text(),
-        algorithm: str = settings.auth_jwt.algorithm,
+        private_key: PrivateKeyTypes | str | None = None,
+        algorithm: str | None = None,
     ) -> str:
         """
         Кодирует токен приватным ключом.
 
         Args:
             payload (dict): Тело токена.
-            expire_seconds (int): Срок действия токена.
-            private_key (str): Приватный ключ.
-            algorithm (str): Алгоритм кодирования.
+            expire_seconds (int): Срок действия токена.
+            private_key (optional): Приватный ключ, по умолчанию - ключ из настроек (с заголовком kid).
+            algorithm (str, optional): Алгоритм кодирования, по умолчанию - из настроек.
 
         Returns:
             str: Строка с закодированным токеном.
@@ -35,34 +97,91 @@ class JWTokenManager:
         now = datetime.datetime.now(datetime.UTC)
         expire = now + datetime.timedelta(seconds=expire_seconds)
         to_encode.update({"exp": expire, "iat": now})
-
-        return jwt.encode(to_encode, private_key, algorithm=algorithm)
+        if private_key is not None:
+            return jwt.encode(to_encode, private_key, algorithm=algorithm or settings.auth_jwt.algorithm)
+
+        return jwt.encode(
+            to_encode,
+            self.private_key,
+            algorithm=settings.auth_jwt.algorithm,
+            headers={"kid": settings.auth_jwt.key_id},
+        )
 
     def decode_jwt(
         self,
         token: str | bytes,
-        public_key: str = settings.auth_jwt.public_key_path.read_text(),
-        algorithm: str = settings.auth_jwt.algorithm,
+        public_key: PublicKeyTypes | str | None = None,
+        algorithm: str | None = None,
     ) -> dict | None:
         """
         Декодирует токен публичным ключом.
 
         Args:
             token (str): Закодированный токен.
-            public_key (str): Публичный ключ.
-            algorithm (str): Алгоритм декодирования.
+            public_key (optional): Публичный ключ, по умолчанию - ключ из настроек по kid из заголовка токена.
+            algorithm (str, optional): Алгоритм декодирования, по умолчанию - по типу ключа.
 
         Returns:
             dict: Словарь с данными токена.
             None: Если токен неверный.
         """
         try:
-            decoded = jwt.decode(token, public_key, algorithms=[algorithm])
+            if public_key is not None:
+                return jwt.decode(token, public_key, algorithms=[algorithm or settings.auth_jwt.algorithm])
+
+            if isinstance(token, bytes):
+                token = token.decode()
+            cached = self._verified.get(token)
+            if cached is not None:
+                if cached["exp"] > time.time():
+                    self._verified.move_to_end(token)
+                    return dict(cached)
+                del self._verified[token]
+
+            key_id = jwt.get_unverified_header(token).get("kid", settings.auth_jwt.key_id)
+            key = self.public_keys.get(key_id)
+            if key is None:
+                return None
+            decoded = jwt.decode(token, key, algorithms=[get_key_algorithm(key)])
+            self.cache_verified(token=token, claims=decoded)
             return decoded
 
         except InvalidTokenError:
             return None
 
+    def get_user_id(self, token: str) -> int | None:
+        """
+        Получение id пользователя из access-токена. Версия токенов не проверяется (см. AuthService.has_permissions),
+        используется для read-your-writes (см. ReadYourWritesMiddleware).
+
+        Args:
+            token (str): Закодированный access-токен.
+
+        Returns:
+            int: id пользователя.
+            None: Если токен неверный или это не access-токен.
+        """
+        payload = self.decode_jwt(token)
+        if payload is None or payload.get("type") != "access":
+            return None
+
+        return int(payload["sub"])
+
+    def cache_verified(self, token: str, claims: dict) -> None:
+        """
+        Сохранение проверенного токена в кэш, при превышении размера вытесняются давно не использованные токены.
+
+        Args:
+            token (str): Закодированный токен.
+            claims (dict): Данные токена.
+        """
+        if not self.verified_cache_size or "exp" not in claims:
+            return
+
+        self._verified[token] = dict(claims)
+        while len(self._verified) > self.verified_cache_size:
+            self._verified.popitem(last=False)
+
     def create_token(self, token_type: str, token_data: dict, expire_seconds: int) -> str:
         """
         Cоздает токен.
@@ -83,17 +202,20 @@ class JWTokenManager:
             expire_seconds=expire_seconds,
         )
 
-    def create_access_token(self, user: User) -> str:
+    def create_access_token(self, user: User, token_version: int = 0) -> str:
         """
         Создает access токен.
 
+        Роль и версия токенов пользователя входят в токен, поэтому права проверяются без запроса к базе данных.
+
         Args:
             user (User): Пользователь которому нужно выдать access токен.
+            token_version (int): Версия токенов пользователя (см. TokenRepository.get_token_version).
 
         Returns:
             str: Строка с закодированным access токеном.
         """
-        jwt_payload = {"sub": str(user.id), "username": user.username}
+        jwt_payload = {"sub": str(user.id), "username": user.username, "role": user.role, "ver": token_version}
         return self.create_token(
             token_type="access",
             token_data=jwt_payload,
@@ -118,7 +240,7 @@ class JWTokenManager:
         )
 
 
-token_service = JWTokenManager()
+token_service = JWTokenManager(verified_cache_size=settings.auth_jwt.verified_token_cache_size)
 
 
 def get_token_service() -> JWTokenManager:
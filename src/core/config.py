@@ -1,3 +1,4 @@
+import enum
 import os
 from pathlib import Path
 
@@ -5,16 +6,109 @@ from pydantic import BaseModel
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
+class EngineSettings(BaseModel):
+    """
+    Настройки пула соединений движка базы данных.
+
+    pool_timeout - сколько ждать свободного соединения, command_timeout - ограничение времени запроса (asyncpg),
+    statement_cache_size - размер кэша подготовленных запросов (0 - для pgbouncer в режиме transaction).
+    """
+
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_timeout: float = 30
+    pool_recycle: int = 30 * 60  # 30 minutes
+    pool_pre_ping: bool = True
+    statement_cache_size: int = 100
+    command_timeout: float | None = None
+    connect_timeout: float = 10
+
+
+class InteractiveEngineSettings(EngineSettings):
+    """
+    Пул для запросов API: короткие таймауты, запрос не должен долго ждать соединения.
+    """
+
+    pool_size: int = 10
+    pool_timeout: float = 5
+    command_timeout: float | None = 15
+    connect_timeout: float = 3
+
+
+class BulkEngineSettings(EngineSettings):
+    """
+    Пул для выгрузок, пакетных операций и фоновых задач, не занимает соединения пула API.
+    """
+
+    pool_size: int = 2
+    max_overflow: int = 2
+    pool_timeout: float = 60
+
+
+class ReplicaSelection(str, enum.Enum):
+    """
+    Выбор реплики для чтения.
+
+    ROUND_ROBIN: Реплики по очереди.
+    LEAST_BUSY: Реплика с наименьшим количеством занятых соединений пула.
+    """
+
+    ROUND_ROBIN = "round_robin"
+    LEAST_BUSY = "least_busy"
+
+
 class PostgresSettings(BaseSettings):
+    """
+    Настройки базы данных. Параметры движков задаются через env вида INTERACTIVE_ENGINE__POOL_SIZE.
+
+    Реплики (replica_urls, env REPLICA_URLS='["postgresql+asyncpg://..."]') используют настройки interactive_engine.
+    Недоступная реплика исключается на replica_retry_seconds, после записи пользователь read_your_writes_seconds
+    читает с primary.
+    """
+
+    model_config = SettingsConfigDict(env_nested_delimiter="__")
+
     url: str = "postgresql+asyncpg://admin:admin@db/library"
+    interactive_engine: InteractiveEngineSettings = InteractiveEngineSettings()
+    bulk_engine: BulkEngineSettings = BulkEngineSettings()
+    replica_urls: list[str] = []
+    replica_selection: ReplicaSelection = ReplicaSelection.ROUND_ROBIN
+    replica_retry_seconds: float = 30
+    read_your_writes_seconds: float = 5
 
 
 class AuthJWT(BaseSettings):
-    private_key_path: Path = Path(os.getenv("PRIVATE_KEY_PATH"))
-    public_key_path: Path = Path(os.getenv("PUBLIC_KEY_PATH"))
+    """
+    Настройки JWT. algorithm - RS256, ES256 или EdDSA, должен соответствовать типу ключей.
+
+    key_id - kid текущего ключа, previous_public_key_paths - публичные ключи предыдущих kid, токены которых ещё
+    принимаются во время ротации (env PREVIOUS_PUBLIC_KEY_PATHS='{"old": "/run/secrets/old_public_key"}').
+    """
+
+    private_key_path: Path  # env PRIVATE_KEY_PATH
+    public_key_path: Path  # env PUBLIC_KEY_PATH
     algorithm: str = "RS256"
+    key_id: str = "main"
+    previous_public_key_paths: dict[str, Path] = {}
+    verified_token_cache_size: int = 10_000
     access_token_expire_seconds: int = 15 * 60  # 15 minutes
     refresh_token_expire_seconds: int = 30 * (24 * 60 * 60)  # 30 days
+    token_version_cache_seconds: float = 5
+    token_version_cache_max_size: int = 10_000
+
+
+class RedisSettings(BaseSettings):
+    model_config = SettingsConfigDict(env_prefix="redis_")
+
+    url: str = "redis://redis:6379/0"  # env REDIS_URL
+
+
+class PasswordSettings(BaseSettings):
+    """
+    Хэширование паролей: bcrypt_workers - размер пула потоков bcrypt, сколько паролей хэшируется одновременно.
+    """
+
+    bcrypt_workers: int = 4
 
 
 class LoggingSettings(BaseSettings):
@@ -23,11 +117,73 @@ class LoggingSettings(BaseSettings):
     backup_count: int = 3
 
 
+class PaginationSettings(BaseSettings):
+    count_cache_ttl_seconds: int = 30
+    count_cache_max_size: int = 10_000
+
+
+class EntityCacheSettings(BaseSettings):
+    """
+    Кэш объектов каталога по id: L1 в памяти процесса, L2 в Redis (env ENTITY_CACHE_L1_TTL_SECONDS и т.д.).
+    """
+
+    model_config = SettingsConfigDict(env_prefix="entity_cache_")
+
+    l1_ttl_seconds: float = 5
+    l1_max_size: int = 10_000
+    l2_ttl_seconds: int = 5 * 60  # 5 minutes
+
+
+class InvalidationBusSettings(BaseSettings):
+    """
+    Шина инвалидации кэшей процессов через Redis pub/sub (env INVALIDATION_BUS_CHANNEL и т.д.).
+    """
+
+    model_config = SettingsConfigDict(env_prefix="invalidation_bus_")
+
+    enabled: bool = True
+    channel: str = "cache_invalidation"
+    retry_seconds: float = 1
+
+
+class ExportSettings(BaseSettings):
+    yield_per: int = 1000
+
+
+class InventorySettings(BaseSettings):
+    reconcile_interval_seconds: int = 60
+    active_borrows_check_interval_seconds: int = 60 * 60  # 1 hour
+
+
+class StartupMode(str, enum.Enum):
+    """
+    Проверки при старте приложения.
+
+    CHECK: Проверка, что к базе данных применены все миграции (один запрос).
+    SKIP: Без обращений к базе данных, миграции применяются отдельным шагом развёртывания.
+    """
+
+    CHECK = "check"
+    SKIP = "skip"
+
+
+class AppSettings(BaseSettings):
+    startup_mode: StartupMode = StartupMode.CHECK
+
+
 class Settings(BaseModel):
     model_config = SettingsConfigDict(case_sensitive=False)
+    app: AppSettings = AppSettings()
     db: PostgresSettings = PostgresSettings()
+    redis: RedisSettings = RedisSettings()
     auth_jwt: AuthJWT = AuthJWT()
+    passwords: PasswordSettings = PasswordSettings()
     logging: LoggingSettings = LoggingSettings()
+    pagination: PaginationSettings = PaginationSettings()
+    entity_cache: EntityCacheSettings = EntityCacheSettings()
+    invalidation_bus: InvalidationBusSettings = InvalidationBusSettings()
+    export: ExportSettings = ExportSettings()
+    inventory: InventorySettings = InventorySettings()
 
 
 settings = Settings()
@@ -0,0 +1,20 @@
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+async def try_advisory_xact_lock(session: AsyncSession, key: int) -> bool:
+    """
+    Получение транзакционной рекомендательной блокировки PostgreSQL (pg_try_advisory_xact_lock) без ожидания.
+
+    Блокировка снимается вместе с транзакцией сессии (commit или rollback), поэтому соединение из пула занято только
+    на время задачи. Используется, чтобы периодическую задачу выполнял один процесс: процессы, запустившие её,
+    пока транзакция с блокировкой не завершена, пропускают запуск.
+
+    Args:
+        session (AsyncSession): Сессия, в транзакции которой выполняется задача.
+        key (int): Ключ блокировки.
+
+    Returns:
+        bool: True - блокировка получена в транзакции сессии.
+    """
+    return await session.scalar(select(func.pg_try_advisory_xact_lock(key)))
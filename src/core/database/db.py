@@ -1,31 +1,202 @@
-from typing import AsyncGenerator
+import enum
+from typing import AsyncGenerator, Callable, Sequence
 
+from fastapi import Depends, Request
+from sqlalchemy import Engine
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 
-from src.core.models.base_model import Base
-from src.core.config import settings
+from src.core.config import EngineSettings, ReplicaSelection, settings
+from src.core.database.replicas import ReadSession, RecentWrites, ReplicaSet, has_recent_write_cookie
+from src.core.log_config import logger
+from src.core.metrics import instrument_engine
+
+
+class EngineName(str, enum.Enum):
+    """
+    Движки базы данных с отдельными пулами соединений (см. PostgresSettings).
+    """
+
+    INTERACTIVE = "interactive"
+    BULK = "bulk"
+
+
+def create_engine(db_url: str, engine_settings: EngineSettings) -> AsyncEngine:
+    """
+    Создание движка базы данных с настройками пула соединений.
+
+    Args:
+        db_url (str): Адрес базы данных.
+        engine_settings (EngineSettings): Настройки пула.
+
+    Returns:
+        AsyncEngine: Движок базы данных, соединения открываются при первом запросе.
+    """
+    connect_args = {
+        "statement_cache_size": engine_settings.statement_cache_size,
+        "prepared_statement_cache_size": engine_settings.statement_cache_size,
+    }
+    connect_args["timeout"] = engine_settings.connect_timeout
+    if engine_settings.command_timeout is not None:
+        connect_args["command_timeout"] = engine_settings.command_timeout
+
+    return create_async_engine(
+        url=db_url,
+        pool_size=engine_settings.pool_size,
+        max_overflow=engine_settings.max_overflow,
+        pool_timeout=engine_settings.pool_timeout,
+        pool_recycle=engine_settings.pool_recycle,
+        pool_pre_ping=engine_settings.pool_pre_ping,
+        connect_args=connect_args,
+    )
 
 
 class DatabaseManager:
-    def __init__(self, db_url: str) -> None:
-        self.engine: AsyncEngine = create_async_engine(url=db_url)
-        self.session_factory: async_sessionmaker[AsyncSession] = async_sessionmaker(
-            bind=self.engine,
+    def __init__(
+        self,
+        db_url: str,
+        engines: dict[EngineName, EngineSettings],
+        replica_urls: Sequence[str] = (),
+        replica_selection: ReplicaSelection = ReplicaSelection.ROUND_ROBIN,
+        replica_retry_seconds: float = 30,
+        read_your_writes_seconds: float = 5,
+    ) -> None:
+        self.engines: dict[EngineName, AsyncEngine] = {
+            name: create_engine(db_url=db_url, engine_settings=engine_settings)
+            for name, engine_settings in engines.items()
+        }
+        self.session_factories: dict[EngineName, async_sessionmaker[AsyncSession]] = {
+            name: async_sessionmaker(
+                bind=engine,
+                autoflush=False,
+                autocommit=False,
+                expire_on_commit=False,
+            )
+            for name, engine in self.engines.items()
+        }
+        self.engine: AsyncEngine = self.engines[EngineName.INTERACTIVE]
+        self.session_factory: async_sessionmaker[AsyncSession] = self.session_factories[EngineName.INTERACTIVE]
+        self.bulk_session_factory: async_sessionmaker[AsyncSession] = self.session_factories[EngineName.BULK]
+        self.replicas = ReplicaSet(
+            engines=[
+                create_engine(db_url=url, engine_settings=engines[EngineName.INTERACTIVE]) for url in replica_urls
+            ],
+            selection=replica_selection,
+            retry_seconds=replica_retry_seconds,
+        )
+        self.read_session_factory: async_sessionmaker[AsyncSession] = async_sessionmaker(
+            sync_session_class=ReadSession,
             autoflush=False,
             autocommit=False,
             expire_on_commit=False,
+            info={"choose_bind": self.choose_read_bind, "primary": self.engine.sync_engine},
         )
+        self.read_your_writes_seconds = read_your_writes_seconds
+        self.recent_writes = RecentWrites(window_seconds=read_your_writes_seconds)
+        self.read_session_getter = self.make_read_session_getter()
+
+        for name, engine in self.engines.items():
+            instrument_engine(engine, name=name.value)
+        for index, engine in enumerate(self.replicas.engines):
+            instrument_engine(engine, name=f"replica_{index}")
 
     async def dispose(self) -> None:
-        await self.engine.dispose()
+        for engine in self.engines.values():
+            await engine.dispose()
+        await self.replicas.dispose()
 
     async def session_getter(self) -> AsyncGenerator[AsyncSession, None]:
         async with self.session_factory() as session:
             yield session
 
-    async def create_tables(self) -> None:
-        async with self.engine.begin() as conn:
-            await conn.run_sync(Base.metadata.create_all)
+    def make_read_session_getter(self) -> Callable[..., AsyncGenerator[AsyncSession, None]]:
+        """
+        Создание зависимости read_session_getter.
+
+        Returns:
+            Callable: Зависимость, возвращающая сессию для запросов только на чтение.
+        """
+
+        async def read_session_getter(
+            request: Request, session: AsyncSession = Depends(self.session_getter)
+        ) -> AsyncGenerator[AsyncSession, None]:
+            """
+            Сессия для запросов только на чтение. Без реплик или после недавней записи пользователя
+            (см. ReadYourWritesMiddleware) - сессия primary этого же запроса, иначе - сессия чтения,
+            выбирающая реплику при первом запросе (см. choose_read_bind).
+            """
+            if not self.replicas.engines or await self.has_recent_write(request):
+                yield session
+                return
+
+            async with self.read_session_factory() as read_session:
+                yield read_session
+
+        return read_session_getter
+
+    async def has_recent_write(self, request: Request) -> bool:
+        """
+        Проверка, выполнял ли пользователь запроса (request.state.user_id) или клиент (cookie last_write) запись
+        в последние read_your_writes_seconds.
+
+        Args:
+            request (Request): Запрос.
+
+        Returns:
+            bool: True - читать нужно с primary.
+        """
+        if has_recent_write_cookie(request, self.read_your_writes_seconds):
+            return True
+
+        user_id = getattr(request.state, "user_id", None)
+        return user_id is not None and await self.recent_writes.has_recent_write(user_id)
+
+    def choose_read_bind(self) -> Engine:
+        """
+        Выбор движка для сессии чтения: первая доступная реплика, иначе primary.
+
+        Доступность проверяется соединением из пула реплики, недоступная реплика исключается из выбора.
+        Выполняется в синхронном контексте сессии при первом запросе.
+
+        Returns:
+            Engine: Синхронный движок реплики или primary.
+        """
+        for engine in self.replicas.get_candidates():
+            try:
+                with engine.sync_engine.connect():
+                    return engine.sync_engine
+
+            except (OSError, TimeoutError, DBAPIError):
+                self.replicas.mark_down(engine)
+                logger.warning(f"Replica {engine.url.render_as_string()} is unavailable, excluded from reads")
+
+        return self.engine.sync_engine
+
+    async def bulk_session_getter(self) -> AsyncGenerator[AsyncSession, None]:
+        async with self.bulk_session_factory() as session:
+            yield session
+
+    def session_factory_getter(self) -> async_sessionmaker[AsyncSession]:
+        return self.session_factory
+
+    def bulk_session_factory_getter(self) -> async_sessionmaker[AsyncSession]:
+        return self.bulk_session_factory
+
+    async def check_schema_revision(self) -> None:
+        # alembic импортируется только при проверке, чтобы не замедлять импорт приложения.
+        from src.core.database.migrations import check_schema_revision
+
+        await check_schema_revision(self.engine)
 
 
-db = DatabaseManager(db_url=settings.db.url)
+db = DatabaseManager(
+    db_url=settings.db.url,
+    engines={
+        EngineName.INTERACTIVE: settings.db.interactive_engine,
+        EngineName.BULK: settings.db.bulk_engine,
+    },
+    replica_urls=settings.db.replica_urls,
+    replica_selection=settings.db.replica_selection,
+    replica_retry_seconds=settings.db.replica_retry_seconds,
+    read_your_writes_seconds=settings.db.read_your_writes_seconds,
+)
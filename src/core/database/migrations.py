@@ -0,0 +1,60 @@
+from pathlib import Path
+
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+ALEMBIC_CONFIG_PATH = Path(__file__).resolve().parents[3] / "alembic.ini"
+
+
+def get_alembic_config() -> Config:
+    """
+    Получение конфигурации alembic проекта (alembic.ini в корне репозитория).
+
+    Returns:
+        Config: Конфигурация alembic.
+    """
+    return Config(str(ALEMBIC_CONFIG_PATH))
+
+
+def get_head_revisions() -> set[str]:
+    """
+    Получение последних ревизий миграций.
+
+    Returns:
+        set[str]: Идентификаторы head ревизий.
+    """
+    return set(ScriptDirectory.from_config(get_alembic_config()).get_heads())
+
+
+async def get_current_revisions(engine: AsyncEngine) -> set[str]:
+    """
+    Получение ревизий, применённых к базе данных (таблица alembic_version).
+
+    Args:
+        engine (AsyncEngine): Движок базы данных.
+
+    Returns:
+        set[str]: Идентификаторы применённых ревизий, пустое множество - миграции не применялись.
+    """
+    async with engine.connect() as conn:
+        return set(await conn.run_sync(lambda sync_conn: MigrationContext.configure(sync_conn).get_current_heads()))
+
+
+async def check_schema_revision(engine: AsyncEngine) -> None:
+    """
+    Проверка, что к базе данных применены все миграции.
+
+    Args:
+        engine (AsyncEngine): Движок базы данных.
+
+    Raises:
+        RuntimeError: Если ревизия базы данных отличается от последней ревизии миграций.
+    """
+    current, head = await get_current_revisions(engine), get_head_revisions()
+    if current != head:
+        raise RuntimeError(
+            f"Database schema revision {sorted(current) or 'none'} doesn't match migrations head {sorted(head)}, "
+            f"run `alembic upgrade head`"
+        )
@@ -1,7 +1,29 @@
-from redis.asyncio import Redis
+from functools import lru_cache
+from typing import TYPE_CHECKING
 
-redis_client = Redis(host="redis", port=6379, db=0)
+from src.core.config import settings
 
+if TYPE_CHECKING:
+    from redis.asyncio import Redis
 
-def get_redis_client():
-    return redis_client
+
+@lru_cache
+def get_redis_client() -> "Redis":
+    """
+    Получение клиента Redis. Клиент (и модуль redis) создаётся при первом обращении, а не при импорте приложения.
+
+    Returns:
+        Redis: Клиент Redis.
+    """
+    from redis.asyncio import Redis
+
+    return Redis.from_url(settings.redis.url)
+
+
+async def close_redis_client() -> None:
+    """
+    Закрытие соединений клиента Redis, если клиент был создан.
+    """
+    if get_redis_client.cache_info().currsize:
+        await get_redis_client().aclose()
+        get_redis_client.cache_clear()
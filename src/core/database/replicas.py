@@ -0,0 +1,251 @@
+import itertools
+import time
+from typing import TYPE_CHECKING, Callable, Sequence
+
+from sqlalchemy import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import Session
+from starlette.datastructures import MutableHeaders
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.config import ReplicaSelection
+from src.core.database.redis import get_redis_client
+from src.core.log_config import logger
+
+if TYPE_CHECKING:
+    from redis.asyncio import Redis
+
+LAST_WRITE_COOKIE = "last_write"
+
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+class ReplicaSet:
+    """
+    Набор реплик для чтения с выбором по очереди или по загрузке пула и исключением недоступных реплик.
+
+    Attributes:
+        engines (Sequence[AsyncEngine]): Движки реплик.
+        selection (ReplicaSelection): Способ выбора реплики.
+        retry_seconds (float): На сколько секунд недоступная реплика исключается из выбора.
+    """
+
+    def __init__(self, engines: Sequence[AsyncEngine], selection: ReplicaSelection, retry_seconds: float):
+        self.engines = list(engines)
+        self.selection = selection
+        self.retry_seconds = retry_seconds
+        self._down_until: dict[AsyncEngine, float] = {}
+        self._counter = itertools.count()
+
+    def get_candidates(self) -> list[AsyncEngine]:
+        """
+        Получение доступных реплик в порядке, в котором их следует пробовать.
+
+        Returns:
+            list[AsyncEngine]: Движки реплик, пустой список - читать с primary.
+        """
+        now = time.monotonic()
+        healthy = [engine for engine in self.engines if self._down_until.get(engine, 0) <= now]
+        if not healthy:
+            return []
+
+        if self.selection == ReplicaSelection.LEAST_BUSY:
+            return sorted(healthy, key=lambda engine: engine.pool.checkedout())
+
+        start = next(self._counter) % len(healthy)
+        return healthy[start:] + healthy[:start]
+
+    def mark_down(self, engine: AsyncEngine) -> None:
+        """
+        Исключение реплики из выбора на retry_seconds.
+
+        Args:
+            engine (AsyncEngine): Движок недоступной реплики.
+        """
+        self._down_until[engine] = time.monotonic() + self.retry_seconds
+
+    async def dispose(self) -> None:
+        for engine in self.engines:
+            await engine.dispose()
+
+
+class ReadSession(Session):
+    """
+    Сессия чтения: движок (реплика или primary) выбирается при первом запросе функцией info["choose_bind"],
+    поэтому соединение не берётся, пока сессия не используется.
+    """
+
+    def get_bind(self, *args, **kwargs) -> Engine:
+        if "bind" not in self.info:
+            self.info["bind"] = self.info["choose_bind"]()
+
+        return self.info["bind"]
+
+
+def reads_from_replica(session: AsyncSession) -> bool:
+    """
+    Проверка, читала ли сессия с реплики (сессия чтения, выбравшая реплику, а не primary).
+
+    Args:
+        session (AsyncSession): Сессия.
+
+    Returns:
+        bool: True - данные сессии могут отставать от primary.
+    """
+    info = session.sync_session.info
+    return "bind" in info and info["bind"] is not info["primary"]
+
+
+class RecentWrites:
+    """
+    Время последней записи пользователей для read-your-writes.
+
+    Запись пользователя отмечается в процессе и в Redis ключом last_write:{user_id} со временем жизни window_seconds,
+    поэтому после записи через один процесс чтение через любой другой процесс идёт с primary. Если Redis недоступен,
+    запись считается недавней: лишнее чтение с primary лучше, чем устаревшие данные.
+
+    Attributes:
+        window_seconds (float): Окно read-your-writes.
+        redis_client_getter (Callable): Получение клиента Redis.
+    """
+
+    def __init__(self, window_seconds: float, redis_client_getter: Callable[[], "Redis"] = get_redis_client):
+        self.window_seconds = window_seconds
+        self.redis_client_getter = redis_client_getter
+        self._local: dict[int, float] = {}
+
+    @staticmethod
+    def get_redis_key(user_id: int) -> str:
+        return f"last_write:{user_id}"
+
+    async def record(self, user_id: int) -> None:
+        """
+        Отметка записи пользователя.
+
+        Args:
+            user_id (int): id пользователя.
+        """
+        from redis.exceptions import RedisError
+
+        now = time.monotonic()
+        self._local = {key: value for key, value in self._local.items() if now - value < self.window_seconds}
+        self._local[user_id] = now
+        try:
+            await self.redis_client_getter().set(self.get_redis_key(user_id), 1, px=int(self.window_seconds * 1000))
+
+        except RedisError as exc:
+            logger.warning(f"Last write of User with id {user_id} was not recorded: {exc!r}")
+
+    async def has_recent_write(self, user_id: int) -> bool:
+        """
+        Проверка, выполнял ли пользователь запись в последние window_seconds.
+
+        Args:
+            user_id (int): id пользователя.
+
+        Returns:
+            bool: True - читать нужно с primary.
+        """
+        from redis.exceptions import RedisError
+
+        last_write = self._local.get(user_id)
+        if last_write is not None and time.monotonic() - last_write < self.window_seconds:
+            return True
+
+        try:
+            return bool(await self.redis_client_getter().exists(self.get_redis_key(user_id)))
+
+        except RedisError as exc:
+            logger.warning(f"Last write of User with id {user_id} was not checked: {exc!r}")
+            return True
+
+
+def has_recent_write_cookie(request: Request, window_seconds: float) -> bool:
+    """
+    Проверка, выполнял ли клиент запись в последние window_seconds (cookie last_write, для клиентов без токена
+    или с другим пользователем на том же клиенте).
+
+    Args:
+        request (Request): Запрос.
+        window_seconds (float): Окно read-your-writes.
+
+    Returns:
+        bool: True - читать нужно с primary.
+    """
+    try:
+        last_write = float(request.cookies.get(LAST_WRITE_COOKIE, 0))
+    except ValueError:
+        return False
+
+    return time.time() - last_write < window_seconds
+
+
+class ReadYourWritesMiddleware:
+    """
+    ASGI middleware read-your-writes: определяет пользователя по access-токену (request.state.user_id) и отмечает
+    его успешные изменяющие запросы в RecentWrites, дополнительно - cookie last_write со временем записи.
+
+    Пока запись пользователя не старше window_seconds, read_session_getter читает с primary, поэтому пользователь
+    видит свои изменения с любого клиента, даже если реплики ещё не догнали primary.
+
+    Attributes:
+        app (ASGIApp): Приложение.
+        window_seconds (float): Окно read-your-writes, время жизни cookie.
+        recent_writes (RecentWrites): Последние записи пользователей.
+        user_id_getter (Callable): Получение id пользователя из access-токена, None - токен неверный.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        window_seconds: float,
+        recent_writes: RecentWrites,
+        user_id_getter: Callable[[str], int | None],
+    ):
+        self.app = app
+        self.window_seconds = window_seconds
+        self.recent_writes = recent_writes
+        self.user_id_getter = user_id_getter
+
+    def get_user_id(self, scope: Scope) -> int | None:
+        """
+        Получение id пользователя по заголовку Authorization: Bearer.
+
+        Args:
+            scope (Scope): ASGI scope запроса.
+
+        Returns:
+            int: id пользователя.
+            None: Если токена нет или он неверный.
+        """
+        scheme, _, token = Request(scope).headers.get("authorization", "").partition(" ")
+        if scheme.lower() != "bearer" or not token:
+            return None
+
+        return self.user_id_getter(token)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        user_id = self.get_user_id(scope)
+        scope.setdefault("state", {})["user_id"] = user_id
+        if scope["method"] in SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cookie(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                if user_id is not None:
+                    await self.recent_writes.record(user_id)
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "set-cookie",
+                    f"{LAST_WRITE_COOKIE}={time.time():.3f}; Max-Age={int(self.window_seconds) + 1}; "
+                    f"Path=/; HttpOnly; SameSite=strict",
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
@@ -0,0 +1,26 @@
+from typing import Annotated
+
+from fastapi import Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.core.config import settings
+from src.core.database.db import db
+from src.core.schemas.export_schema import ExportParams
+from src.core.services.exporter import Exporter
+
+
+async def get_exporter(
+    params: Annotated[ExportParams, Query()],
+    session_factory: async_sessionmaker[AsyncSession] = Depends(db.bulk_session_factory_getter),
+) -> Exporter:
+    """
+    Создание экземпляра Exporter с форматом выгрузки из запроса.
+
+    Args:
+        params (ExportParams): Параметры выгрузки, полученные из запроса FastAPI.
+        session_factory (async_sessionmaker): Фабрика сессий пула bulk, сессия открывается на время передачи ответа.
+
+    Returns:
+        Exporter: Экземпляр Exporter, готовый для выгрузки.
+    """
+    return Exporter(session_factory=session_factory, export_format=params.format, yield_per=settings.export.yield_per)
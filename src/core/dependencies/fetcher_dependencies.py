@@ -1,26 +1,42 @@
-from fastapi import Depends
+from typing import Annotated
+
+from fastapi import Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core.database.db import db
 from src.core.repository.fetcher_repository import FetcherRepository
 from src.core.schemas.pagination_schema import PaginationParams
+from src.core.services.count_cache import CountCache, get_count_cache
 from src.core.services.paginated_fetcher import PaginatedFetcher
 
 
 async def get_paginated_fetcher(
-    params: PaginationParams = Depends(), session: AsyncSession = Depends(db.session_getter)
+    params: Annotated[PaginationParams, Query()],
+    session: AsyncSession = Depends(db.read_session_getter),
+    count_cache: CountCache = Depends(get_count_cache),
 ):
     """
     Создание экземпляра PaginatedFetcher с параметрами пагинации и фильтрации.
 
     Args:
         params (PaginationParams): Параметры пагинации и фильтрации, полученные из запроса FastAPI.
-        session (AsyncSession): Сессия SQLAlchemy для работы с базой данных.
+        session (AsyncSession): Сессия SQLAlchemy для чтения (реплика или primary).
+        count_cache (CountCache): Кэш totalCount.
 
     Returns:
         PaginatedFetcher: Экземпляр PaginatedFetcher, готовый для выполнения запросов.
     """
     fetcher_repository = FetcherRepository(session=session)
     return PaginatedFetcher(
-        repository=fetcher_repository, offset=params.offset, limit=params.limit, field=params.field, value=params.value
+        repository=fetcher_repository,
+        offset=params.offset,
+        limit=params.limit,
+        field=params.field,
+        value=params.value,
+        filters=params.get_filters(),
+        fields=params.get_fields(),
+        after=params.after,
+        include_total=params.include_total,
+        approximate_total=params.approximate_total,
+        count_cache=count_cache,
     )
@@ -26,3 +26,8 @@ PASSWORDS_MISMATCH = HTTPException(
     status_code=status.HTTP_400_BAD_REQUEST,
     detail="The two password fields didn't match.",
 )
+
+AUTHENTICATION_UNAVAILABLE = HTTPException(
+    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+    detail="Authentication is temporarily unavailable",
+)
@@ -0,0 +1,16 @@
+from fastapi import HTTPException, status
+
+FIELD_NOT_FILTERABLE = HTTPException(
+    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+    detail="Filtering is allowed only by indexed fields",
+)
+
+INVALID_FILTER_VALUE = HTTPException(
+    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+    detail="Filter value does not match the field type",
+)
+
+UNKNOWN_FIELDS = HTTPException(
+    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+    detail="Fields parameter contains unknown fields",
+)
@@ -7,8 +7,12 @@ logger = logging.getLogger(__name__)
 
 logger.setLevel(logging.INFO)
 
+# delay=True: файл открывается при первой записи, а не при импорте.
 handler = RotatingFileHandler(
-    filename=settings.logging.filename, maxBytes=settings.logging.max_bytes, backupCount=settings.logging.backup_count
+    filename=settings.logging.filename,
+    maxBytes=settings.logging.max_bytes,
+    backupCount=settings.logging.backup_count,
+    delay=True,
 )
 formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
 
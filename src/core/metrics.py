@@ -0,0 +1,180 @@
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+@dataclass
+class Summary:
+    """
+    Сводка наблюдаемой величины: количество, сумма и максимум.
+    """
+
+    count: int = 0
+    total: float = 0
+    max: float = 0
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def to_dict(self) -> dict:
+        return {"count": self.count, "total": self.total, "max": self.max, "avg": self.total / self.count}
+
+
+class Metrics:
+    """
+    Метрики процесса приложения (счётчики и сводки), хранятся в памяти процесса.
+    """
+
+    def __init__(self):
+        self.counters: Counter[str] = Counter()
+        self.summaries: dict[str, Summary] = {}
+
+    def increment(self, name: str, value: int = 1) -> None:
+        self.counters[name] += value
+
+    def observe(self, name: str, value: float) -> None:
+        self.summaries.setdefault(name, Summary()).observe(value)
+
+    def snapshot(self) -> dict:
+        return {
+            "counters": dict(self.counters),
+            "summaries": {name: summary.to_dict() for name, summary in self.summaries.items()},
+        }
+
+    def clear(self) -> None:
+        self.counters.clear()
+        self.summaries.clear()
+
+
+@dataclass
+class RequestDbUsage:
+    """
+    Использование соединений с базой данных одним запросом.
+
+    Attributes:
+        checkouts (int): Сколько раз соединение было взято из пула.
+        hold_seconds (float): Суммарное время удержания соединений.
+        identity_map_hits (int): Сколько объектов по id найдено в identity map сессии без запроса.
+        identity_map_misses (int): Сколько объектов по id пришлось загрузить из базы данных.
+    """
+
+    checkouts: int = 0
+    hold_seconds: float = 0
+    connections: set[int] = field(default_factory=set)
+    identity_map_hits: int = 0
+    identity_map_misses: int = 0
+
+
+metrics = Metrics()
+
+request_db_usage: ContextVar[RequestDbUsage | None] = ContextVar("request_db_usage", default=None)
+
+
+def instrument_engine(engine: AsyncEngine, name: str) -> None:
+    """
+    Подписка на события пула движка: время удержания каждого соединения и использование соединений запросом.
+
+    Args:
+        engine (AsyncEngine): Движок базы данных.
+        name (str): Имя движка в метриках.
+    """
+
+    @event.listens_for(engine.sync_engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy) -> None:
+        metrics.increment(f"db.{name}.checkouts")
+        connection_record.info["checked_out_at"] = time.perf_counter()
+        usage = request_db_usage.get()
+        if usage is not None:
+            usage.checkouts += 1
+            usage.connections.add(id(dbapi_connection))
+            connection_record.info["request_db_usage"] = usage
+
+    @event.listens_for(engine.sync_engine, "checkin")
+    def on_checkin(dbapi_connection, connection_record) -> None:
+        checked_out_at = connection_record.info.pop("checked_out_at", None)
+        usage = connection_record.info.pop("request_db_usage", None)
+        if checked_out_at is None:
+            return
+
+        hold_seconds = time.perf_counter() - checked_out_at
+        metrics.observe(f"db.{name}.connection_hold_seconds", hold_seconds)
+        if usage is not None:
+            usage.hold_seconds += hold_seconds
+
+
+def record_identity_lookup(hit: bool) -> None:
+    """
+    Учёт поиска объекта по id в identity map сессии (см. BaseRepository.get_obj_by_id).
+
+    Args:
+        hit (bool): Найден ли объект без запроса к базе данных.
+    """
+    metrics.increment("identity_map.hits" if hit else "identity_map.misses")
+    usage = request_db_usage.get()
+    if usage is not None:
+        if hit:
+            usage.identity_map_hits += 1
+        else:
+            usage.identity_map_misses += 1
+
+
+def get_pool_status(engine: AsyncEngine) -> dict:
+    """
+    Текущее состояние пула соединений движка.
+
+    Args:
+        engine (AsyncEngine): Движок базы данных.
+
+    Returns:
+        dict: Размер пула, занятые, свободные соединения и соединения сверх pool_size.
+    """
+    pool = engine.pool
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": pool.overflow(),
+    }
+
+
+class DbUsageMiddleware:
+    """
+    ASGI middleware, собирающий использование соединений каждым запросом: количество взятий соединения из пула,
+    количество разных соединений, суммарное время их удержания и попадания в identity map сессии.
+
+    Attributes:
+        app (ASGIApp): Приложение.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        usage = RequestDbUsage()
+        token = request_db_usage.set(usage)
+        try:
+            await self.app(scope, receive, send)
+
+        finally:
+            request_db_usage.reset(token)
+            metrics.increment("http.requests")
+            if usage.checkouts:
+                metrics.observe("http.request.db_checkouts", usage.checkouts)
+                metrics.observe("http.request.db_connections", len(usage.connections))
+                metrics.observe("http.request.db_hold_seconds", usage.hold_seconds)
+            else:
+                metrics.increment("http.requests_without_db")
+            if usage.identity_map_hits or usage.identity_map_misses:
+                metrics.observe("http.request.identity_map_hits", usage.identity_map_hits)
+                metrics.observe("http.request.identity_map_misses", usage.identity_map_misses)
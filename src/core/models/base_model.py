@@ -1,11 +1,30 @@
+import enum
+from typing import ClassVar
+
 from sqlalchemy import Integer
 from sqlalchemy.ext.asyncio import AsyncAttrs
 from sqlalchemy.orm import DeclarativeBase, Mapped, declared_attr, mapped_column
 
 
+class CountStrategy(str, enum.Enum):
+    """
+    Стратегия получения страницы и общего количества объектов при пагинации.
+
+    SEPARATE: Два запроса - подсчёт количества и выборка страницы.
+    COMBINED: Один запрос, возвращающий страницу вместе с количеством.
+    """
+
+    SEPARATE = "separate"
+    COMBINED = "combined"
+
+
 class Base(AsyncAttrs, DeclarativeBase):
     __abstract__ = True
 
+    count_strategy: ClassVar[CountStrategy] = CountStrategy.SEPARATE
+    # Поля, по которым разрешена фильтрация в query параметре filter. Для каждого из них должен быть индекс.
+    filter_fields: ClassVar[tuple[str, ...]] = ("id",)
+
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
 
     @declared_attr.directive
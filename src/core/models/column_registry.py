@@ -0,0 +1,178 @@
+import datetime
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from sqlalchemy.orm import InstrumentedAttribute
+
+from src.core.models.base_model import Base
+
+PATTERN_OPS = ("text_pattern_ops", "varchar_pattern_ops")
+
+
+@dataclass(frozen=True)
+class ColumnInfo:
+    """
+    Метаданные колонки модели, вычисленные один раз при старте приложения.
+
+    Attributes:
+        name (str): Имя поля модели.
+        attribute (InstrumentedAttribute): Атрибут модели для построения выражений SQLAlchemy.
+        python_type (type): Тип значения колонки в Python.
+        converter (Callable): Преобразование значения из запроса к типу колонки, при ошибке - ValueError.
+        nullable (bool): Допускает ли колонка NULL.
+        indexed (bool): Является ли колонка первой колонкой какого-либо индекса.
+        pattern_indexed (bool): Есть ли индекс по колонке с классом операторов text_pattern_ops, только такой индекс
+            используется для LIKE 'x%' (оператор prefix) при правилах сортировки, отличных от C.
+        filterable (bool): Разрешена ли фильтрация по полю (поле указано в filter_fields модели).
+    """
+
+    name: str
+    attribute: InstrumentedAttribute
+    python_type: type
+    converter: Callable[[Any], Any]
+    nullable: bool
+    indexed: bool
+    pattern_indexed: bool
+    filterable: bool
+
+
+def make_converter(python_type: type) -> Callable[[Any], Any]:
+    """
+    Создание функции преобразования значения из query параметра к типу колонки.
+
+    Args:
+        python_type (type): Тип значения колонки в Python.
+
+    Returns:
+        Callable: Функция преобразования, возбуждающая ValueError при неверном значении.
+    """
+
+    def convert(value: Any) -> Any:
+        if isinstance(value, python_type):
+            return value
+        if not isinstance(value, str):
+            raise ValueError(f"Expected a string, got {type(value).__name__}")
+        if python_type is bool:
+            if value not in ("true", "false"):
+                raise ValueError("Expected true or false")
+            return value == "true"
+        if issubclass(python_type, datetime.date):
+            return python_type.fromisoformat(value)
+        if python_type is bytes:
+            raise ValueError("Binary columns can't be filtered")
+
+        return python_type(value)
+
+    return convert
+
+
+class ColumnRegistry:
+    """
+    Реестр метаданных колонок всех моделей, построенный по Base.metadata.
+
+    Заменяет hasattr/getattr и определение типа колонки на каждом запросе поиском в словаре.
+    """
+
+    def __init__(self):
+        self._models: dict[type[Base], dict[str, ColumnInfo]] = {}
+
+    def build(self) -> None:
+        """
+        Построение реестра для всех моделей, зарегистрированных в Base.
+
+        Raises:
+            RuntimeError: Если в filter_fields модели указано поле без индекса.
+        """
+        models = {}
+        for mapper in Base.registry.mappers:
+            model = mapper.class_
+            table = mapper.local_table
+            indexed = {column.name for column in table.primary_key.columns}
+            indexed.update(next(iter(index.columns)).name for index in table.indexes if index.columns)
+            indexed.update(
+                next(iter(constraint.columns)).name
+                for constraint in table.constraints
+                if constraint.__visit_name__ == "unique_constraint" and constraint.columns
+            )
+            indexed.update(column.name for column in table.columns if column.unique)
+            pattern_indexed = {
+                column.name
+                for index in table.indexes
+                for column in list(index.columns)[:1]
+                if index.dialect_options["postgresql"]["ops"].get(column.name) in PATTERN_OPS
+            }
+
+            columns = {}
+            for prop in mapper.column_attrs:
+                column = prop.columns[0]
+                python_type = column.type.python_type
+                columns[prop.key] = ColumnInfo(
+                    name=prop.key,
+                    attribute=getattr(model, prop.key),
+                    python_type=python_type,
+                    converter=make_converter(python_type),
+                    nullable=bool(column.nullable),
+                    indexed=column.name in indexed,
+                    pattern_indexed=column.name in pattern_indexed,
+                    filterable=prop.key in model.filter_fields,
+                )
+
+            not_indexed = [field for field in model.filter_fields if not columns[field].indexed]
+            if not_indexed:
+                raise RuntimeError(f"{model.__name__}.filter_fields contains fields without index: {not_indexed}")
+
+            models[model] = columns
+
+        self._models = models
+
+    def get_columns(self, model: type[Base]) -> dict[str, ColumnInfo]:
+        """
+        Получение метаданных всех колонок модели.
+
+        Args:
+            model: Модель объекта.
+
+        Returns:
+            dict: Имя поля -> ColumnInfo.
+        """
+        if model not in self._models:
+            self.build()
+
+        return self._models[model]
+
+    def get_column(self, model: type[Base], field: str | None) -> ColumnInfo | None:
+        """
+        Получение метаданных колонки модели.
+
+        Args:
+            model: Модель объекта.
+            field (str): Имя поля.
+
+        Returns:
+            ColumnInfo: Метаданные колонки.
+            None: Если у модели нет такой колонки.
+        """
+        return self.get_columns(model).get(field)
+
+    def get_attributes(self, model: type[Base], fields: list[str]) -> list[InstrumentedAttribute] | None:
+        """
+        Получение атрибутов модели для выборки только указанных полей. Поле id добавляется всегда.
+
+        Args:
+            model: Модель объекта.
+            fields (list[str]): Имена полей.
+
+        Returns:
+            list[InstrumentedAttribute]: Атрибуты модели.
+            None: Если среди полей есть отсутствующие в модели.
+        """
+        columns = self.get_columns(model)
+        if any(field not in columns for field in fields):
+            return None
+
+        return [columns["id"].attribute] + [
+            columns[field].attribute for field in dict.fromkeys(fields) if field != "id"
+        ]
+
+
+column_registry = ColumnRegistry()
@@ -0,0 +1,12 @@
+"""
+Импорт всех моделей, чтобы их таблицы были зарегистрированы в Base.metadata (миграции, create_all).
+"""
+
+from src.app.models.author_model import Author
+from src.app.models.book_copy_model import BookCopy
+from src.app.models.book_model import Book
+from src.app.models.borrow_model import Borrow
+from src.core.models.base_model import Base
+from src.core.models.user_model import User
+
+__all__ = ["Author", "Base", "Book", "BookCopy", "Borrow", "User"]
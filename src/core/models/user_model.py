@@ -1,6 +1,6 @@
 import enum
 
-from sqlalchemy import String, text
+from sqlalchemy import CheckConstraint, Index, String, text
 from sqlalchemy.dialects.postgresql import BYTEA
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -20,8 +20,17 @@ class User(Base):
         username (str): Логин пользователя.
         hashed_password (bytes): Хэш пароля пользователя.
         role (PermissionsEnum): Роль пользователя.
+        active_borrows (int): Количество активных выдач пользователя, изменяется в той же транзакции,
+            что и выдача или возврат (см. BorrowRepository).
     """
 
+    filter_fields = ("id", "username")
+
     username: Mapped[str] = mapped_column(String(50), unique=True)
     hashed_password: Mapped[bytes] = mapped_column(BYTEA, nullable=False)
     role: Mapped[PermissionsEnum] = mapped_column(default=PermissionsEnum.READER, server_default=text("'READER'"))
+    active_borrows: Mapped[int] = mapped_column(
+        CheckConstraint("active_borrows >= 0"), default=0, server_default=text("0")
+    )
+
+    __table_args__ = (Index("ix_users_username_pattern", "username", postgresql_ops={"username": "text_pattern_ops"}),)
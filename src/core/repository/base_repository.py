@@ -1,12 +1,17 @@
-from typing import List, Type, TypeVar
+import datetime
+from typing import List, Sequence, Type, TypeVar
 
 from pydantic import BaseModel
-from sqlalchemy import select, delete, update
+from sqlalchemy import ARRAY, Column, Integer, UniqueConstraint, any_, bindparam, inspect, select, delete, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.util import identity_key
 
+from src.core.errors.pagination_errors import UNKNOWN_FIELDS
+from src.core.metrics import record_identity_lookup
 from src.core.models.base_model import Base
-
+from src.core.models.column_registry import column_registry
 
 DB = TypeVar("DB", bound=Base)
 P = TypeVar("P", bound=BaseModel)
@@ -25,21 +30,61 @@ class BaseRepository:
         self.session = session
         self.model = model
 
-    async def get_obj_by_id(self, obj_id: int) -> DB | None:
+    async def get_obj_by_id(self, obj_id: int, fields: list[str] | None = None) -> DB | dict | None:
         """
         Получение объекта из базы данных по id.
 
+        Сессия живёт один запрос и общая для его зависимостей и сервисов, поэтому объект, уже загруженный в этом
+        запросе (identity map сессии), возвращается без запроса к базе данных. Попадания и промахи учитываются
+        в метриках запроса (см. record_identity_lookup).
+
         Args:
             obj_id (int): id объекта.
+            fields (list[str], optional): Поля для выборки, по умолчанию - объект целиком.
 
         Returns:
             DB: Объект из базы данных.
+            dict: Словарь с выбранными полями, если переданы fields.
             None: Если объект не найден.
+
+        Raises:
+            422 (unprocessable entity): Если у модели нет какого-либо из полей.
         """
-        stmt = select(self.model).where(self.model.id == obj_id)
-        result = await self.session.scalars(stmt)
+        obj = self.get_loaded_obj(obj_id)
+        record_identity_lookup(hit=obj is not None)
+        if fields is not None:
+            columns = column_registry.get_attributes(self.model, fields)
+            if columns is None:
+                raise UNKNOWN_FIELDS
+            if obj is not None:
+                return {column.key: getattr(obj, column.key) for column in columns}
+
+            stmt = select(*columns).where(self.model.id == obj_id)
+            result = await self.session.execute(stmt)
+            row = result.mappings().one_or_none()
+            return dict(row) if row else None
+
+        if obj is not None:
+            return obj
+
+        return await self.session.get(self.model, obj_id)
+
+    def get_loaded_obj(self, obj_id: int) -> DB | None:
+        """
+        Получение объекта из identity map сессии без запроса к базе данных.
+
+        Args:
+            obj_id (int): id объекта.
+
+        Returns:
+            DB: Объект, если он загружен в сессию со всеми колонками и они не устарели (например, после rollback).
+            None: Если объекта нет в сессии или его нужно перечитать.
+        """
+        obj = self.session.identity_map.get(identity_key(self.model, obj_id))
+        if obj is None or not inspect(obj).unloaded.isdisjoint(column_registry.get_columns(self.model)):
+            return None
 
-        return result.one_or_none()
+        return obj
 
     async def get_all_obj(self) -> List[DB]:
         """
@@ -55,27 +100,34 @@ class BaseRepository:
 
     async def create(self, obj_in: P) -> DB | bool:
         """
-        Создание новой записи в базе данных.
+        Создание новой записи в базе данных запросом INSERT ... ON CONFLICT DO NOTHING RETURNING.
+
+        Нарушение уникальности не приводит к ошибке: запрос просто не возвращает строку.
 
         Args:
             obj_in (P): Данные для создания новой записи.
 
         Returns:
             DB: Созданный объект.
-            False: Если объект не создан (уже существует в базе данных).
+            False: Если объект не создан (уже существует в базе данных или нарушает другое ограничение).
         """
-        obj = self.model(**obj_in.model_dump())
-        self.session.add(obj)
+        stmt = insert(self.model).values(**obj_in.model_dump()).on_conflict_do_nothing().returning(self.model)
         try:
-            await self.session.commit()
-            return obj
+            obj = await self.session.scalar(stmt)
 
         except IntegrityError:
+            obj = None
+
+        if obj is None:
+            await self.session.rollback()
             return False
 
+        await self.session.commit()
+        return obj
+
     async def update(self, obj_id: int, obj_in: P) -> DB | bool:
         """
-        Обновление объекта в базе данных.
+        Обновление объекта в базе данных запросом UPDATE ... RETURNING.
 
         Args:
             obj_id (int): id изменяемого объекта.
@@ -85,32 +137,258 @@ class BaseRepository:
             DB: Обновленный объект.
             False: Если объект не был обновлён (не найден в базе данных).
         """
-        stmt = update(self.model).filter_by(id=obj_id).values(**obj_in.model_dump())
-        result = await self.session.execute(stmt)
-        if result.rowcount != 0:
-            await self.session.commit()
-            return await self.get_obj_by_id(obj_id=obj_id)
+        stmt = (
+            self.get_update_stmt(obj_in.model_dump())
+            .filter_by(id=obj_id)
+            .returning(self.model)
+            .execution_options(populate_existing=True)
+        )
+        obj = await self.session.scalar(stmt)
+        if obj is None:
+            await self.session.rollback()
+            return False
 
-        await self.session.rollback()
-        return False
+        await self.session.commit()
+        return obj
 
     async def delete(self, obj_id: int) -> bool | DB:
         """
-        Удаление объекта из базы данных.
+        Удаление объекта из базы данных запросом DELETE ... RETURNING.
 
         Args:
             obj_id (int): id объекта для удаления.
 
         Returns:
-            DB: Модель удалённого объекта.
+            DB: Удалённый объект.
             False: Если объект не был удалён (не найден в базе данных).
         """
-        stmt = delete(self.model).where(self.model.id == obj_id)
-        result = await self.session.execute(stmt)
-        deleted_count = result.rowcount
-        if deleted_count == 1:
+        stmt = delete(self.model).where(self.model.id == obj_id).returning(self.model)
+        obj = await self.session.scalar(stmt)
+        if obj is None:
+            await self.session.rollback()
+            return False
+
+        await self.session.commit()
+        return obj
+
+    async def get_existing_ids(self, ids: Sequence[int]) -> set[int]:
+        """
+        Получение id объектов, которые есть в базе данных.
+
+        Args:
+            ids (Sequence[int]): Проверяемые id.
+
+        Returns:
+            set[int]: id найденных объектов.
+        """
+        stmt = select(self.model.id).where(self.model.id == any_(bindparam("ids", list(ids), type_=ARRAY(Integer))))
+        result = await self.session.scalars(stmt)
+
+        return set(result.all())
+
+    async def bulk_create(self, objs_in: Sequence[P]) -> list[DB | None]:
+        """
+        Создание записей одним запросом INSERT ... VALUES ... ON CONFLICT DO NOTHING RETURNING.
+
+        Строки, нарушившие уникальность, пропускаются, остальные создаются. Созданные строки сопоставляются
+        с входными данными по колонкам уникального ограничения модели. Если запрос нарушает другое ограничение
+        (внешний ключ, CHECK) или у модели нет уникального ограничения, а часть строк пропущена (сопоставить их
+        не по чему), записи создаются по одной, каждая в своей точке сохранения.
+
+        Args:
+            objs_in (Sequence[P]): Данные для создания записей.
+
+        Returns:
+            list: Созданный объект или None (конфликт) для каждого элемента objs_in.
+        """
+        values = [obj_in.model_dump() for obj_in in objs_in]
+        stmt = insert(self.model).values(values).on_conflict_do_nothing().returning(self.model)
+        try:
+            result = await self.session.scalars(stmt)
+            created = list(result.all())
+
+        except IntegrityError:
+            await self.session.rollback()
+            return await self.create_one_by_one(values=values)
+
+        key_columns = self.get_unique_key_columns()
+        if not key_columns and len(created) != len(values):
+            await self.session.rollback()
+            return await self.create_one_by_one(values=values)
+
+        await self.session.commit()
+        if not key_columns:
+            return created
+
+        created_by_key = {self.make_key(key_columns, obj.__dict__): obj for obj in created}
+        results = []
+        for value in values:
+            results.append(created_by_key.pop(self.make_key(key_columns, value), None))
+
+        return results
+
+    async def create_one_by_one(self, values: list[dict]) -> list[DB | None]:
+        """
+        Создание записей по одной в точках сохранения одной транзакции.
+
+        Args:
+            values (list[dict]): Данные для создания записей.
+
+        Returns:
+            list: Созданный объект или None (ошибка целостности) для каждого элемента values.
+        """
+        results = []
+        for value in values:
+            obj = self.model(**value)
+            try:
+                async with self.session.begin_nested():
+                    self.session.add(obj)
+                results.append(obj)
+
+            except IntegrityError:
+                results.append(None)
+
+        await self.session.commit()
+        return results
+
+    async def bulk_update(self, objs_in: Sequence[P]) -> list[DB | bool | None]:
+        """
+        Обновление записей по первичному ключу одним executemany.
+
+        Args:
+            objs_in (Sequence[P]): Данные для обновления записей, каждый элемент содержит id.
+
+        Returns:
+            list: Для каждого элемента objs_in - обновлённый объект, None (не найден)
+                или False (обновление нарушает ограничение целостности).
+        """
+        existing_ids = await self.get_existing_ids([obj_in.id for obj_in in objs_in])
+        values = [obj_in.model_dump() for obj_in in objs_in]
+        found_values = [value for value in values if value["id"] in existing_ids]
+        failed_ids = set()
+        if found_values:
+            try:
+                await self.session.execute(self.get_update_stmt(), found_values)
+                await self.session.commit()
+
+            except IntegrityError:
+                await self.session.rollback()
+                failed_ids = await self.update_one_by_one(values=found_values)
+
+        updated_ids = existing_ids - failed_ids
+        stmt = select(self.model).where(self.model.id.in_(updated_ids)).execution_options(populate_existing=True)
+        updated = {obj.id: obj for obj in (await self.session.scalars(stmt)).all()}
+
+        return [
+            updated[value["id"]] if value["id"] in updated else (False if value["id"] in failed_ids else None)
+            for value in values
+        ]
+
+    async def update_one_by_one(self, values: list[dict]) -> set[int]:
+        """
+        Обновление записей по одной в точках сохранения одной транзакции.
+
+        Args:
+            values (list[dict]): Данные для обновления записей.
+
+        Returns:
+            set[int]: id записей, которые не удалось обновить.
+        """
+        failed_ids = set()
+        for value in values:
+            try:
+                async with self.session.begin_nested():
+                    await self.session.execute(self.get_update_stmt(), [value])
+
+            except IntegrityError:
+                failed_ids.add(value["id"])
+
+        await self.session.commit()
+        return failed_ids
+
+    async def bulk_delete(self, ids: Sequence[int]) -> tuple[set[int], set[int]]:
+        """
+        Удаление записей одним запросом DELETE ... WHERE id = ANY(:ids) RETURNING id.
+
+        Если запрос нарушает ограничение целостности (на запись ссылаются другие записи),
+        записи удаляются по одной, каждая в своей точке сохранения.
+
+        Args:
+            ids (Sequence[int]): id удаляемых записей.
+
+        Returns:
+            tuple: id удалённых записей и id записей, которые не удалось удалить из-за ограничений целостности.
+        """
+        try:
+            result = await self.session.scalars(self.get_delete_stmt(ids))
+            deleted_ids = set(result.all())
             await self.session.commit()
-            return self.model
+            return deleted_ids, set()
+
+        except IntegrityError:
+            await self.session.rollback()
+
+        deleted_ids, failed_ids = set(), set()
+        for obj_id in await self.get_existing_ids(ids):
+            try:
+                async with self.session.begin_nested():
+                    await self.session.execute(self.get_delete_stmt([obj_id]))
+                deleted_ids.add(obj_id)
+
+            except IntegrityError:
+                failed_ids.add(obj_id)
+
+        await self.session.commit()
+        return deleted_ids, failed_ids
+
+    def get_update_stmt(self, values: dict | None = None):
+        """
+        Запрос UPDATE для update (со значениями объекта) и bulk_update (values=None, значения передаются
+        параметрами executemany). Переопределяется для колонок, которые нельзя изменять напрямую.
+
+        Args:
+            values (dict, optional): Значения объекта.
+        """
+        stmt = update(self.model)
+        return stmt if values is None else stmt.values(**values)
+
+    def get_delete_stmt(self, ids: Sequence[int]):
+        return (
+            delete(self.model)
+            .where(self.model.id == any_(bindparam("ids", list(ids), type_=ARRAY(Integer))))
+            .returning(self.model.id)
+        )
+
+    def get_unique_key_columns(self) -> list[Column]:
+        """
+        Получение колонок первого уникального ограничения модели.
+
+        Returns:
+            list[Column]: Колонки ограничения, пустой список - если ограничения нет.
+        """
+        for constraint in self.model.__table__.constraints:
+            if isinstance(constraint, UniqueConstraint):
+                return list(constraint.columns)
+
+        return []
+
+    @staticmethod
+    def make_key(columns: list[Column], values: dict) -> tuple:
+        """
+        Создание ключа уникального ограничения из значений объекта.
+
+        Args:
+            columns (list[Column]): Колонки ограничения.
+            values (dict): Значения объекта.
+
+        Returns:
+            tuple: Значения колонок, datetime для колонок Date приводится к date.
+        """
+        key = []
+        for column in columns:
+            value = values[column.key]
+            if isinstance(value, datetime.datetime) and column.type.python_type is datetime.date:
+                value = value.date()
+            key.append(value)
 
-        await self.session.rollback()
-        return False
+        return tuple(key)
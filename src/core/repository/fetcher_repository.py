@@ -1,8 +1,12 @@
-from typing import Any, TypeVar
+from typing import Any, Sequence, TypeVar
 
-from sqlalchemy import select, func
+from sqlalchemy import ColumnElement, Select, select, func, text, true
+from sqlalchemy.orm import InstrumentedAttribute, aliased
 
+from src.core.errors.pagination_errors import FIELD_NOT_FILTERABLE, INVALID_FILTER_VALUE, UNKNOWN_FIELDS
 from src.core.models.base_model import Base
+from src.core.models.column_registry import column_registry
+from src.core.schemas.filter_schema import FilterClause, FilterOperator
 
 DB = TypeVar("DB", bound=Base)
 
@@ -18,45 +22,287 @@ class FetcherRepository:
     def __init__(self, session):
         self.session = session
 
-    async def get_total_count(self, model: DB, filter_dict: dict) -> int:
+    async def get_total_count(self, model: DB, filter_dict: dict, conditions: Sequence[ColumnElement] = ()) -> int:
         """
         Получение количества объектов в базе данных с учётом фильтра.
 
         Args:
             model: Модель объекта.
             filter_dict: Словарь фильтрации.
+            conditions: Условия фильтрации (см. get_filter_conditions).
 
         Returns:
             int: Количество объектов в базе данных с учётом фильтра.
         """
-        if filter_dict:
-            stmt = select(func.count(model.id)).filter_by(**filter_dict)
-        else:
-            stmt = select(func.count(model.id))
-
+        stmt = self.get_count_stmt(model=model, filter_dict=filter_dict, conditions=conditions)
         return await self.session.scalar(stmt)
 
-    async def get_obj_list(self, model: DB, offset: int, limit: int, filter_dict: dict) -> list[DB]:
+    async def get_approximate_count(self, model: DB) -> int | None:
+        """
+        Получение приблизительного количества объектов по статистике планировщика (pg_class.reltuples).
+
+        Args:
+            model: Модель объекта.
+
+        Returns:
+            int: Приблизительное количество объектов.
+            None: Если статистика по таблице ещё не собрана.
+        """
+        stmt = text("SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)")
+        approximate_count = await self.session.scalar(stmt, {"table": model.__tablename__})
+        if approximate_count is None or approximate_count <= 0:
+            return None
+
+        return approximate_count
+
+    async def get_obj_list(
+        self,
+        model: DB,
+        offset: int,
+        limit: int,
+        filter_dict: dict,
+        after_id: int | None = None,
+        conditions: Sequence[ColumnElement] = (),
+        columns: Sequence[InstrumentedAttribute] | None = None,
+    ) -> list[DB] | list[dict]:
         """
         Получение списка объектов с пагинацией и фильтрацией.
 
+        Если передан after_id, используется курсорная пагинация (WHERE id > after_id), offset игнорируется.
+
         Args:
             model: Модель объекта.
             filter_dict: Словарь фильтрации.
             offset: Начальный индекс пагинации.
             limit: Количество объектов для пагинации.
+            after_id: id последнего объекта предыдущей страницы.
+            conditions: Условия фильтрации (см. get_filter_conditions).
+            columns: Колонки для выборки (см. get_field_columns), по умолчанию - объекты целиком.
 
         Returns:
-            List: Список объектов базы данных.
+            List: Список объектов базы данных или словарей с выбранными колонками.
         """
-        if filter_dict:
-            stmt = select(model).filter_by(**filter_dict).order_by(model.id).offset(offset).limit(limit)
-        else:
-            stmt = select(model).order_by(model.id).offset(offset).limit(limit)
+        stmt = self.get_page_stmt(
+            model=model,
+            offset=offset,
+            limit=limit,
+            filter_dict=filter_dict,
+            after_id=after_id,
+            conditions=conditions,
+            columns=columns,
+        )
         result = await self.session.execute(stmt)
+        if columns:
+            return [dict(row) for row in result.mappings()]
 
         return list(result.scalars().all())
 
+    async def get_page_with_total(
+        self,
+        model: DB,
+        offset: int,
+        limit: int,
+        filter_dict: dict,
+        after_id: int | None = None,
+        conditions: Sequence[ColumnElement] = (),
+        columns: Sequence[InstrumentedAttribute] | None = None,
+    ) -> tuple[list[DB] | list[dict], int]:
+        """
+        Получение страницы объектов и общего количества объектов с учётом фильтра одним запросом.
+
+        Подзапрос с количеством (всегда одна строка) соединяется со страницей через LEFT JOIN ... ON true,
+        поэтому количество возвращается даже для пустой страницы.
+
+        Args:
+            model: Модель объекта.
+            offset: Начальный индекс пагинации.
+            limit: Количество объектов для пагинации.
+            filter_dict: Словарь фильтрации.
+            after_id: id последнего объекта предыдущей страницы.
+            conditions: Условия фильтрации (см. get_filter_conditions).
+            columns: Колонки для выборки (см. get_field_columns), по умолчанию - объекты целиком.
+
+        Returns:
+            tuple: Список объектов базы данных (или словарей) и количество объектов с учётом фильтра.
+        """
+        total_subq = self.get_count_stmt(model=model, filter_dict=filter_dict, conditions=conditions).subquery("total")
+        page_subq = self.get_page_stmt(
+            model=model,
+            offset=offset,
+            limit=limit,
+            filter_dict=filter_dict,
+            after_id=after_id,
+            conditions=conditions,
+            columns=columns,
+        ).subquery("page")
+        if columns:
+            stmt = (
+                select(total_subq.c.total, *page_subq.c)
+                .select_from(total_subq)
+                .outerjoin(page_subq, true())
+                .order_by(page_subq.c.id)
+            )
+            rows = (await self.session.execute(stmt)).mappings().all()
+            data = [{key: row[key] for key in page_subq.c.keys()} for row in rows if row["id"] is not None]
+            return data, rows[0]["total"]
+
+        page_model = aliased(model, page_subq)
+        stmt = (
+            select(total_subq.c.total, page_model)
+            .select_from(total_subq)
+            .outerjoin(page_model, true())
+            .order_by(page_model.id)
+        )
+        result = await self.session.execute(stmt)
+        rows = result.all()
+
+        return [obj for _, obj in rows if obj is not None], rows[0].total
+
+    def get_count_stmt(self, model: DB, filter_dict: dict, conditions: Sequence[ColumnElement] = ()) -> Select:
+        """
+        Создание запроса количества объектов с учётом фильтра.
+
+        Args:
+            model: Модель объекта.
+            filter_dict: Словарь фильтрации.
+            conditions: Условия фильтрации (см. get_filter_conditions).
+
+        Returns:
+            Select: Запрос с колонкой total.
+        """
+        stmt = select(func.count(model.id).label("total"))
+
+        return self.apply_filters(stmt=stmt, filter_dict=filter_dict, conditions=conditions)
+
+    def get_page_stmt(
+        self,
+        model: DB,
+        offset: int,
+        limit: int,
+        filter_dict: dict,
+        after_id: int | None = None,
+        conditions: Sequence[ColumnElement] = (),
+        columns: Sequence[InstrumentedAttribute] | None = None,
+    ) -> Select:
+        """
+        Создание запроса страницы объектов.
+
+        Args:
+            model: Модель объекта.
+            offset: Начальный индекс пагинации.
+            limit: Количество объектов для пагинации.
+            filter_dict: Словарь фильтрации.
+            after_id: id последнего объекта предыдущей страницы.
+            conditions: Условия фильтрации (см. get_filter_conditions).
+            columns: Колонки для выборки, по умолчанию - объекты целиком.
+
+        Returns:
+            Select: Запрос страницы, отсортированной по id.
+        """
+        stmt = select(*columns) if columns else select(model)
+        stmt = self.apply_filters(stmt=stmt, filter_dict=filter_dict, conditions=conditions)
+        if after_id is not None:
+            stmt = stmt.where(model.id > after_id)
+        else:
+            stmt = stmt.offset(offset)
+
+        return stmt.order_by(model.id).limit(limit)
+
+    def apply_filters(self, stmt: Select, filter_dict: dict, conditions: Sequence[ColumnElement]) -> Select:
+        """
+        Добавление в запрос фильтров на равенство и условий фильтрации.
+
+        Args:
+            stmt (Select): Запрос.
+            filter_dict: Словарь фильтрации.
+            conditions: Условия фильтрации, объединяются через AND.
+
+        Returns:
+            Select: Запрос с фильтрами.
+        """
+        if filter_dict:
+            stmt = stmt.filter_by(**filter_dict)
+        if conditions:
+            stmt = stmt.where(*conditions)
+
+        return stmt
+
+    def get_field_columns(self, model: DB, fields: list[str] | None) -> list[InstrumentedAttribute] | None:
+        """
+        Получение колонок для выборки только указанных полей (параметр fields).
+
+        Args:
+            model: Модель объекта.
+            fields: Имена полей. None - выбирать объекты целиком.
+
+        Returns:
+            list: Атрибуты модели, id добавляется всегда.
+            None: Если поля не указаны.
+
+        Raises:
+            422 (unprocessable entity): Если у модели нет какого-либо из полей.
+        """
+        if fields is None:
+            return None
+
+        columns = column_registry.get_attributes(model, fields)
+        if columns is None:
+            raise UNKNOWN_FIELDS
+
+        return columns
+
+    def get_filter_conditions(self, model: DB, filters: Sequence[FilterClause]) -> list[ColumnElement]:
+        """
+        Компиляция условий фильтрации в выражения SQLAlchemy.
+
+        Фильтровать можно только по полям из model.filter_fields, для которых есть индекс, оператор prefix - только
+        по полям с индексом text_pattern_ops.
+
+        Args:
+            model: Модель объекта.
+            filters: Условия фильтрации из query параметра filter.
+
+        Returns:
+            list: Выражения SQLAlchemy для WHERE.
+
+        Raises:
+            422 (unprocessable entity): Если поле не разрешено для фильтрации или значение не приводится к типу поля.
+        """
+        conditions = []
+        for clause in filters:
+            info = column_registry.get_column(model, clause.field)
+            if info is None or not info.filterable:
+                raise FIELD_NOT_FILTERABLE
+
+            column = info.attribute
+            match clause.operator:
+                case FilterOperator.EQ:
+                    conditions.append(column == self.convert_value_to_field_type(model, clause.field, clause.value))
+                case FilterOperator.NE:
+                    conditions.append(column != self.convert_value_to_field_type(model, clause.field, clause.value))
+                case FilterOperator.LT:
+                    conditions.append(column < self.convert_value_to_field_type(model, clause.field, clause.value))
+                case FilterOperator.GT:
+                    conditions.append(column > self.convert_value_to_field_type(model, clause.field, clause.value))
+                case FilterOperator.BETWEEN:
+                    lower, upper = (
+                        self.convert_value_to_field_type(model, clause.field, value) for value in clause.value
+                    )
+                    conditions.append(column.between(lower, upper))
+                case FilterOperator.IN:
+                    values = [self.convert_value_to_field_type(model, clause.field, value) for value in clause.value]
+                    conditions.append(column.in_(values))
+                case FilterOperator.PREFIX:
+                    if info.python_type is not str:
+                        raise INVALID_FILTER_VALUE
+                    if not info.pattern_indexed:
+                        raise FIELD_NOT_FILTERABLE
+                    conditions.append(column.startswith(clause.value, autoescape=True))
+                case FilterOperator.IS_NULL:
+                    conditions.append(column.is_(None) if clause.value == "true" else column.is_not(None))
+
+        return conditions
+
     def get_filter_dict(self, model: DB, field: str, value: Any) -> dict:
         """
         Создание словаря фильтрации.
@@ -67,9 +313,12 @@ class FetcherRepository:
             value: Значение для фильтрации.
 
         Returns:
-            dict: Словарь c фильтром и значением.
+            dict: Словарь c фильтром и значением. Пустой, если у модели нет такого поля.
+
+        Raises:
+            422 (unprocessable entity): Если значение не приводится к типу поля.
         """
-        if field and hasattr(model, field):
+        if field and column_registry.get_column(model, field):
             convert_value = self.convert_value_to_field_type(model, field, value)
             return {field: convert_value}
 
@@ -85,13 +334,16 @@ class FetcherRepository:
             value: Значение для фильтрации.
 
         Returns:
-            Any: Преобразованное значение, если преобразование успешно, иначе None.
+            Any: Преобразованное значение. None остаётся None (фильтр IS NULL).
+
+        Raises:
+            422 (unprocessable entity): Если значение не приводится к типу поля.
         """
-        column = getattr(model, field)
-        column_type = column.type
+        if value is None:
+            return None
+
         try:
-            converted_value = column_type.python_type(value)
-            return converted_value
+            return column_registry.get_column(model, field).converter(value)
 
         except (ValueError, TypeError):
-            return None
+            raise INVALID_FILTER_VALUE
@@ -0,0 +1,40 @@
+import enum
+
+from pydantic import BaseModel, Field
+
+MAX_BATCH_SIZE = 1000
+
+
+class BatchItemStatus(str, enum.Enum):
+    CREATED = "created"
+    UPDATED = "updated"
+    DELETED = "deleted"
+    CONFLICT = "conflict"
+    NOT_FOUND = "not_found"
+
+
+class BatchItemResult(BaseModel):
+    """
+    Результат обработки одного элемента пакета.
+
+    Attributes:
+        index (int): Позиция элемента в запросе.
+        status (BatchItemStatus): Результат обработки.
+        id (int | None): id созданного, изменённого или удалённого объекта.
+        detail (str | None): Причина ошибки.
+    """
+
+    index: int
+    status: BatchItemStatus
+    id: int | None = None
+    detail: str | None = None
+
+
+class BatchResult(BaseModel):
+    succeeded: int
+    failed: int
+    items: list[BatchItemResult]
+
+
+class BatchDelete(BaseModel):
+    ids: list[int] = Field(min_length=1, max_length=MAX_BATCH_SIZE)
@@ -0,0 +1,12 @@
+import enum
+
+from pydantic import BaseModel
+
+
+class ExportFormat(str, enum.Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+class ExportParams(BaseModel):
+    format: ExportFormat = ExportFormat.NDJSON
@@ -0,0 +1,73 @@
+import enum
+from typing import NamedTuple
+
+MAX_FILTER_VALUES = 100
+
+
+class FilterOperator(str, enum.Enum):
+    EQ = "eq"
+    NE = "ne"
+    LT = "lt"
+    GT = "gt"
+    BETWEEN = "between"
+    IN = "in"
+    PREFIX = "prefix"
+    IS_NULL = "is_null"
+
+
+class FilterClause(NamedTuple):
+    """
+    Условие фильтрации вида field:operator:value.
+
+    Attributes:
+        field (str): Имя поля.
+        operator (FilterOperator): Оператор сравнения.
+        value (str | tuple[str, ...]): Значение без преобразования типа (для between и in - кортеж значений).
+    """
+
+    field: str
+    operator: FilterOperator
+    value: str | tuple[str, ...]
+
+
+def parse_filter_clause(raw: str) -> FilterClause:
+    """
+    Разбор условия фильтрации.
+
+    Примеры: available:gt:0, author_id:in:1,2,3, publication_date:between:2000-01-01,2010-12-31,
+    title:prefix:Гарри, id:is_null:false.
+
+    Args:
+        raw (str): Условие фильтрации из query параметра filter.
+
+    Returns:
+        FilterClause: Разобранное условие.
+
+    Raises:
+        ValueError: Если условие не соответствует грамматике.
+    """
+    field, _, rest = raw.partition(":")
+    operator, _, value = rest.partition(":")
+    if not field or not operator:
+        raise ValueError(f"Filter must look like field:operator:value, got {raw!r}")
+
+    try:
+        operator = FilterOperator(operator)
+    except ValueError:
+        allowed = ", ".join(op.value for op in FilterOperator)
+        raise ValueError(f"Unknown filter operator {operator!r}, allowed: {allowed}") from None
+
+    if operator in (FilterOperator.BETWEEN, FilterOperator.IN):
+        values = tuple(value.split(","))
+        if operator == FilterOperator.BETWEEN and len(values) != 2:
+            raise ValueError(f"Operator between expects two values, got {raw!r}")
+        if not 0 < len(values) <= MAX_FILTER_VALUES:
+            raise ValueError(f"Operator in expects from 1 to {MAX_FILTER_VALUES} values")
+        return FilterClause(field=field, operator=operator, value=values)
+
+    if operator == FilterOperator.IS_NULL:
+        value = value or "true"
+        if value not in ("true", "false"):
+            raise ValueError(f"Operator is_null expects true or false, got {raw!r}")
+
+    return FilterClause(field=field, operator=operator, value=value)
@@ -1,6 +1,9 @@
 from typing import Any
 
-from pydantic import BaseModel, conint, ConfigDict
+from pydantic import BaseModel, conint, ConfigDict, field_validator
+
+from src.core.schemas.filter_schema import FilterClause, parse_filter_clause
+from src.core.utils import decode_cursor
 
 
 class Pagination(BaseModel):
@@ -8,11 +11,53 @@ class Pagination(BaseModel):
 
     offset: int
     limit: int
-    totalCount: int
+    totalCount: int | None
+    nextCursor: str | None = None
+
+
+class FieldsParams(BaseModel):
+    fields: str | None = None
+
+    @field_validator("fields")
+    @classmethod
+    def validate_fields(cls, fields: str | None) -> str | None:
+        if fields is not None and not all(field.strip() for field in fields.split(",")):
+            raise ValueError("Fields must be a comma separated list of field names")
+
+        return fields
+
+    def get_fields(self) -> list[str] | None:
+        if self.fields is None:
+            return None
 
+        return [field.strip() for field in self.fields.split(",")]
 
-class PaginationParams(BaseModel):
-    offset: conint(ge=0)
+
+class PaginationParams(FieldsParams):
+    offset: conint(ge=0) = 0
     limit: conint(ge=0)
     field: str | None = None
     value: Any | None = None
+    after: str | None = None
+    include_total: bool = True
+    approximate_total: bool = False
+    filter: list[str] = []
+
+    @field_validator("after")
+    @classmethod
+    def validate_after(cls, after: str | None) -> str | None:
+        if after is not None:
+            decode_cursor(after)
+
+        return after
+
+    @field_validator("filter")
+    @classmethod
+    def validate_filter(cls, filter: list[str]) -> list[str]:
+        for raw in filter:
+            parse_filter_clause(raw)
+
+        return filter
+
+    def get_filters(self) -> list[FilterClause]:
+        return [parse_filter_clause(raw) for raw in self.filter]
@@ -0,0 +1,20 @@
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict, create_model
+
+
+def make_partial(schema: type[BaseModel]) -> type[BaseModel]:
+    """
+    Создание схемы, в которой все поля исходной схемы необязательны.
+
+    Используется для ответов с выборкой полей (параметр fields) вместе с response_model_exclude_unset=True:
+    в ответ попадают только поля, которые были получены из базы данных.
+
+    Args:
+        schema (type[BaseModel]): Исходная схема.
+
+    Returns:
+        type[BaseModel]: Схема с необязательными полями.
+    """
+    fields = {name: (Optional[field.annotation], None) for name, field in schema.model_fields.items()}
+    return create_model(f"{schema.__name__}Partial", __config__=ConfigDict(from_attributes=True), **fields)
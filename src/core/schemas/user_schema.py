@@ -1,6 +1,7 @@
 from pydantic import BaseModel, ConfigDict
 
 from src.core.schemas.pagination_schema import Pagination
+from src.core.schemas.partial_schema import make_partial
 
 
 class UserBase(BaseModel):
@@ -27,8 +28,11 @@ class UserDBWithoutPassword(UserBase):
     role: str
 
 
+UserDBWithoutPasswordPartial = make_partial(UserDBWithoutPassword)
+
+
 class UserPagination(Pagination):
-    data: list[UserDBWithoutPassword]
+    data: list[UserDBWithoutPasswordPartial]
 
 
 class RegisteredResponse(BaseModel):
@@ -1,12 +1,18 @@
-from typing import List, TypeVar
+from typing import List, Sequence, TypeVar
 from pydantic import BaseModel
 
+from src.core.database.replicas import reads_from_replica
+from src.core.errors.pagination_errors import UNKNOWN_FIELDS
 from src.core.errors.repository_errors import OBJECT_NOT_FOUND, RESOURCE_ALREADY_EXISTS
 from src.core.log_config import logger
 from src.core.models.base_model import Base
+from src.core.models.column_registry import column_registry
 from src.core.models.user_model import User
 from src.core.repository.base_repository import BaseRepository
-
+from src.core.schemas.batch_schema import BatchItemResult, BatchItemStatus, BatchResult
+from src.core.services.count_cache import count_cache
+from src.core.services.entity_cache import entity_cache
+from src.core.services.invalidation_bus import invalidation_bus
 
 DB = TypeVar("DB", bound=Base)
 P = TypeVar("P", bound=BaseModel)
@@ -18,30 +24,90 @@ class BaseService:
 
     Attributes:
         repository (BaseRepository): Репозиторий для операций.
+        cache_entities (bool): Кэшировать ли объекты по id между запросами (см. EntityCache).
     """
 
+    cache_entities: bool = False
+
     def __init__(self, repository: BaseRepository):
         self.repository = repository
 
-    async def get_obj_by_id_or_404(self, obj_id: int) -> DB:
+    async def get_obj_by_id_or_404(self, obj_id: int, fields: list[str] | None = None) -> DB | dict:
         """
         Получение одной записи из базы данных по id.
 
+        Если включено cache_entities, запись читается через EntityCache и возвращается словарём колонок.
+
         Args:
             obj_id (int): id объекта.
+            fields (list[str], optional): Поля для выборки, по умолчанию - объект целиком.
 
         Returns:
             DB: Объект из базы данных.
+            dict: Словарь с выбранными полями, если переданы fields.
 
         Raises:
             404 (not found): Если объект не найден.
+            422 (unprocessable entity): Если у модели нет какого-либо из полей.
         """
-        obj_db = await self.repository.get_obj_by_id(obj_id=obj_id)
+        if self.cache_entities:
+            return await self.get_cached_obj_or_404(obj_id=obj_id, fields=fields)
+
+        obj_db = await self.repository.get_obj_by_id(obj_id=obj_id, fields=fields)
         if not obj_db:
             raise OBJECT_NOT_FOUND
 
         return obj_db
 
+    async def get_cached_obj_or_404(self, obj_id: int, fields: list[str] | None = None) -> dict:
+        """
+        Получение записи по id через EntityCache. Запись, прочитанная с реплики, не сохраняется в L2.
+
+        Args:
+            obj_id (int): id объекта.
+            fields (list[str], optional): Поля для выборки, по умолчанию - все колонки.
+
+        Returns:
+            dict: Колонки объекта (id и указанные поля, если переданы fields).
+
+        Raises:
+            404 (not found): Если объект не найден.
+            422 (unprocessable entity): Если у модели нет какого-либо из полей.
+        """
+        model = self.repository.model
+        columns = column_registry.get_attributes(model, fields) if fields is not None else None
+        if fields is not None and columns is None:
+            raise UNKNOWN_FIELDS
+
+        async def load() -> dict | None:
+            obj_db = await self.repository.get_obj_by_id(obj_id=obj_id)
+            if obj_db is None:
+                return None
+            return {name: getattr(obj_db, name) for name in column_registry.get_columns(model)}
+
+        cached = await entity_cache.get_or_load(
+            model, obj_id, load, from_replica=lambda: reads_from_replica(self.repository.session)
+        )
+        if cached is None:
+            raise OBJECT_NOT_FOUND
+
+        if columns is not None:
+            return {column.key: cached[column.key] for column in columns}
+
+        return dict(cached)
+
+    async def invalidate_cached(self, ids: Sequence[int]) -> None:
+        """
+        Удаление изменённых объектов из EntityCache (если кэширование включено) и публикация события для кэшей
+        других процессов (см. InvalidationBus).
+
+        Args:
+            ids (Sequence[int]): id созданных, изменённых или удалённых объектов.
+        """
+        if self.cache_entities:
+            await entity_cache.invalidate(self.repository.model, ids)
+        await invalidation_bus.publish(self.repository.model, ids)
+
     async def get_all_obj(self) -> List[DB]:
         """
         Получает все объекты базы данных.
@@ -69,6 +135,9 @@ class BaseService:
         if created_obj is False:
             raise RESOURCE_ALREADY_EXISTS
 
+        count_cache.invalidate(self.repository.model)
+        await self.invalidate_cached([created_obj.id])
+
         if user:
             logger.info(f"User with id {user.id} created {created_obj.__class__.__name__} with id {created_obj.id}")
 
@@ -95,6 +164,9 @@ class BaseService:
         if obj_db is False:
             raise OBJECT_NOT_FOUND
 
+        count_cache.invalidate(self.repository.model)
+        await self.invalidate_cached([obj_db.id])
+
         if user:
             logger.info(f"User with id {user.id} updated {obj_db.__class__.__name__} with id {obj_db.id}")
 
@@ -114,9 +186,131 @@ class BaseService:
         Raises:
             404 (not found): Если объект не был найден.
         """
-        model = await self.repository.delete(obj_id=obj_id)
-        if model is False:
+        deleted_obj = await self.repository.delete(obj_id=obj_id)
+        if deleted_obj is False:
             raise OBJECT_NOT_FOUND
 
+        count_cache.invalidate(self.repository.model)
+        await self.invalidate_cached([deleted_obj.id])
+
+        if user:
+            logger.info(f"User with id {user.id} deleted {deleted_obj.__class__.__name__} with id {deleted_obj.id}")
+
+    async def bulk_create(self, objs_in: Sequence[P], user: User = None) -> BatchResult:
+        """
+        Пакетное добавление объектов в базу данных.
+
+        Элементы, отклонённые проверкой get_rejected_items или нарушившие ограничения, не мешают созданию остальных.
+
+        Args:
+            objs_in (Sequence[P]): Объекты для добавления.
+            user (User, optional): Пользователь, добавляющий объекты.
+
+        Returns:
+            BatchResult: Результат по каждому элементу.
+        """
+        items = await self.get_rejected_items(objs_in)
+        accepted = [index for index in range(len(objs_in)) if index not in {item.index for item in items}]
+        created = await self.repository.bulk_create([objs_in[index] for index in accepted]) if accepted else []
+        for index, obj in zip(accepted, created):
+            if obj is None:
+                items.append(
+                    BatchItemResult(index=index, status=BatchItemStatus.CONFLICT, detail="Resource already exists")
+                )
+            else:
+                items.append(BatchItemResult(index=index, status=BatchItemStatus.CREATED, id=obj.id))
+
+        await self.invalidate_cached([item.id for item in items if item.status == BatchItemStatus.CREATED])
+        return self.make_batch_result(items=items, action="created", user=user)
+
+    async def bulk_update(self, objs_in: Sequence[P], user: User = None) -> BatchResult:
+        """
+        Пакетное обновление объектов.
+
+        Args:
+            objs_in (Sequence[P]): Данные для обновления, каждый элемент содержит id.
+            user (User, optional): Пользователь, обновляющий объекты.
+
+        Returns:
+            BatchResult: Результат по каждому элементу.
+        """
+        items = await self.get_rejected_items(objs_in)
+        accepted = [index for index in range(len(objs_in)) if index not in {item.index for item in items}]
+        updated = await self.repository.bulk_update([objs_in[index] for index in accepted]) if accepted else []
+        for index, obj in zip(accepted, updated):
+            if obj is None:
+                items.append(BatchItemResult(index=index, status=BatchItemStatus.NOT_FOUND, detail="Object not found"))
+            elif obj is False:
+                items.append(
+                    BatchItemResult(index=index, status=BatchItemStatus.CONFLICT, detail="Resource already exists")
+                )
+            else:
+                items.append(BatchItemResult(index=index, status=BatchItemStatus.UPDATED, id=obj.id))
+
+        await self.invalidate_cached([item.id for item in items if item.status == BatchItemStatus.UPDATED])
+        return self.make_batch_result(items=items, action="updated", user=user)
+
+    async def bulk_delete(self, ids: Sequence[int], user: User = None) -> BatchResult:
+        """
+        Пакетное удаление объектов.
+
+        Args:
+            ids (Sequence[int]): Идентификаторы объектов.
+            user (User, optional): Пользователь, удаляющий объекты.
+
+        Returns:
+            BatchResult: Результат по каждому элементу.
+        """
+        deleted_ids, failed_ids = await self.repository.bulk_delete(ids=ids)
+        items = []
+        for index, obj_id in enumerate(ids):
+            if obj_id in deleted_ids:
+                items.append(BatchItemResult(index=index, status=BatchItemStatus.DELETED, id=obj_id))
+                deleted_ids.discard(obj_id)
+            elif obj_id in failed_ids:
+                items.append(
+                    BatchItemResult(index=index, status=BatchItemStatus.CONFLICT, id=obj_id, detail="Object is in use")
+                )
+            else:
+                items.append(
+                    BatchItemResult(index=index, status=BatchItemStatus.NOT_FOUND, id=obj_id, detail="Object not found")
+                )
+
+        await self.invalidate_cached([item.id for item in items if item.status == BatchItemStatus.DELETED])
+        return self.make_batch_result(items=items, action="deleted", user=user)
+
+    async def get_rejected_items(self, objs_in: Sequence[P]) -> list[BatchItemResult]:
+        """
+        Проверка элементов пакета перед записью в базу данных. Переопределяется в сервисах со связанными объектами.
+
+        Args:
+            objs_in (Sequence[P]): Элементы пакета.
+
+        Returns:
+            list[BatchItemResult]: Результаты для отклонённых элементов.
+        """
+        return []
+
+    def make_batch_result(self, items: list[BatchItemResult], action: str, user: User = None) -> BatchResult:
+        """
+        Сборка результата пакетной операции и сброс кэша totalCount, если что-то изменилось.
+
+        Args:
+            items (list[BatchItemResult]): Результаты по элементам.
+            action (str): Название операции для журнала.
+            user (User, optional): Пользователь, выполнивший операцию.
+
+        Returns:
+            BatchResult: Результаты, отсортированные по позиции элемента в запросе.
+        """
+        items.sort(key=lambda item: item.index)
+        succeeded = sum(item.status not in (BatchItemStatus.CONFLICT, BatchItemStatus.NOT_FOUND) for item in items)
+        if succeeded:
+            count_cache.invalidate(self.repository.model)
+
         if user:
-            logger.info(f"User with id {user.id} deleted {model.__name__} with id {obj_id}")
+            logger.info(
+                f"User with id {user.id} {action} {succeeded} {self.repository.model.__name__} objects in batch"
+            )
+
+        return BatchResult(succeeded=succeeded, failed=len(items) - succeeded, items=items)
@@ -0,0 +1,117 @@
+import time
+from collections import OrderedDict
+
+from src.core.config import settings
+from src.core.models.base_model import Base
+
+
+class CountCache:
+    """
+    Кэш количества объектов (totalCount) с учётом фильтра.
+
+    Ключ - модель, словарь фильтрации и условия фильтрации. Записи живут ttl секунд, при превышении max_size вытесняются самые старые.
+    Инвалидация модели выполняется за O(1): в ключ входит поколение модели, которое увеличивается при изменениях.
+
+    Attributes:
+        ttl (int): Время жизни записи в секундах.
+        max_size (int): Максимальное количество записей.
+    """
+
+    def __init__(self, ttl: int, max_size: int):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: OrderedDict[tuple, tuple[int, float]] = OrderedDict()
+        self._generations: dict[str, int] = {}
+
+    def make_key(self, model: type[Base], filter_dict: dict, filters: tuple = ()) -> tuple:
+        """
+        Создание ключа кэша.
+
+        Args:
+            model: Модель объекта.
+            filter_dict (dict): Словарь фильтрации.
+            filters (tuple): Условия фильтрации (FilterClause).
+
+        Returns:
+            tuple: Ключ кэша.
+        """
+        table = model.__tablename__
+        filter_items = tuple(sorted(filter_dict.items(), key=lambda item: item[0]))
+        return table, self._generations.get(table, 0), filter_items, tuple(sorted(filters))
+
+    def get(self, model: type[Base], filter_dict: dict, filters: tuple = ()) -> int | None:
+        """
+        Получение количества объектов из кэша.
+
+        Args:
+            model: Модель объекта.
+            filter_dict (dict): Словарь фильтрации.
+            filters (tuple): Условия фильтрации (FilterClause).
+
+        Returns:
+            int: Количество объектов.
+            None: Если записи нет или её срок истёк.
+        """
+        key = self.make_key(model, filter_dict, filters)
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        total_count, expires_at = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+
+        return total_count
+
+    def set(self, model: type[Base], filter_dict: dict, total_count: int, filters: tuple = ()) -> None:
+        """
+        Сохранение количества объектов в кэш.
+
+        Args:
+            model: Модель объекта.
+            filter_dict (dict): Словарь фильтрации.
+            filters (tuple): Условия фильтрации (FilterClause).
+            total_count (int): Количество объектов.
+        """
+        key = self.make_key(model, filter_dict, filters)
+        self._entries[key] = (total_count, time.monotonic() + self.ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, model: type[Base]) -> None:
+        """
+        Инвалидация всех записей модели. Устаревшие записи вытесняются по мере заполнения кэша.
+
+        Args:
+            model: Модель объекта.
+        """
+        table = model.__tablename__
+        self._generations[table] = self._generations.get(table, 0) + 1
+
+    def apply_invalidation(self, table: str | None, ids: list[int] | None) -> None:
+        """
+        Обработчик событий шины инвалидации (см. InvalidationBus): сброс записей таблицы или всего кэша.
+
+        Args:
+            table (str | None): Имя таблицы, None - сбросить весь кэш.
+            ids (list[int] | None): id изменённых объектов (totalCount сбрасывается для всей таблицы).
+        """
+        if table is None:
+            self.clear()
+        else:
+            self._generations[table] = self._generations.get(table, 0) + 1
+
+    def clear(self) -> None:
+        """Очистка кэша."""
+        self._entries.clear()
+
+
+count_cache = CountCache(
+    ttl=settings.pagination.count_cache_ttl_seconds, max_size=settings.pagination.count_cache_max_size
+)
+
+
+def get_count_cache() -> CountCache:
+    return count_cache
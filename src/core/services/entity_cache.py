@@ -0,0 +1,437 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Awaitable, Callable, Hashable, Iterable, Protocol
+
+import orjson
+
+from src.core.config import settings
+from src.core.database.redis import get_redis_client
+from src.core.log_config import logger
+from src.core.metrics import metrics
+from src.core.models.base_model import Base
+
+if TYPE_CHECKING:
+    from redis.asyncio import Redis
+
+EntityKey = tuple[str, int]
+
+# Сохранение записи, только если версии объекта и таблицы не изменились с начала загрузки.
+FILL_SCRIPT = """
+if (redis.call("GET", KEYS[2]) or "") ~= ARGV[1] or (redis.call("GET", KEYS[3]) or "") ~= ARGV[2] then
+    return 0
+end
+redis.call("SET", KEYS[1], ARGV[3], "EX", ARGV[4])
+return 1
+"""
+
+# Удаление записей и увеличение версий объектов: KEYS - пары (запись, версия).
+INVALIDATE_SCRIPT = """
+for index = 1, #KEYS, 2 do
+    redis.call("DEL", KEYS[index])
+    redis.call("INCR", KEYS[index + 1])
+    redis.call("EXPIRE", KEYS[index + 1], ARGV[1])
+end
+return 1
+"""
+
+
+class EntityStore(Protocol):
+    """
+    Хранилище L2 кэша объектов: записи с версиями объектов и таблиц. Ошибки хранилища - RedisError.
+    """
+
+    async def get(self, key: EntityKey) -> tuple[bytes | None, Hashable]:
+        """
+        Получение записи и версии объекта (вместе с версией таблицы) на момент чтения.
+
+        Args:
+            key (EntityKey): Ключ кэша.
+
+        Returns:
+            tuple: Запись (None - нет записи) и версия.
+        """
+
+    async def fill(self, key: EntityKey, version: Hashable, value: bytes, ttl: int) -> bool:
+        """
+        Сохранение записи, если версия не изменилась с чтения (get).
+
+        Args:
+            key (EntityKey): Ключ кэша.
+            version (Hashable): Версия, полученная get до загрузки объекта.
+            value (bytes): Запись.
+            ttl (int): Время жизни записи в секундах.
+
+        Returns:
+            bool: True - запись сохранена.
+        """
+
+    async def invalidate(self, keys: list[EntityKey], ttl: int) -> None:
+        """
+        Удаление записей и увеличение версий объектов, версии хранятся ttl секунд.
+        """
+
+    async def invalidate_table(self, table: str, ttl: int) -> None:
+        """
+        Увеличение версии таблицы и удаление всех её записей.
+        """
+
+
+class RedisEntityStore:
+    """
+    Хранилище L2 в Redis: запись - entity:{table}:{id}, версии - entity_version:{table}:{id} и entity_version:{table}.
+    Проверка версий и запись, удаление записей и увеличение версий выполняются Lua-скриптами атомарно.
+
+    Attributes:
+        redis_client (Redis): Клиент Redis.
+    """
+
+    def __init__(self, redis_client: "Redis"):
+        self.redis_client = redis_client
+
+    @staticmethod
+    def get_redis_key(key: EntityKey) -> str:
+        return f"entity:{key[0]}:{key[1]}"
+
+    @staticmethod
+    def get_version_key(key: EntityKey) -> str:
+        return f"entity_version:{key[0]}:{key[1]}"
+
+    @staticmethod
+    def get_table_version_key(table: str) -> str:
+        return f"entity_version:{table}"
+
+    async def get(self, key: EntityKey) -> tuple[bytes | None, tuple[bytes, bytes]]:
+        cached, table_version, version = await self.redis_client.mget(
+            self.get_redis_key(key), self.get_table_version_key(key[0]), self.get_version_key(key)
+        )
+        return cached, (table_version or b"", version or b"")
+
+    async def fill(self, key: EntityKey, version: tuple[bytes, bytes], value: bytes, ttl: int) -> bool:
+        redis_keys = (self.get_redis_key(key), self.get_table_version_key(key[0]), self.get_version_key(key))
+        return bool(await self.redis_client.eval(FILL_SCRIPT, 3, *redis_keys, *version, value, ttl))
+
+    async def invalidate(self, keys: list[EntityKey], ttl: int) -> None:
+        redis_keys = [redis_key for key in keys for redis_key in (self.get_redis_key(key), self.get_version_key(key))]
+        await self.redis_client.eval(INVALIDATE_SCRIPT, len(redis_keys), *redis_keys, ttl)
+
+    async def invalidate_table(self, table: str, ttl: int) -> None:
+        # Версия таблицы увеличивается до удаления записей, поэтому идущие загрузки не сохранят их.
+        table_version_key = self.get_table_version_key(table)
+        await self.redis_client.pipeline().incr(table_version_key).expire(table_version_key, ttl).execute()
+        redis_keys = [redis_key async for redis_key in self.redis_client.scan_iter(match=f"entity:{table}:*")]
+        if redis_keys:
+            await self.redis_client.delete(*redis_keys)
+
+
+def get_redis_entity_store() -> RedisEntityStore:
+    return RedisEntityStore(get_redis_client())
+
+
+class EntityCache:
+    """
+    Двухуровневый кэш объектов по id: L1 - LRU в памяти процесса, L2 - общее для всех процессов хранилище (Redis).
+
+    Объект хранится словарём колонок после сериализации в JSON, поэтому оба уровня возвращают одинаковые значения
+    (даты - строками ISO). Изменяющие операции удаляют записи из L1 своего процесса и из L2, другие процессы видят
+    изменение не позже, чем через l1_ttl. Одновременные промахи по одному ключу в процессе ждут одну загрузку.
+
+    L2 - хранилище с интерфейсом EntityStore (в приложении - RedisEntityStore). Для каждого объекта и таблицы
+    в L2 хранится версия, invalidate и invalidate_model её увеличивают. Загрузка сохраняет запись в L2, только если
+    версия не изменилась с её начала, поэтому загрузка, начатая до изменения объекта в любом процессе, не вернёт
+    в L2 устаревшие данные. Объекты, прочитанные с реплики, в L2 не сохраняются (реплика может отставать
+    от primary), только в L1 процесса. Ошибки L2 не прерывают запрос: объект читается из базы данных.
+
+    Attributes:
+        l1_ttl (float): Время жизни записи L1 в секундах.
+        l1_max_size (int): Максимальное количество записей L1.
+        l2_ttl (int): Время жизни записи L2 в секундах.
+        store_getter (Callable): Получение хранилища L2, None - без L2.
+    """
+
+    def __init__(
+        self,
+        l1_ttl: float,
+        l1_max_size: int,
+        l2_ttl: int,
+        store_getter: Callable[[], EntityStore | None] = get_redis_entity_store,
+    ):
+        self.l1_ttl = l1_ttl
+        self.l1_max_size = l1_max_size
+        self.l2_ttl = l2_ttl
+        self.store_getter = store_getter
+        self._entries: OrderedDict[EntityKey, tuple[dict, float]] = OrderedDict()
+        self._loading: dict[EntityKey, asyncio.Future] = {}
+        self._invalidated: set[EntityKey] = set()
+
+    @staticmethod
+    def make_key(model: type[Base], obj_id: int) -> EntityKey:
+        return model.__tablename__, obj_id
+
+    async def get_or_load(
+        self,
+        model: type[Base],
+        obj_id: int,
+        loader: Callable[[], Awaitable[dict | None]],
+        from_replica: Callable[[], bool] = lambda: False,
+    ) -> dict | None:
+        """
+        Получение объекта из L1, затем из L2, при промахе - загрузка из базы данных.
+
+        Args:
+            model: Модель объекта.
+            obj_id (int): id объекта.
+            loader (Callable): Загрузка словаря колонок объекта из базы данных, None - объект не найден.
+            from_replica (Callable): Проверка после загрузки, прочитан ли объект с реплики (не сохраняется в L2).
+
+        Returns:
+            dict: Колонки объекта.
+            None: Если объект не найден (не кэшируется).
+        """
+        key = self.make_key(model, obj_id)
+        value = self.get_local(key)
+        if value is not None:
+            metrics.increment("entity_cache.l1_hits")
+            return value
+
+        loading = self._loading.get(key)
+        if loading is not None:
+            metrics.increment("entity_cache.coalesced")
+            try:
+                return await asyncio.shield(loading)
+
+            except asyncio.CancelledError:
+                if not loading.cancelled():
+                    raise
+                # Загрузивший запрос отменён, загрузка выполняется заново.
+                return await self.get_or_load(model, obj_id, loader, from_replica)
+
+        loading = asyncio.get_running_loop().create_future()
+        self._loading[key] = loading
+        try:
+            value = await self.load(key, loader, from_replica)
+            loading.set_result(value)
+            return value
+
+        except asyncio.CancelledError:
+            loading.cancel()
+            raise
+
+        except Exception as exc:
+            loading.set_exception(exc)
+            # Исключение получат ожидающие запросы, если они есть.
+            loading.exception()
+            raise
+
+        finally:
+            del self._loading[key]
+            self._invalidated.discard(key)
+
+    async def load(
+        self,
+        key: EntityKey,
+        loader: Callable[[], Awaitable[dict | None]],
+        from_replica: Callable[[], bool] = lambda: False,
+    ) -> dict | None:
+        """
+        Загрузка объекта из L2 или из базы данных с сохранением в кэш.
+
+        Запись не сохраняется, если объект был изменён (invalidate) во время загрузки: в L1 - этим процессом,
+        в L2 - любым процессом (по версиям объекта и таблицы, прочитанным до загрузки).
+
+        Args:
+            key (tuple): Ключ кэша.
+            loader (Callable): Загрузка словаря колонок объекта из базы данных.
+            from_replica (Callable): Проверка после загрузки, прочитан ли объект с реплики.
+
+        Returns:
+            dict: Колонки объекта.
+            None: Если объект не найден.
+        """
+        from redis.exceptions import RedisError
+
+        store = self.store_getter()
+        version = None
+        if store is not None:
+            try:
+                cached, version = await store.get(key)
+                if cached is not None:
+                    metrics.increment("entity_cache.l2_hits")
+                    value = orjson.loads(cached)
+                    if key not in self._invalidated:
+                        self.set_local(key, value)
+                    return value
+
+            except RedisError as exc:
+                metrics.increment("entity_cache.l2_errors")
+                logger.warning(f"Entity cache L2 read failed: {exc!r}")
+                store = None
+
+        metrics.increment("entity_cache.misses")
+        obj = await loader()
+        if obj is None:
+            return None
+
+        dumped = orjson.dumps(obj)
+        value = orjson.loads(dumped)
+        if key in self._invalidated:
+            return value
+
+        self.set_local(key, value)
+        if store is not None and not from_replica():
+            try:
+                await store.fill(key, version, dumped, self.l2_ttl)
+
+            except RedisError as exc:
+                metrics.increment("entity_cache.l2_errors")
+                logger.warning(f"Entity cache L2 write failed: {exc!r}")
+
+        return value
+
+    def get_local(self, key: EntityKey) -> dict | None:
+        """
+        Получение записи L1.
+
+        Args:
+            key (tuple): Ключ кэша.
+
+        Returns:
+            dict: Колонки объекта.
+            None: Если записи нет или её срок истёк.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        value, expires_at = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set_local(self, key: EntityKey, value: dict) -> None:
+        """
+        Сохранение записи L1, при превышении l1_max_size вытесняются давно не использованные записи.
+
+        Args:
+            key (tuple): Ключ кэша.
+            value (dict): Колонки объекта.
+        """
+        self._entries[key] = (value, time.monotonic() + self.l1_ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.l1_max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate_local(self, key: EntityKey) -> None:
+        """
+        Удаление записи L1. Идущая загрузка этого ключа не сохранит результат в кэш.
+
+        Args:
+            key (tuple): Ключ кэша.
+        """
+        self._entries.pop(key, None)
+        if key in self._loading:
+            self._invalidated.add(key)
+
+    async def invalidate(self, model: type[Base], ids: Iterable[int]) -> None:
+        """
+        Удаление объектов из L1 и L2 после их изменения, увеличение версий объектов в L2.
+
+        Версии хранятся l2_ttl: загрузка дольше l2_ttl может сохранить устаревшую запись.
+
+        Args:
+            model: Модель объекта.
+            ids (Iterable[int]): id изменённых объектов.
+        """
+        from redis.exceptions import RedisError
+
+        keys = [self.make_key(model, obj_id) for obj_id in ids]
+        if not keys:
+            return
+
+        for key in keys:
+            self.invalidate_local(key)
+
+        store = self.store_getter()
+        if store is not None:
+            try:
+                await store.invalidate(keys, self.l2_ttl)
+
+            except RedisError as exc:
+                metrics.increment("entity_cache.l2_errors")
+                logger.warning(f"Entity cache L2 invalidation failed: {exc!r}")
+
+    async def invalidate_model(self, model: type[Base]) -> None:
+        """
+        Удаление всех объектов модели из L1 и L2 (массовые изменения, например, пересчёт available).
+
+        Увеличивается версия таблицы в L2, поэтому идущие загрузки не сохранят объекты в L2.
+
+        Args:
+            model: Модель объекта.
+        """
+        from redis.exceptions import RedisError
+
+        table = model.__tablename__
+        for key in [key for key in (*self._entries, *self._loading) if key[0] == table]:
+            self.invalidate_local(key)
+
+        store = self.store_getter()
+        if store is not None:
+            try:
+                await store.invalidate_table(table, self.l2_ttl)
+
+            except RedisError as exc:
+                metrics.increment("entity_cache.l2_errors")
+                logger.warning(f"Entity cache L2 invalidation failed: {exc!r}")
+
+    def apply_invalidation(self, table: str | None, ids: list[int] | None) -> None:
+        """
+        Обработчик событий шины инвалидации (см. InvalidationBus): сброс записей L1, L2 уже сброшен изменившим
+        объекты процессом.
+
+        Args:
+            table (str | None): Имя таблицы, None - сбросить весь L1.
+            ids (list[int] | None): id изменённых объектов, None - все объекты таблицы.
+        """
+        keys = [key for key in (*self._entries, *self._loading) if table is None or key[0] == table]
+        if ids is not None:
+            keys = [(table, obj_id) for obj_id in ids]
+        for key in keys:
+            self.invalidate_local(key)
+
+    def get_stats(self) -> dict:
+        """
+        Статистика кэша: попадания по уровням, промахи и доля попаданий.
+
+        Returns:
+            dict: Счётчики, hit_ratio и текущий размер L1.
+        """
+        l1_hits, l2_hits, misses = (
+            metrics.counters[f"entity_cache.{name}"] for name in ("l1_hits", "l2_hits", "misses")
+        )
+        lookups = l1_hits + l2_hits + misses
+        return {
+            "l1_hits": l1_hits,
+            "l2_hits": l2_hits,
+            "misses": misses,
+            "hit_ratio": (l1_hits + l2_hits) / lookups if lookups else None,
+            "l1_size": len(self._entries),
+        }
+
+    def clear(self) -> None:
+        """Очистка L1."""
+        self._entries.clear()
+
+
+entity_cache = EntityCache(
+    l1_ttl=settings.entity_cache.l1_ttl_seconds,
+    l1_max_size=settings.entity_cache.l1_max_size,
+    l2_ttl=settings.entity_cache.l2_ttl_seconds,
+)
+
+
+def get_entity_cache() -> EntityCache:
+    return entity_cache
@@ -0,0 +1,98 @@
+import csv
+import io
+from typing import AsyncIterator, Sequence, TypeVar
+
+import orjson
+from pydantic import BaseModel
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from starlette.responses import StreamingResponse
+
+from src.core.models.base_model import Base
+from src.core.schemas.export_schema import ExportFormat
+
+DB = TypeVar("DB", bound=Base)
+
+MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv; charset=utf-8",
+}
+
+
+class Exporter:
+    """
+    Потоковая выгрузка всех объектов модели в формате NDJSON или CSV.
+
+    Строки читаются серверным курсором (AsyncSession.stream_scalars) порциями по yield_per,
+    поэтому потребление памяти не зависит от размера таблицы.
+
+    Сессия открывается внутри генератора ответа: зависимости с yield закрываются до отправки тела StreamingResponse.
+
+    Attributes:
+        session_factory (async_sessionmaker): Фабрика сессий базы данных.
+        export_format (ExportFormat): Формат выгрузки.
+        yield_per (int): Количество строк, читаемых из курсора за раз.
+    """
+
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession], export_format: ExportFormat, yield_per: int):
+        self.session_factory = session_factory
+        self.export_format = export_format
+        self.yield_per = yield_per
+
+    def get_response(self, model: type[DB], schema: type[BaseModel], filename: str) -> StreamingResponse:
+        """
+        Создание потокового ответа с выгрузкой.
+
+        Args:
+            model: Модель объекта.
+            schema (type[BaseModel]): Схема, по которой сериализуются объекты.
+            filename (str): Имя файла без расширения.
+
+        Returns:
+            StreamingResponse: Ответ с выгрузкой в виде вложения.
+        """
+        headers = {"Content-Disposition": f'attachment; filename="{filename}.{self.export_format.value}"'}
+        return StreamingResponse(
+            self.stream(model=model, schema=schema), media_type=MEDIA_TYPES[self.export_format], headers=headers
+        )
+
+    async def stream(self, model: type[DB], schema: type[BaseModel]) -> AsyncIterator[bytes]:
+        """
+        Чтение объектов модели, отсортированных по id, и их сериализация порциями.
+
+        Args:
+            model: Модель объекта.
+            schema (type[BaseModel]): Схема, по которой сериализуются объекты.
+
+        Yields:
+            bytes: Сериализованная порция строк.
+        """
+        if self.export_format == ExportFormat.CSV:
+            yield self.serialize_csv_rows([list(schema.model_fields)])
+
+        stmt = select(model).order_by(model.id).execution_options(yield_per=self.yield_per)
+        async with self.session_factory() as session:
+            result = await session.stream_scalars(stmt)
+            async for partition in result.partitions():
+                yield self.serialize([schema.model_validate(obj) for obj in partition])
+
+    def serialize(self, objects: Sequence[BaseModel]) -> bytes:
+        """
+        Сериализация порции объектов в выбранный формат.
+
+        Args:
+            objects (Sequence[BaseModel]): Объекты, приведённые к схеме выгрузки.
+
+        Returns:
+            bytes: Строки NDJSON или CSV.
+        """
+        if self.export_format == ExportFormat.CSV:
+            return self.serialize_csv_rows([obj.model_dump(mode="json").values() for obj in objects])
+
+        return b"".join(orjson.dumps(obj.model_dump()) + b"\n" for obj in objects)
+
+    @staticmethod
+    def serialize_csv_rows(rows: Sequence) -> bytes:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        return buffer.getvalue().encode()
@@ -0,0 +1,188 @@
+import asyncio
+import uuid
+from typing import TYPE_CHECKING, Callable, Iterable
+
+import orjson
+
+from src.core.config import settings
+from src.core.database.redis import get_redis_client
+from src.core.log_config import logger
+from src.core.metrics import metrics
+from src.core.models.base_model import Base
+
+if TYPE_CHECKING:
+    from redis.asyncio import Redis
+
+# Увеличение номера и публикация одной командой: порядок номеров совпадает с порядком сообщений в канале.
+PUBLISH_SCRIPT = """
+local seq = redis.call('INCR', KEYS[1])
+redis.call('PUBLISH', ARGV[1], seq .. ' ' .. ARGV[2])
+return seq
+"""
+
+InvalidationHandler = Callable[[str | None, list[int] | None], None]
+
+
+class InvalidationBus:
+    """
+    Шина инвалидации кэшей процессов через Redis pub/sub.
+
+    Изменение объектов публикуется событием (таблица, id) с порядковым номером, каждый процесс подписан на канал
+    и сбрасывает записи своих кэшей (обработчики add_handler). Событие без id сбрасывает всю таблицу, вызов
+    обработчика с table=None - все кэши процесса. Все кэши сбрасываются при подключении к каналу и при пропуске
+    номера (сообщения, опубликованные во время разрыва соединения, не доставляются).
+
+    Attributes:
+        channel (str): Канал Redis.
+        retry_seconds (float): Пауза перед переподключением после ошибки.
+        redis_client_getter (Callable): Получение клиента Redis.
+        origin (str): Идентификатор процесса, свои события процесс не обрабатывает.
+        last_seq (int | None): Номер последнего обработанного события, None - процесс не подписан.
+        subscribed (asyncio.Event): Устанавливается после подписки на канал.
+    """
+
+    def __init__(
+        self,
+        channel: str,
+        retry_seconds: float = 1,
+        redis_client_getter: Callable[[], "Redis"] = get_redis_client,
+    ):
+        self.channel = channel
+        self.retry_seconds = retry_seconds
+        self.redis_client_getter = redis_client_getter
+        self.origin = uuid.uuid4().hex
+        self.last_seq: int | None = None
+        self.subscribed = asyncio.Event()
+        self.handlers: list[InvalidationHandler] = []
+
+    @property
+    def seq_key(self) -> str:
+        return f"{self.channel}:seq"
+
+    def add_handler(self, handler: InvalidationHandler) -> None:
+        """
+        Добавление обработчика событий: handler(table, ids) сбрасывает записи кэша процесса.
+
+        Args:
+            handler (Callable): Обработчик, table=None - сбросить всё, ids=None - всю таблицу.
+        """
+        if handler not in self.handlers:
+            self.handlers.append(handler)
+
+    async def publish(self, model: type[Base], ids: Iterable[int] | None) -> int | None:
+        """
+        Публикация события об изменении объектов. Ошибка Redis не прерывает запрос.
+
+        Args:
+            model: Модель изменённых объектов.
+            ids (Iterable[int] | None): id изменённых объектов, None - изменено неизвестное множество объектов.
+
+        Returns:
+            int: Номер события.
+            None: Если изменённых объектов нет или публикация не удалась.
+        """
+        from redis.exceptions import RedisError
+
+        ids = None if ids is None else list(ids)
+        if ids == []:
+            return None
+
+        payload = orjson.dumps({"origin": self.origin, "table": model.__tablename__, "ids": ids})
+        try:
+            seq = await self.redis_client_getter().eval(PUBLISH_SCRIPT, 1, self.seq_key, self.channel, payload)
+
+        except RedisError as exc:
+            metrics.increment("invalidation_bus.publish_errors")
+            logger.warning(f"Invalidation event for {model.__tablename__} was not published: {exc!r}")
+            return None
+
+        metrics.increment("invalidation_bus.published")
+        return seq
+
+    async def run(self) -> None:
+        """
+        Подписка на канал и обработка событий до отмены задачи, с переподключением после ошибок Redis.
+        """
+        from redis.exceptions import RedisError
+
+        while True:
+            try:
+                await self.listen()
+
+            except RedisError as exc:
+                logger.warning(f"Invalidation bus disconnected: {exc!r}")
+
+            self.last_seq = None
+            self.subscribed.clear()
+            await asyncio.sleep(self.retry_seconds)
+
+    async def listen(self) -> None:
+        """
+        Подписка на канал, сброс кэшей процесса и обработка событий.
+        """
+        redis_client = self.redis_client_getter()
+        async with redis_client.pubsub() as pubsub:
+            await pubsub.subscribe(self.channel)
+            # События с номерами до last_seq могли быть пропущены до подписки, поэтому кэши сбрасываются целиком.
+            self.last_seq = int(await redis_client.get(self.seq_key) or 0)
+            self.flush(reason="subscribed")
+            self.subscribed.set()
+            async for message in pubsub.listen():
+                if message["type"] != "message":
+                    continue
+                try:
+                    self.handle(message["data"])
+
+                except Exception:
+                    # Событие не применено, поэтому кэши процесса сбрасываются целиком.
+                    metrics.increment("invalidation_bus.handle_errors")
+                    logger.exception(f"Invalidation event {message['data']!r} was not handled")
+                    self.flush(reason="event was not handled")
+
+    def handle(self, data: bytes) -> None:
+        """
+        Обработка события: при пропуске номера сбрасываются все кэши процесса.
+
+        Args:
+            data (bytes): Сообщение канала "<номер> <json>".
+        """
+        seq, payload = data.split(b" ", 1)
+        seq = int(seq)
+        metrics.increment("invalidation_bus.received")
+        if self.last_seq is not None and seq > self.last_seq + 1:
+            metrics.increment("invalidation_bus.gaps")
+            self.flush(reason=f"missed events {self.last_seq + 1}..{seq - 1}")
+        self.last_seq = max(seq, self.last_seq or 0)
+
+        event = orjson.loads(payload)
+        if event["origin"] == self.origin:
+            return
+
+        for handler in self.handlers:
+            handler(event["table"], event["ids"])
+
+    def flush(self, reason: str) -> None:
+        """
+        Сброс всех кэшей процесса. Ошибка одного обработчика не прерывает сброс остальных кэшей.
+
+        Args:
+            reason (str): Причина для журнала.
+        """
+        metrics.increment("invalidation_bus.flushes")
+        logger.info(f"Flushing process caches: {reason}")
+        for handler in self.handlers:
+            try:
+                handler(None, None)
+
+            except Exception:
+                metrics.increment("invalidation_bus.handle_errors")
+                logger.exception(f"Process cache flush by {handler!r} failed")
+
+
+invalidation_bus = InvalidationBus(
+    channel=settings.invalidation_bus.channel, retry_seconds=settings.invalidation_bus.retry_seconds
+)
+
+
+def get_invalidation_bus() -> InvalidationBus:
+    return invalidation_bus
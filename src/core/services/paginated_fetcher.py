@@ -1,4 +1,9 @@
-from typing import Any
+from typing import Any, Sequence
+
+from src.core.models.base_model import CountStrategy
+from src.core.schemas.filter_schema import FilterClause
+from src.core.services.count_cache import CountCache
+from src.core.utils import decode_cursor, encode_cursor
 
 
 class PaginatedFetcher:
@@ -11,46 +16,145 @@ class PaginatedFetcher:
         limit (int): Количество объектов для пагинации.
         field (str): Поле для фильтрации.
         value (Any): Значение для фильтрации.
+        filters (tuple[FilterClause, ...]): Условия фильтрации, объединяемые через AND.
+        fields (list[str] | None): Поля для выборки, None - объекты целиком.
+        after_id (int | None): id последнего объекта предыдущей страницы (курсорная пагинация).
+        include_total (bool): Нужно ли считать totalCount.
+        approximate_total (bool): Разрешить приблизительный totalCount для списков без фильтра.
+        count_cache (CountCache | None): Кэш totalCount.
 
     """
 
-    def __init__(self, repository, offset: int, limit: int, field: str | None, value: Any | None):
+    def __init__(
+        self,
+        repository,
+        offset: int,
+        limit: int,
+        field: str | None,
+        value: Any | None,
+        filters: Sequence[FilterClause] = (),
+        fields: list[str] | None = None,
+        after: str | None = None,
+        include_total: bool = True,
+        approximate_total: bool = False,
+        count_cache: CountCache | None = None,
+    ):
         self.repository = repository
         self.offset = offset
         self.limit = limit
         self.field = field
         self.value = value
+        self.filters = tuple(filters)
+        self.fields = fields
+        self.after_id = decode_cursor(after) if after else None
+        self.include_total = include_total
+        self.approximate_total = approximate_total
+        self.count_cache = count_cache
 
     async def get_paginated_list(self, model, extra_filters: dict = None) -> dict:
         """
         Получение отфильтрованного и пагинированного списка объектов.
 
         Args:
-            model (DB): Модель объекта.
+            model (DB): Модель объекта. Способ подсчёта totalCount задаётся атрибутом model.count_strategy.
             extra_filters (dict): Дополнительные фильтры.
 
         Returns:
             dict: Словарь с данными пагинации:
                 - offset: Начальный индекс.
                 - limit: Количество объектов.
-                - totalCount: Общее количество объектов с учетом фильтра.
-                - data: Список объектов.
+                - totalCount: Общее количество объектов с учетом фильтра (None, если не запрошено).
+                - nextCursor: Курсор следующей страницы (None, если страница последняя).
+                - data: Список объектов (словарей с выбранными полями, если задан fields).
 
         """
         filter_dict = self.repository.get_filter_dict(model=model, field=self.field, value=self.value)
         if extra_filters:
             filter_dict.update(extra_filters)
+        conditions = self.repository.get_filter_conditions(model=model, filters=self.filters)
+        columns = self.repository.get_field_columns(model=model, fields=self.fields)
+        page_kwargs = dict(
+            model=model,
+            offset=self.offset,
+            limit=self.limit,
+            filter_dict=filter_dict,
+            after_id=self.after_id,
+            conditions=conditions,
+            columns=columns,
+        )
+
+        total_count = await self.get_known_total_count(model=model, filter_dict=filter_dict)
+        if total_count is None and self.include_total and model.count_strategy == CountStrategy.COMBINED:
+            data, total_count = await self.repository.get_page_with_total(**page_kwargs)
+            self.cache_total_count(model=model, filter_dict=filter_dict, total_count=total_count)
+        else:
+            if total_count is None and self.include_total:
+                total_count = await self.repository.get_total_count(
+                    model=model, filter_dict=filter_dict, conditions=conditions
+                )
+                self.cache_total_count(model=model, filter_dict=filter_dict, total_count=total_count)
+            data = await self.repository.get_obj_list(**page_kwargs)
+
         pagination = {
             "offset": self.offset,
             "limit": self.limit,
-            "totalCount": await self.repository.get_total_count(model=model, filter_dict=filter_dict),
-            "data": await self.repository.get_obj_list(
-                model=model, offset=self.offset, limit=self.limit, filter_dict=filter_dict
-            ),
+            "totalCount": total_count,
+            "nextCursor": self.get_next_cursor(data),
+            "data": data,
         }
 
         return pagination
 
+    async def get_known_total_count(self, model, filter_dict: dict) -> int | None:
+        """
+        Получение totalCount без точного подсчёта: из кэша или по статистике планировщика.
+
+        Args:
+            model (DB): Модель объекта.
+            filter_dict (dict): Словарь фильтрации.
+
+        Returns:
+            int: Количество объектов.
+            None: Если количество не запрошено или требуется точный подсчёт.
+        """
+        if not self.include_total:
+            return None
+
+        if self.count_cache:
+            total_count = self.count_cache.get(model=model, filter_dict=filter_dict, filters=self.filters)
+            if total_count is not None:
+                return total_count
+
+        if self.approximate_total and not filter_dict and not self.filters:
+            return await self.repository.get_approximate_count(model=model)
+
+    def cache_total_count(self, model, filter_dict: dict, total_count: int) -> None:
+        """
+        Сохранение точного totalCount в кэш.
+
+        Args:
+            model (DB): Модель объекта.
+            filter_dict (dict): Словарь фильтрации.
+            total_count (int): Количество объектов.
+        """
+        if self.count_cache:
+            self.count_cache.set(model=model, filter_dict=filter_dict, filters=self.filters, total_count=total_count)
+
+    def get_next_cursor(self, data: list) -> str | None:
+        """
+        Получение курсора следующей страницы.
+
+        Args:
+            data (list): Объекты текущей страницы.
+
+        Returns:
+            str: Курсор, указывающий на последний объект страницы.
+            None: Если страница неполная, т.е. следующих объектов нет.
+        """
+        if self.limit and len(data) == self.limit:
+            last = data[-1]
+            return encode_cursor(last["id"] if isinstance(last, dict) else last.id)
+
     async def fetch_by_reader_id(self, model, reader_id: int) -> dict:
         """
         Получение отфильтрованного и пагинированного списка объектов по идентификатору пользователя.
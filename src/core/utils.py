@@ -0,0 +1,43 @@
+import base64
+import binascii
+
+import orjson
+
+
+def encode_cursor(last_id: int) -> str:
+    """
+    Кодирует ключ последнего полученного объекта в непрозрачный курсор.
+
+    Args:
+        last_id (int): id последнего объекта страницы.
+
+    Returns:
+        str: Курсор для запроса следующей страницы.
+    """
+    raw = orjson.dumps({"id": last_id})
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    """
+    Декодирует курсор в ключ последнего полученного объекта.
+
+    Args:
+        cursor (str): Курсор, полученный в поле nextCursor.
+
+    Returns:
+        int: id последнего объекта предыдущей страницы.
+
+    Raises:
+        ValueError: Если курсор повреждён.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        last_id = orjson.loads(raw)["id"]
+    except (binascii.Error, orjson.JSONDecodeError, KeyError, TypeError, ValueError):
+        raise ValueError("Invalid cursor") from None
+
+    if not isinstance(last_id, int) or isinstance(last_id, bool):
+        raise ValueError("Invalid cursor")
+
+    return last_id
@@ -1,23 +1,73 @@
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
 
 from fastapi import FastAPI, Depends
 from fastapi.responses import ORJSONResponse
 
 from src.app.api import app_router
+from src.app.jobs.periodic import run_periodic
+from src.app.jobs.reconcile_active_borrows import reconcile_active_borrows
+from src.app.jobs.reconcile_available import reconcile_available
 from src.auth.api import security_router
 from src.auth.api.auth_routes import http_bearer  # , router as auth_router
+from src.auth.repository.token_repository import get_token_repository
+from src.auth.services.password_service import passwords_manager
+from src.auth.services.token_service import token_service
 
+from src.core.config import StartupMode, settings
 from src.core.database.db import db
+from src.core.database.redis import close_redis_client
+from src.core.database.replicas import ReadYourWritesMiddleware
+from src.core.metrics import DbUsageMiddleware
+from src.core.models.column_registry import column_registry
+from src.core.services.count_cache import count_cache
+from src.core.services.entity_cache import entity_cache
+from src.core.services.invalidation_bus import invalidation_bus
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    await db.create_tables()
+    column_registry.build()
+    if settings.app.startup_mode == StartupMode.CHECK:
+        await db.check_schema_revision()
+    jobs = [
+        asyncio.create_task(
+            run_periodic(
+                reconcile_available,
+                db.bulk_session_factory,
+                interval=settings.inventory.reconcile_interval_seconds,
+            )
+        ),
+        asyncio.create_task(
+            run_periodic(
+                reconcile_active_borrows,
+                db.bulk_session_factory,
+                interval=settings.inventory.active_borrows_check_interval_seconds,
+            )
+        ),
+    ]
+    if settings.invalidation_bus.enabled:
+        for cache in (count_cache, entity_cache, get_token_repository()):
+            invalidation_bus.add_handler(cache.apply_invalidation)
+        jobs.append(asyncio.create_task(invalidation_bus.run()))
     yield
+    for job in jobs:
+        job.cancel()
+        with suppress(asyncio.CancelledError):
+            await job
+    await close_redis_client()
+    passwords_manager.shutdown()
     await db.dispose()
 
 
 main_app = FastAPI(default_response_class=ORJSONResponse, lifespan=lifespan)
+main_app.add_middleware(
+    ReadYourWritesMiddleware,
+    window_seconds=settings.db.read_your_writes_seconds,
+    recent_writes=db.recent_writes,
+    user_id_getter=token_service.get_user_id,
+)
+main_app.add_middleware(DbUsageMiddleware)
 
 
 main_app.include_router(router=app_router, dependencies=[Depends(http_bearer)])
@@ -0,0 +1,36 @@
+import pytest
+
+from src.core.metrics import DbUsageMiddleware, metrics
+
+
+@pytest.mark.asyncio
+async def test_access_token_authorization(test_app, test_client) -> None:
+    test_app.add_middleware(DbUsageMiddleware)
+    credentials = {"username": "reader", "password": "old"}
+    response = await test_client.post("/auth/register/", data=credentials)
+    assert response.status_code == 201
+    response = await test_client.post("/auth/token/", data=credentials)
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    metrics.clear()
+
+    # Права проверяются по токену: запрос администратора отклоняется без обращения к базе данных.
+    response = await test_client.get("/users/users-list/", headers=headers)
+    assert response.status_code == 403
+    assert metrics.counters["http.requests_without_db"] == 1
+
+    response = await test_client.get("/borrows/user-borrows/", headers=headers, params={"limit": 10})
+    assert response.status_code == 200
+
+    # Смена пароля увеличивает версию токенов: старый access токен больше не принимается.
+    response = await test_client.patch(
+        "/users/update-password/",
+        headers=headers,
+        data={"old_password": "old", "new_password": "new", "confirm_password": "new"},
+    )
+    assert response.status_code == 200
+    new_headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    response = await test_client.get("/borrows/user-borrows/", headers=headers, params={"limit": 10})
+    assert response.status_code == 401
+    response = await test_client.get("/borrows/user-borrows/", headers=new_headers, params={"limit": 10})
+    assert response.status_code == 200
@@ -1,7 +1,95 @@
 import pytest
 
+from src.app.models.author_model import Author
+from src.auth.api.auth_dependencies import has_admin_permissions, has_reader_permissions
+from src.core.metrics import metrics
+from src.core.services.entity_cache import EntityCache, RedisEntityStore, entity_cache
+
 
 @pytest.mark.asyncio
 async def test_create_author_endpoint(test_client) -> None:
     response = await test_client.post("/authors/")
     assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_author_crud_returning(test_app, test_client) -> None:
+    test_app.dependency_overrides[has_admin_permissions] = lambda: None
+    author_in = {"name": "Автор", "biography": "", "birth_date": "1900-01-01"}
+
+    response = await test_client.post("/authors/", json=author_in)
+    assert response.status_code == 201
+    assert response.json()["id"] == 1
+
+    response = await test_client.post("/authors/", json=author_in)
+    assert response.status_code == 409
+
+    response = await test_client.post("/authors/", json={**author_in, "birth_date": "1900-01-02"})
+    assert response.status_code == 201
+
+    response = await test_client.put("/authors/1/", json={**author_in, "id": 1, "biography": "Биография"})
+    assert response.json()["biography"] == "Биография"
+
+    response = await test_client.put("/authors/100/", json={**author_in, "id": 100})
+    assert response.status_code == 404
+
+    response = await test_client.delete("/authors/1/")
+    assert response.status_code == 204
+
+    response = await test_client.delete("/authors/1/")
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_author_entity_cache(test_app, test_client) -> None:
+    test_app.dependency_overrides[has_admin_permissions] = lambda: None
+    test_app.dependency_overrides[has_reader_permissions] = lambda: None
+    author_in = {"name": "Автор", "biography": "", "birth_date": "1900-01-01"}
+    await test_client.post("/authors/", json=author_in)
+    metrics.clear()
+
+    # Первое чтение загружает автора из базы данных, повторное - из памяти процесса.
+    for _ in range(2):
+        response = await test_client.get("/authors/1/")
+        assert response.json()["name"] == "Автор"
+    assert entity_cache.get_stats()["misses"] == 1
+    assert entity_cache.get_stats()["l1_hits"] == 1
+
+    # Другой процесс (пустой L1) читает автора из Redis.
+    entity_cache.clear()
+    response = await test_client.get("/authors/1/", params={"fields": "name"})
+    assert response.json() == {"id": 1, "name": "Автор"}
+    assert entity_cache.get_stats()["l2_hits"] == 1
+
+    # Обновление удаляет автора из обоих уровней кэша.
+    await test_client.put("/authors/1/", json={**author_in, "id": 1, "biography": "Биография"})
+    response = await test_client.get("/authors/1/")
+    assert response.json()["biography"] == "Биография"
+    assert entity_cache.get_stats()["misses"] == 2
+
+
+@pytest.mark.asyncio
+async def test_redis_entity_store_fill_after_invalidation(test_redis_client) -> None:
+    # Два процесса с общим Redis: второй изменяет автора во время загрузки первым.
+    store = RedisEntityStore(test_redis_client)
+    cache = EntityCache(l1_ttl=5, l1_max_size=10, l2_ttl=5, store_getter=lambda: store)
+    other_cache = EntityCache(l1_ttl=5, l1_max_size=10, l2_ttl=5, store_getter=lambda: store)
+
+    async def load_before_update() -> dict:
+        await other_cache.invalidate(Author, [1])
+        return {"id": 1, "name": "Автор"}
+
+    async def load_before_model_update() -> dict:
+        await other_cache.invalidate_model(Author)
+        return {"id": 1, "name": "Автор"}
+
+    for load in (load_before_update, load_before_model_update):
+        assert await cache.get_or_load(Author, 1, load) == {"id": 1, "name": "Автор"}
+        assert await test_redis_client.get(store.get_redis_key(("authors", 1))) is None
+        cache.clear()
+
+    async def load_after_update() -> dict:
+        return {"id": 1, "name": "Новый автор"}
+
+    assert await other_cache.get_or_load(Author, 1, load_after_update) == {"id": 1, "name": "Новый автор"}
+    assert await cache.get_or_load(Author, 1, load_before_update) == {"id": 1, "name": "Новый автор"}
@@ -0,0 +1,79 @@
+from datetime import date, datetime
+
+import pytest
+
+from src.app.models.author_model import Author
+from src.app.models.book_model import Book
+from src.app.repository.borrow_repository import BorrowRepository
+from src.app.schemas.borrow_schema import BorrowUpdate
+from src.auth.api.auth_dependencies import has_admin_permissions
+from src.core.models.user_model import User
+
+
+def author(i: int) -> dict:
+    return {"name": f"Автор {i}", "biography": "", "birth_date": f"1900-01-0{i}"}
+
+
+def book(i: int, author_id: int) -> dict:
+    return {
+        "title": f"Книга {i}",
+        "description": "",
+        "publication_date": "2000-01-01T00:00:00",
+        "genres": "",
+        "author_id": author_id,
+        "available": 1,
+    }
+
+
+def statuses(response) -> list[str]:
+    return [item["status"] for item in response.json()["items"]]
+
+
+@pytest.mark.asyncio
+async def test_batch_endpoints(test_app, test_client) -> None:
+    test_app.dependency_overrides[has_admin_permissions] = lambda: None
+
+    response = await test_client.post("/authors/batch/", json=[author(1), author(2)])
+    assert statuses(response) == ["created", "created"]
+
+    response = await test_client.post("/authors/batch/", json=[author(2), author(3), author(3)])
+    assert response.json()["succeeded"] == 1
+    assert statuses(response) == ["conflict", "created", "conflict"]
+    assert response.json()["items"][1]["id"] == 4
+
+    response = await test_client.post("/books/batch/", json=[book(1, 1), book(2, 100), book(3, 4)])
+    assert statuses(response) == ["created", "not_found", "created"]
+
+    response = await test_client.put(
+        "/authors/batch/",
+        json=[{**author(5), "id": 1}, {**author(6), "id": 100}, {**author(2), "id": 4}],
+    )
+    assert statuses(response) == ["updated", "not_found", "conflict"]
+
+    response = await test_client.post("/authors/batch/delete/", json={"ids": [2, 1, 100]})
+    assert statuses(response) == ["deleted", "conflict", "not_found"]
+
+    response = await test_client.post("/authors/batch/", json=[author(1)] * 1001)
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_without_unique_constraint(test_db_session) -> None:
+    author = Author(name="Автор", biography="", birth_date=date(1900, 1, 1))
+    test_db_session.add(author)
+    await test_db_session.flush()
+    test_db_session.add(
+        Book(title="Книга", description="", genres="", publication_date=date(2000, 1, 1), available=1, author_id=1)
+    )
+    test_db_session.add(User(username="reader", hashed_password=b""))
+    await test_db_session.commit()
+
+    def borrow(borrow_id: int) -> BorrowUpdate:
+        return BorrowUpdate(id=borrow_id, borrow_date=datetime(2024, 1, 1), book_id=1, reader_id=1)
+
+    repository = BorrowRepository(session=test_db_session)
+    assert [obj.id for obj in await repository.bulk_create([borrow(1), borrow(2)])] == [1, 2]
+
+    # У выдач нет уникального ограничения: пропущенная строка (конфликт по id) остаётся на своём месте.
+    created = await repository.bulk_create([borrow(2), borrow(3), borrow(1)])
+    assert [obj and obj.id for obj in created] == [None, 3, None]
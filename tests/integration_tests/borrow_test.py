@@ -0,0 +1,226 @@
+import asyncio
+from datetime import date
+
+import pytest
+from sqlalchemy import select, update
+
+from src.app.jobs.reconcile_active_borrows import RECONCILE_ACTIVE_BORROWS_LOCK_KEY, reconcile_active_borrows
+from src.app.jobs.reconcile_available import RECONCILE_AVAILABLE_LOCK_KEY, reconcile_available
+from src.app.models.author_model import Author
+from src.app.models.book_model import Book
+from src.app.models.borrow_model import Borrow
+from src.app.repository.book_repository import BookRepository
+from src.app.repository.borrow_repository import BorrowRepository
+from src.app.schemas.book_schema import BookUpdate
+from src.app.schemas.borrow_schema import CheckoutOutcome, ReturnOutcome
+from src.auth.api.auth_dependencies import has_reader_permissions
+from src.core.database.advisory_lock import try_advisory_xact_lock
+from src.core.models.user_model import User
+from src.core.services.invalidation_bus import invalidation_bus
+from tests.conftest import test_async_sessionmaker as session_factory
+
+
+async def create_books_and_readers(session, available: list[int], readers: int) -> None:
+    author = Author(name="Автор", biography="", birth_date=date(1900, 1, 1))
+    session.add(author)
+    await session.flush()
+    session.add_all(
+        [
+            Book(
+                title=f"Книга {i}",
+                description="",
+                genres="",
+                publication_date=date(2000, 1, 1),
+                available=count,
+                author_id=author.id,
+            )
+            for i, count in enumerate(available)
+        ]
+    )
+    session.add_all([User(username=f"reader{i}", hashed_password=b"") for i in range(readers)])
+    await session.commit()
+
+
+async def checkout(book_id: int, reader_id: int) -> CheckoutOutcome:
+    async with session_factory() as session:
+        outcome, _ = await BorrowRepository(session=session).checkout(book_id=book_id, reader_id=reader_id, limit=5)
+        return outcome
+
+
+@pytest.mark.asyncio
+async def test_concurrent_checkout_of_one_book(test_db_session) -> None:
+    await create_books_and_readers(test_db_session, available=[3], readers=20)
+
+    outcomes = await asyncio.gather(*(checkout(book_id=1, reader_id=reader_id) for reader_id in range(1, 21)))
+
+    assert outcomes.count(CheckoutOutcome.OK) == 3
+    assert outcomes.count(CheckoutOutcome.NO_COPIES) == 17
+    assert await test_db_session.scalar(Book.__table__.select().with_only_columns(Book.available)) == 0
+
+
+@pytest.mark.asyncio
+async def test_concurrent_checkout_limit(test_db_session) -> None:
+    await create_books_and_readers(test_db_session, available=[1] * 10, readers=1)
+
+    outcomes = await asyncio.gather(*(checkout(book_id=book_id, reader_id=1) for book_id in range(1, 11)))
+
+    assert outcomes.count(CheckoutOutcome.OK) == 5
+    assert outcomes.count(CheckoutOutcome.LIMIT_EXCEEDED) == 5
+    assert await checkout(book_id=100, reader_id=1) == CheckoutOutcome.BOOK_NOT_FOUND
+    assert await checkout(book_id=1, reader_id=100) == CheckoutOutcome.READER_NOT_FOUND
+
+
+async def close(borrow_id: int) -> ReturnOutcome:
+    async with session_factory() as session:
+        outcome, _ = await BorrowRepository(session=session).close(borrow_id=borrow_id)
+        return outcome
+
+
+@pytest.mark.asyncio
+async def test_concurrent_return(test_db_session) -> None:
+    await create_books_and_readers(test_db_session, available=[1], readers=1)
+    assert await checkout(book_id=1, reader_id=1) == CheckoutOutcome.OK
+
+    outcomes = await asyncio.gather(*(close(borrow_id=1) for _ in range(5)))
+
+    assert outcomes.count(ReturnOutcome.OK) == 1
+    assert outcomes.count(ReturnOutcome.ALREADY_RETURNED) == 4
+    assert await test_db_session.scalar(Book.__table__.select().with_only_columns(Book.available)) == 1
+    assert await close(borrow_id=100) == ReturnOutcome.BORROW_NOT_FOUND
+
+
+@pytest.mark.asyncio
+async def test_batch_checkout_and_return(test_app, test_client, test_db_session) -> None:
+    await create_books_and_readers(test_db_session, available=[1, 0, 1, 1, 1, 1, 1], readers=1)
+    test_app.dependency_overrides[has_reader_permissions] = lambda: User(id=1, username="reader0")
+
+    response = await test_client.post("/borrows/batch/", json={"book_ids": [1, 2, 100, 3, 4, 5, 6, 7]})
+    items = response.json()["items"]
+    assert [item["status"] for item in items] == ["created"] + ["conflict", "not_found"] + ["created"] * 4 + [
+        "conflict"
+    ]
+    assert items[1]["detail"] == "There are no copies of the book available"
+    assert items[7]["detail"] == "You can't borrow more than 5 books at the same time"
+
+    borrow_ids = [item["id"] for item in items if item["status"] == "created"]
+    response = await test_client.post("/borrows/return-batch/", json={"borrow_ids": [borrow_ids[0], 100]})
+    assert [item["status"] for item in response.json()["items"]] == ["updated", "not_found"]
+
+    response = await test_client.post("/borrows/return-batch/", json={"borrow_ids": [borrow_ids[0]]})
+    assert response.json()["items"][0]["status"] == "conflict"
+
+    response = await test_client.post("/borrows/batch/", json={"book_ids": [7, 7]})
+    assert response.status_code == 422
+
+    response = await test_client.post("/borrows/batch/", json={"book_ids": [7]})
+    assert response.json()["succeeded"] == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_checkout_of_copies(test_db_session) -> None:
+    await create_books_and_readers(test_db_session, available=[0], readers=10)
+    async with session_factory() as session:
+        book = await BookRepository(session=session).add_copies(book_id=1, count=3)
+        assert book.tracks_copies and book.available == 3
+
+    outcomes = await asyncio.gather(*(checkout(book_id=1, reader_id=reader_id) for reader_id in range(1, 11)))
+
+    assert outcomes.count(CheckoutOutcome.OK) == 3
+    assert outcomes.count(CheckoutOutcome.NO_COPIES) == 7
+    copy_ids = await test_db_session.scalars(select(Borrow.copy_id))
+    assert sorted(copy_ids) == [1, 2, 3]
+
+    assert await close(borrow_id=1) == ReturnOutcome.OK
+    assert await checkout(book_id=1, reader_id=10) == CheckoutOutcome.OK
+    # Пока другой процесс выполняет пересчёт (удерживает блокировку в транзакции), запуск пропускается.
+    async with session_factory() as session:
+        assert await try_advisory_xact_lock(session, RECONCILE_AVAILABLE_LOCK_KEY)
+        assert await reconcile_available(session_factory) == 0
+    assert await reconcile_available(session_factory) == 1
+    assert await test_db_session.scalar(select(Book.available).execution_options(populate_existing=True)) == 0
+
+
+@pytest.mark.asyncio
+async def test_available_of_tracked_book_is_not_writable(test_db_session) -> None:
+    await create_books_and_readers(test_db_session, available=[0, 1], readers=0)
+    async with session_factory() as session:
+        repository = BookRepository(session=session)
+        await repository.add_copies(book_id=1, count=2)
+
+        def book_update(book_id: int) -> BookUpdate:
+            return BookUpdate(
+                id=book_id,
+                title=f"Новая книга {book_id}",
+                description="",
+                genres="",
+                publication_date=date(2000, 1, 1),
+                author_id=1,
+                available=10,
+            )
+
+        book = await repository.update(obj_id=1, obj_in=book_update(1))
+        assert (book.title, book.available) == ("Новая книга 1", 2)
+
+        books = await repository.bulk_update([book_update(1), book_update(2)])
+        assert [book.available for book in books] == [2, 10]
+        assert await repository.update_available(book_id=1, delta=1) is None
+
+
+@pytest.mark.asyncio
+async def test_active_borrows_counter(test_db_session) -> None:
+    await create_books_and_readers(test_db_session, available=[1, 1, 1], readers=2)
+    for book_id in (1, 2):
+        assert await checkout(book_id=book_id, reader_id=1) == CheckoutOutcome.OK
+    assert await close(borrow_id=1) == ReturnOutcome.OK
+
+    async with session_factory() as session:
+        assert await BorrowRepository(session=session).get_borrows_count(reader_id=1) == 1
+
+    await test_db_session.execute(update(User).where(User.id == 2).values(active_borrows=3))
+    await test_db_session.commit()
+
+    assert await reconcile_active_borrows(session_factory, fix=False) == [(2, 3, 0)]
+    async with session_factory() as session:
+        assert await try_advisory_xact_lock(session, RECONCILE_ACTIVE_BORROWS_LOCK_KEY)
+        assert await reconcile_active_borrows(session_factory) == []
+    assert await reconcile_active_borrows(session_factory) == [(2, 3, 0)]
+    assert await reconcile_active_borrows(session_factory) == []
+
+
+@pytest.mark.asyncio
+async def test_concurrent_checkout_and_return_of_one_reader(test_db_session) -> None:
+    await create_books_and_readers(test_db_session, available=[2], readers=1)
+
+    for borrow_id in range(1, 40, 2):
+        assert await checkout(book_id=1, reader_id=1) == CheckoutOutcome.OK
+        outcomes = await asyncio.gather(close(borrow_id=borrow_id), checkout(book_id=1, reader_id=1))
+        assert outcomes == [ReturnOutcome.OK, CheckoutOutcome.OK]
+        assert await close(borrow_id=borrow_id + 1) == ReturnOutcome.OK
+
+    assert await test_db_session.scalar(select(Book.available)) == 2
+    assert await test_db_session.scalar(select(User.active_borrows)) == 0
+
+
+@pytest.mark.asyncio
+async def test_borrow_invalidation_events(monkeypatch, test_app, test_client, test_db_session) -> None:
+    await create_books_and_readers(test_db_session, available=[2, 2], readers=1)
+    test_app.dependency_overrides[has_reader_permissions] = lambda: User(id=1, username="reader0")
+    published = []
+
+    async def publish(model, ids) -> None:
+        published.append((model.__tablename__, list(ids)))
+
+    monkeypatch.setattr(invalidation_bus, "publish", publish)
+
+    # Выдачи и возвраты публикуют события для кэшей выдач и книг других процессов.
+    await test_client.post("/borrows/", params={"book_id": 1})
+    await test_client.patch("/borrows/1/return/")
+    await test_client.post("/borrows/batch/", json={"book_ids": [1, 2]})
+    await test_client.post("/borrows/return-batch/", json={"borrow_ids": [2, 3]})
+    assert [event for event in published if event[0] == "borrows"] == [
+        ("borrows", [1]),
+        ("borrows", [1]),
+        ("borrows", [2, 3]),
+        ("borrows", [2, 3]),
+    ]
+    assert ("books", [1, 2]) in published
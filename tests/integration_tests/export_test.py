@@ -0,0 +1,41 @@
+import csv
+import io
+
+import orjson
+import pytest
+
+from src.auth.api.auth_dependencies import has_reader_permissions
+from src.core.config import settings
+from tests.integration_tests.pagination_test import create_authors
+
+
+@pytest.mark.asyncio
+async def test_export_authors(test_app, test_client, test_db_session, monkeypatch) -> None:
+    await create_authors(test_db_session, 5)
+    test_app.dependency_overrides[has_reader_permissions] = lambda: None
+    monkeypatch.setattr(settings.export, "yield_per", 2)
+
+    response = await test_client.get("/authors/export/")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    rows = [orjson.loads(line) for line in response.content.splitlines()]
+    assert [row["name"] for row in rows] == [f"Автор {i}" for i in range(5)]
+    assert rows[0] == {"id": 1, "name": "Автор 0", "biography": "", "birth_date": "1900-01-01"}
+
+    response = await test_client.get("/authors/export/", params={"format": "csv"})
+    assert response.headers["content-disposition"] == 'attachment; filename="authors.csv"'
+    rows = list(csv.reader(io.StringIO(response.text)))
+    assert rows[0] == ["name", "biography", "birth_date", "id"]
+    assert rows[5] == ["Автор 4", "", "1900-01-05", "5"]
+
+    response = await test_client.get("/authors/export/", params={"format": "xml"})
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_export_empty_table(test_app, test_client) -> None:
+    test_app.dependency_overrides[has_reader_permissions] = lambda: None
+
+    response = await test_client.get("/authors/export/")
+    assert response.status_code == 200
+    assert response.content == b""
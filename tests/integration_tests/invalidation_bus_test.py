@@ -0,0 +1,85 @@
+import asyncio
+from contextlib import suppress
+
+import pytest
+
+from src.app.models.author_model import Author
+from src.app.models.book_model import Book
+from src.core.services.entity_cache import EntityCache
+from src.core.services.invalidation_bus import InvalidationBus
+
+
+def make_worker(test_redis_client) -> tuple[InvalidationBus, EntityCache]:
+    bus = InvalidationBus(channel="test_invalidation", redis_client_getter=lambda: test_redis_client)
+    cache = EntityCache(l1_ttl=60, l1_max_size=100, l2_ttl=60, store_getter=lambda: None)
+    bus.add_handler(cache.apply_invalidation)
+    return bus, cache
+
+
+async def wait_for(condition) -> None:
+    for _ in range(100):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("Condition was not met")
+
+
+@pytest.mark.asyncio
+async def test_invalidation_bus(test_redis_client) -> None:
+    writer_bus, writer_cache = make_worker(test_redis_client)
+    reader_bus, reader_cache = make_worker(test_redis_client)
+    reader_cache.set_local(("authors", 1), {"id": 1})
+    reader_cache.set_local(("authors", 2), {"id": 2})
+    reader_cache.set_local(("books", 1), {"id": 1})
+    listener = asyncio.create_task(reader_bus.run())
+    try:
+        await asyncio.wait_for(reader_bus.subscribed.wait(), timeout=1)
+        # Подписка сбрасывает кэши: события до неё могли быть пропущены.
+        assert reader_cache.get_local(("authors", 1)) is None
+        reader_cache.set_local(("authors", 1), {"id": 1})
+        reader_cache.set_local(("authors", 2), {"id": 2})
+        reader_cache.set_local(("books", 1), {"id": 1})
+
+        # Изменение в другом процессе сбрасывает только изменённые объекты.
+        seq = await writer_bus.publish(Author, [1])
+        await wait_for(lambda: reader_bus.last_seq == seq)
+        assert reader_cache.get_local(("authors", 1)) is None
+        assert reader_cache.get_local(("authors", 2)) == {"id": 2}
+
+        # Пропуск номера (событие потеряно) сбрасывает весь кэш процесса.
+        await test_redis_client.incr(writer_bus.seq_key)
+        seq = await writer_bus.publish(Book, [2])
+        await wait_for(lambda: reader_bus.last_seq == seq)
+        assert reader_cache.get_local(("authors", 2)) is None
+        assert reader_cache.get_local(("books", 1)) is None
+
+    finally:
+        listener.cancel()
+        with suppress(asyncio.CancelledError):
+            await listener
+
+
+@pytest.mark.asyncio
+async def test_invalidation_bus_bad_event(test_redis_client) -> None:
+    writer_bus, _ = make_worker(test_redis_client)
+    reader_bus, reader_cache = make_worker(test_redis_client)
+    listener = asyncio.create_task(reader_bus.run())
+    try:
+        await asyncio.wait_for(reader_bus.subscribed.wait(), timeout=1)
+        reader_cache.set_local(("authors", 1), {"id": 1})
+        reader_cache.set_local(("authors", 2), {"id": 2})
+
+        # Неразобранное событие сбрасывает кэши процесса, подписка продолжает работать.
+        await test_redis_client.publish(reader_bus.channel, b"not an event")
+        await wait_for(lambda: reader_cache.get_local(("authors", 1)) is None)
+        assert not listener.done()
+
+        reader_cache.set_local(("authors", 2), {"id": 2})
+        seq = await writer_bus.publish(Author, [2])
+        await wait_for(lambda: reader_bus.last_seq == seq)
+        assert reader_cache.get_local(("authors", 2)) is None
+
+    finally:
+        listener.cancel()
+        with suppress(asyncio.CancelledError):
+            await listener
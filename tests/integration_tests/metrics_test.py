@@ -0,0 +1,62 @@
+from datetime import date
+
+import pytest
+
+from src.app.models.author_model import Author
+from src.auth.services.token_service import token_service
+from src.core.database.db import db
+from src.core.metrics import DbUsageMiddleware, RequestDbUsage, metrics, request_db_usage
+from src.core.models.user_model import PermissionsEnum, User
+from src.core.repository.base_repository import BaseRepository
+
+
+@pytest.mark.asyncio
+async def test_request_db_usage(test_app, test_client, test_db_session) -> None:
+    test_app.add_middleware(DbUsageMiddleware)
+    # Без реплик read_session_getter должен вернуть сессию primary этого же запроса.
+    test_app.dependency_overrides.pop(db.read_session_getter)
+    admin = User(username="admin", hashed_password=b"", role=PermissionsEnum.ADMIN)
+    test_db_session.add_all([admin, Author(name="Автор", biography="", birth_date=date(1900, 1, 1))])
+    await test_db_session.commit()
+    metrics.clear()
+
+    # Токен не прошёл проверку до первого запроса к базе данных - соединение не берётся.
+    response = await test_client.get("/authors/1/", headers={"Authorization": "Bearer invalid"})
+    assert response.status_code == 401
+    assert metrics.counters["http.requests_without_db"] == 1
+    assert "db.test.checkouts" not in metrics.counters
+
+    # Проверка прав и чтение автора выполняются в одной сессии и одном соединении.
+    headers = {"Authorization": f"Bearer {token_service.create_access_token(admin)}"}
+    response = await test_client.get("/authors/1/", headers=headers)
+    assert response.status_code == 200
+    assert metrics.summaries["http.request.db_connections"].max == 1
+    assert metrics.summaries["http.request.db_checkouts"].max == 1
+    assert metrics.summaries["http.request.db_hold_seconds"].total > 0
+
+    response = await test_client.get("/metrics/", headers=headers)
+    assert set(response.json()["pools"]) == {"interactive", "bulk"}
+
+
+@pytest.mark.asyncio
+async def test_identity_map_lookups(test_db_session) -> None:
+    test_db_session.add(Author(name="Автор", biography="", birth_date=date(1900, 1, 1)))
+    await test_db_session.commit()
+    test_db_session.expunge_all()
+    repository = BaseRepository(session=test_db_session, model=Author)
+    usage = RequestDbUsage()
+    token = request_db_usage.set(usage)
+    try:
+        author = await repository.get_obj_by_id(obj_id=1)
+        # Повторные запросы того же объекта в этой сессии (запросе) обслуживаются из identity map.
+        assert await repository.get_obj_by_id(obj_id=1) is author
+        assert await repository.get_obj_by_id(obj_id=1, fields=["name"]) == {"id": 1, "name": "Автор"}
+        assert (usage.identity_map_hits, usage.identity_map_misses) == (2, 1)
+
+        # После rollback атрибуты объекта устаревают, и он перечитывается из базы данных.
+        await test_db_session.rollback()
+        assert await repository.get_obj_by_id(obj_id=1) is author
+        assert usage.identity_map_misses == 2
+
+    finally:
+        request_db_usage.reset(token)
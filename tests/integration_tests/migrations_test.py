@@ -0,0 +1,40 @@
+import pytest
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.runtime.migration import MigrationContext
+from sqlalchemy import text
+
+from src.core.database.migrations import check_schema_revision, get_alembic_config
+from src.core.models.registry import Base
+from tests.conftest import test_engine
+
+
+def run_alembic(conn, action, revision: str) -> None:
+    # Миграции управляют транзакциями сами (CREATE INDEX CONCURRENTLY выполняется вне транзакции).
+    config = get_alembic_config()
+    config.attributes["connection"] = conn
+    config.attributes["configure_logger"] = False
+    action(config, revision)
+
+
+@pytest.mark.asyncio
+async def test_migrations_match_models() -> None:
+    async with test_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    async with test_engine.connect() as conn:
+        await conn.run_sync(run_alembic, command.upgrade, "head")
+        diff = await conn.run_sync(
+            lambda sync_conn: compare_metadata(MigrationContext.configure(sync_conn), Base.metadata)
+        )
+    assert diff == []
+    await check_schema_revision(test_engine)
+
+    async with test_engine.connect() as conn:
+        await conn.run_sync(run_alembic, command.downgrade, "0001")
+    with pytest.raises(RuntimeError):
+        await check_schema_revision(test_engine)
+
+    async with test_engine.connect() as conn:
+        await conn.run_sync(run_alembic, command.downgrade, "base")
+    async with test_engine.begin() as conn:
+        await conn.execute(text("DROP TABLE alembic_version"))
@@ -0,0 +1,202 @@
+from datetime import date
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import text
+
+from src.app.models.author_model import Author
+from src.app.models.book_model import Book
+from src.auth.api.auth_dependencies import has_reader_permissions
+from src.core.models.column_registry import column_registry
+from src.core.models.user_model import User
+from src.core.repository.fetcher_repository import FetcherRepository
+from src.core.schemas.filter_schema import parse_filter_clause
+from src.core.services.count_cache import CountCache
+from src.core.services.paginated_fetcher import PaginatedFetcher
+
+
+async def create_authors(session, count: int) -> None:
+    session.add_all([Author(name=f"Автор {i}", biography="", birth_date=date(1900, 1, 1 + i)) for i in range(count)])
+    await session.commit()
+
+
+@pytest.mark.asyncio
+async def test_cursor_pagination(test_db_session) -> None:
+    await create_authors(test_db_session, 5)
+    repository = FetcherRepository(session=test_db_session)
+
+    first_page = await PaginatedFetcher(repository, offset=0, limit=2, field=None, value=None).get_paginated_list(
+        Author
+    )
+    assert first_page["totalCount"] == 5
+    assert first_page["nextCursor"]
+
+    names = [author.name for author in first_page["data"]]
+    cursor = first_page["nextCursor"]
+    while cursor:
+        page = await PaginatedFetcher(
+            repository, offset=0, limit=2, field=None, value=None, after=cursor
+        ).get_paginated_list(Author)
+        names.extend(author.name for author in page["data"])
+        cursor = page["nextCursor"]
+
+    assert names == [f"Автор {i}" for i in range(5)]
+
+
+@pytest.mark.asyncio
+async def test_invalid_cursor(test_app, test_client) -> None:
+    test_app.dependency_overrides[has_reader_permissions] = lambda: None
+    response = await test_client.get("/authors/", params={"limit": 2, "after": "broken"})
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_combined_page_with_total(test_db_session) -> None:
+    author = Author(name="Автор", biography="", birth_date=date(1900, 1, 1))
+    test_db_session.add(author)
+    await test_db_session.flush()
+    test_db_session.add_all(
+        [
+            Book(
+                title=f"Книга {i}",
+                description="",
+                genres="",
+                publication_date=date(2000, 1, 1),
+                available=i % 2,
+                author_id=author.id,
+            )
+            for i in range(5)
+        ]
+    )
+    await test_db_session.commit()
+    repository = FetcherRepository(session=test_db_session)
+
+    data, total = await repository.get_page_with_total(Book, offset=1, limit=2, filter_dict={"available": 1})
+    assert total == 2
+    assert [book.title for book in data] == ["Книга 3"]
+
+    data, total = await repository.get_page_with_total(Book, offset=100, limit=2, filter_dict={})
+    assert total == 5
+    assert data == []
+
+    columns = repository.get_field_columns(Book, ["title"])
+    data, total = await repository.get_page_with_total(Book, offset=0, limit=2, filter_dict={}, columns=columns)
+    assert total == 5
+    assert data == [{"id": 1, "title": "Книга 0"}, {"id": 2, "title": "Книга 1"}]
+
+
+@pytest.mark.asyncio
+async def test_total_count_modes(test_db_session) -> None:
+    await create_authors(test_db_session, 3)
+    repository = FetcherRepository(session=test_db_session)
+    cache = CountCache(ttl=60, max_size=10)
+
+    page = await PaginatedFetcher(
+        repository, offset=0, limit=10, field=None, value=None, count_cache=cache
+    ).get_paginated_list(Author)
+    assert page["totalCount"] == 3
+    assert cache.get(model=Author, filter_dict={}) == 3
+
+    cache.invalidate(Author)
+    assert cache.get(model=Author, filter_dict={}) is None
+
+    page = await PaginatedFetcher(
+        repository, offset=0, limit=10, field=None, value=None, include_total=False
+    ).get_paginated_list(Author)
+    assert page["totalCount"] is None
+    assert len(page["data"]) == 3
+
+    page = await PaginatedFetcher(
+        repository, offset=0, limit=10, field=None, value=None, approximate_total=True
+    ).get_paginated_list(Author)
+    assert page["totalCount"] == 3
+
+
+@pytest.mark.asyncio
+async def test_approximate_total_from_statistics(test_db_session) -> None:
+    await create_authors(test_db_session, 3)
+    await test_db_session.execute(text("ANALYZE authors"))
+    repository = FetcherRepository(session=test_db_session)
+    assert await repository.get_approximate_count(Author) == 3
+
+    # Статистика не обновляется при вставке, approximate_total возвращает reltuples, а не точный подсчёт.
+    test_db_session.add(Author(name="Автор 3", biography="", birth_date=date(1900, 1, 4)))
+    await test_db_session.commit()
+    page = await PaginatedFetcher(
+        repository, offset=0, limit=10, field=None, value=None, approximate_total=True
+    ).get_paginated_list(Author)
+    assert page["totalCount"] == 3
+    assert len(page["data"]) == 4
+
+
+@pytest.mark.asyncio
+async def test_filter_grammar(test_db_session) -> None:
+    authors = [Author(name=f"Автор {i}", biography="", birth_date=date(1900, 1, 1)) for i in range(2)]
+    test_db_session.add_all(authors)
+    await test_db_session.flush()
+    test_db_session.add_all(
+        [
+            Book(
+                title=f"Книга {i}",
+                description="",
+                genres="",
+                publication_date=date(2000 + i, 1, 1),
+                available=i,
+                author_id=authors[i % 2].id,
+            )
+            for i in range(6)
+        ]
+    )
+    await test_db_session.commit()
+    repository = FetcherRepository(session=test_db_session)
+
+    async def titles(*raw_filters: str) -> list[str]:
+        filters = [parse_filter_clause(raw) for raw in raw_filters]
+        page = await PaginatedFetcher(
+            repository, offset=0, limit=10, field=None, value=None, filters=filters
+        ).get_paginated_list(Book)
+        assert page["totalCount"] == len(page["data"])
+        return [book.title for book in page["data"]]
+
+    assert await titles("available:gt:3") == ["Книга 4", "Книга 5"]
+    assert await titles("publication_date:between:2001-01-01,2002-12-31") == ["Книга 1", "Книга 2"]
+    assert await titles(f"author_id:in:{authors[1].id}", "available:lt:4") == ["Книга 1", "Книга 3"]
+    assert await titles("title:prefix:Книга 5") == ["Книга 5"]
+
+    with pytest.raises(HTTPException) as error:
+        await titles("genres:eq:роман")
+    assert error.value.status_code == 422
+
+    with pytest.raises(HTTPException):
+        await titles("available:gt:много")
+
+    with pytest.raises(HTTPException):
+        await titles("publication_date:prefix:2001")
+
+    assert all(
+        column_registry.get_column(model, field).pattern_indexed
+        for model, field in ((Book, "title"), (Author, "name"), (User, "username"))
+    )
+
+    with pytest.raises(HTTPException):
+        repository.get_filter_dict(model=Book, field="publication_date", value="вчера")
+
+
+@pytest.mark.asyncio
+async def test_sparse_fieldsets(test_app, test_client, test_db_session) -> None:
+    await create_authors(test_db_session, 3)
+    test_app.dependency_overrides[has_reader_permissions] = lambda: None
+
+    response = await test_client.get("/authors/", params={"limit": 2, "fields": "name"})
+    assert response.status_code == 200
+    assert response.json()["data"] == [{"id": 1, "name": "Автор 0"}, {"id": 2, "name": "Автор 1"}]
+    assert response.json()["nextCursor"]
+
+    response = await test_client.get("/authors/3/", params={"fields": "birth_date"})
+    assert response.json() == {"id": 3, "birth_date": "1900-01-03"}
+
+    response = await test_client.get("/authors/3/")
+    assert set(response.json()) == {"id", "name", "biography", "birth_date"}
+
+    response = await test_client.get("/authors/", params={"limit": 2, "fields": "name,password"})
+    assert response.status_code == 422
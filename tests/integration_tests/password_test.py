@@ -0,0 +1,54 @@
+import asyncio
+import time
+
+import pytest
+
+from src.auth.repository.auth_repository import AuthRepository
+from src.auth.services.auth_service import AuthService
+from src.auth.services.password_service import PasswordManager
+from src.core.models.user_model import User
+from src.core.schemas.user_schema import UserChangePassword
+
+
+@pytest.mark.asyncio
+async def test_update_password(test_db_session, test_token_repository) -> None:
+    passwords_manager = PasswordManager(max_workers=2)
+    user = User(username="reader", hashed_password=await passwords_manager.hash_password("old"))
+    test_db_session.add(user)
+    await test_db_session.commit()
+    auth_service = AuthService(
+        auth_repository=AuthRepository(session=test_db_session),
+        passwords_manager=passwords_manager,
+        token_repository=test_token_repository,
+        token_service=None,
+    )
+
+    await auth_service.update_password(
+        user=user, credentials=UserChangePassword(old_password="old", new_password="new", confirm_password="new")
+    )
+
+    await test_db_session.refresh(user)
+    assert await passwords_manager.validate_password(password="new", hashed_password=user.hashed_password)
+    assert not await passwords_manager.validate_password(password="old", hashed_password=user.hashed_password)
+    assert await test_token_repository.get_token_version(user_id=user.id) == 1
+    passwords_manager.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_hashing_does_not_block_event_loop() -> None:
+    passwords_manager = PasswordManager(max_workers=2)
+    ticks = []
+
+    async def ticker() -> None:
+        while True:
+            ticks.append(time.perf_counter())
+            await asyncio.sleep(0.01)
+
+    ticker_task = asyncio.create_task(ticker())
+    await asyncio.gather(*(passwords_manager.hash_password("password") for _ in range(4)))
+    ticker_task.cancel()
+    passwords_manager.shutdown()
+
+    # Пока bcrypt считает в пуле потоков, цикл событий продолжает обслуживать другие задачи.
+    assert max(b - a for a, b in zip(ticks, ticks[1:])) < 0.1
+    assert passwords_manager.in_flight == 0
@@ -0,0 +1,106 @@
+import time
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine
+from starlette.requests import Request
+
+from src.core.config import EngineSettings
+from src.core.database.db import DatabaseManager, EngineName
+from src.core.database.replicas import LAST_WRITE_COOKIE, ReadYourWritesMiddleware, RecentWrites, reads_from_replica
+from tests.conftest import DATABASE_URL_TEST
+
+REPLICA_URL = make_url(DATABASE_URL_TEST).set(database="librarytest_replica")
+DOWN_REPLICA_URL = make_url(DATABASE_URL_TEST).set(port=1)
+
+
+async def create_replica_database() -> None:
+    engine = create_async_engine(make_url(DATABASE_URL_TEST).set(database="postgres"), isolation_level="AUTOCOMMIT")
+    async with engine.connect() as conn:
+        exists = await conn.scalar(text("SELECT 1 FROM pg_database WHERE datname = 'librarytest_replica'"))
+        if not exists:
+            await conn.execute(text("CREATE DATABASE librarytest_replica"))
+    await engine.dispose()
+
+
+def make_request(cookies: dict | None = None, user_id: int | None = None) -> Request:
+    cookie = "; ".join(f"{key}={value}" for key, value in (cookies or {}).items())
+    return Request({"type": "http", "headers": [(b"cookie", cookie.encode())], "state": {"user_id": user_id}})
+
+
+async def read_database_name(manager: DatabaseManager, request: Request) -> str:
+    async with manager.session_factory() as primary_session:
+        async for session in manager.read_session_getter(request, session=primary_session):
+            return await session.scalar(text("SELECT current_database()"))
+
+
+@pytest.mark.asyncio
+async def test_read_session_routing(test_redis_client) -> None:
+    await create_replica_database()
+    manager = DatabaseManager(
+        db_url=DATABASE_URL_TEST,
+        engines={EngineName.INTERACTIVE: EngineSettings(), EngineName.BULK: EngineSettings()},
+        replica_urls=[REPLICA_URL.render_as_string(hide_password=False), DOWN_REPLICA_URL.render_as_string(False)],
+    )
+    manager.recent_writes.redis_client_getter = lambda: test_redis_client
+    try:
+        # Вторая реплика недоступна: чтение переходит на первую, вторая исключается из выбора.
+        assert [await read_database_name(manager, make_request()) for _ in range(3)] == ["librarytest_replica"] * 3
+        assert len(manager.replicas.get_candidates()) == 1
+
+        async with manager.read_session_factory() as read_session:
+            assert not reads_from_replica(read_session)
+            await read_session.scalar(text("SELECT 1"))
+            assert reads_from_replica(read_session)
+
+        recent_write = make_request({LAST_WRITE_COOKIE: time.time()})
+        assert await read_database_name(manager, recent_write) == "librarytest"
+        old_write = make_request({LAST_WRITE_COOKIE: time.time() - 60})
+        assert await read_database_name(manager, old_write) == "librarytest_replica"
+
+        # Запись пользователя через другой процесс: чтение с primary с любого клиента этого пользователя.
+        other_process = RecentWrites(window_seconds=5, redis_client_getter=lambda: test_redis_client)
+        await other_process.record(user_id=1)
+        assert await read_database_name(manager, make_request(user_id=1)) == "librarytest"
+        assert await read_database_name(manager, make_request(user_id=2)) == "librarytest_replica"
+
+        manager.replicas.mark_down(manager.replicas.engines[0])
+        assert await read_database_name(manager, make_request()) == "librarytest"
+        async with manager.read_session_factory() as read_session:
+            await read_session.scalar(text("SELECT 1"))
+            assert not reads_from_replica(read_session)
+
+    finally:
+        await manager.dispose()
+
+
+@pytest.mark.asyncio
+async def test_read_your_writes_middleware(test_redis_client) -> None:
+    recent_writes = RecentWrites(window_seconds=5, redis_client_getter=lambda: test_redis_client)
+    app = FastAPI()
+    app.add_middleware(
+        ReadYourWritesMiddleware,
+        window_seconds=5,
+        recent_writes=recent_writes,
+        user_id_getter=lambda token: {"token-1": 1, "token-2": 2}.get(token),
+    )
+    app.get("/items/")(lambda: [])
+    app.post("/items/")(lambda: {})
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        assert LAST_WRITE_COOKIE not in (await client.get("/items/")).cookies
+        assert LAST_WRITE_COOKIE in (await client.post("/items/")).cookies
+        assert LAST_WRITE_COOKIE not in (await client.put("/items/")).cookies
+
+        await client.get("/items/", headers={"Authorization": "Bearer token-2"})
+        await client.post("/items/", headers={"Authorization": "Bearer token-1"})
+        await client.put("/items/", headers={"Authorization": "Bearer token-2"})
+        await client.post("/items/", headers={"Authorization": "Bearer unknown"})
+
+    # Запись видна и процессу без локальной отметки.
+    other_process = RecentWrites(window_seconds=5, redis_client_getter=lambda: test_redis_client)
+    assert await other_process.has_recent_write(1)
+    assert not await other_process.has_recent_write(2)
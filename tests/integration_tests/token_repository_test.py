@@ -0,0 +1,23 @@
+import pytest
+from fastapi import HTTPException
+from redis.asyncio import Redis
+
+from src.auth.repository.token_repository import TokenRepository
+from src.core.errors.auth_errors import AUTHENTICATION_UNAVAILABLE
+
+
+@pytest.mark.asyncio
+async def test_token_version_without_redis() -> None:
+    redis_client = Redis.from_url("redis://localhost:1/1")
+    token_repository = TokenRepository(redis_client=redis_client, version_cache_seconds=0)
+    token_repository.cache_token_version(user_id=1, version=3)
+
+    # Redis недоступен: используется версия из кэша процесса, даже устаревшая.
+    assert await token_repository.get_token_version(user_id=1) == 3
+    assert await token_repository.get_token_version(user_id=1, use_cache=False) == 3
+
+    # Версии нет в кэше процесса: проверка токена невозможна.
+    with pytest.raises(HTTPException) as exc_info:
+        await token_repository.get_token_version(user_id=2)
+    assert exc_info.value is AUTHENTICATION_UNAVAILABLE
+    await redis_client.aclose()
@@ -0,0 +1,44 @@
+import time
+
+from src.core.services.entity_cache import EntityKey
+
+
+class MemoryEntityStore:
+    """
+    Хранилище L2 кэша объектов в памяти (см. EntityStore) для тестов EntityCache без Redis.
+
+    Один экземпляр, общий для нескольких EntityCache, моделирует Redis, общий для нескольких процессов.
+    """
+
+    def __init__(self):
+        self.entries: dict[EntityKey, tuple[bytes, float]] = {}
+        self.versions: dict[EntityKey | str, tuple[int, float]] = {}
+
+    def get_version(self, key: EntityKey | str) -> int:
+        version, expires_at = self.versions.get(key, (0, 0))
+        return version if expires_at > time.monotonic() else 0
+
+    def bump_version(self, key: EntityKey | str, ttl: int) -> None:
+        self.versions[key] = (self.get_version(key) + 1, time.monotonic() + ttl)
+
+    async def get(self, key: EntityKey) -> tuple[bytes | None, tuple[int, int]]:
+        value, expires_at = self.entries.get(key, (None, 0))
+        version = (self.get_version(key[0]), self.get_version(key))
+        return (value if expires_at > time.monotonic() else None), version
+
+    async def fill(self, key: EntityKey, version: tuple[int, int], value: bytes, ttl: int) -> bool:
+        if version != (self.get_version(key[0]), self.get_version(key)):
+            return False
+
+        self.entries[key] = (value, time.monotonic() + ttl)
+        return True
+
+    async def invalidate(self, keys: list[EntityKey], ttl: int) -> None:
+        for key in keys:
+            self.entries.pop(key, None)
+            self.bump_version(key, ttl)
+
+    async def invalidate_table(self, table: str, ttl: int) -> None:
+        self.bump_version(table, ttl)
+        for key in [key for key in self.entries if key[0] == table]:
+            del self.entries[key]
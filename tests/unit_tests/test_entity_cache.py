@@ -0,0 +1,109 @@
+import asyncio
+
+import pytest
+from redis.exceptions import ConnectionError
+
+from src.app.models.author_model import Author
+from src.core.metrics import metrics
+from src.core.services.entity_cache import EntityCache
+from tests.memory_entity_store import MemoryEntityStore
+
+AUTHOR = {"id": 1, "name": "Автор"}
+
+
+def make_cache(store) -> EntityCache:
+    return EntityCache(l1_ttl=5, l1_max_size=10, l2_ttl=5, store_getter=lambda: store)
+
+
+async def load_author() -> dict:
+    return AUTHOR
+
+
+@pytest.mark.asyncio
+async def test_entity_cache_levels() -> None:
+    store = MemoryEntityStore()
+    cache, other_cache = make_cache(store), make_cache(store)
+    metrics.clear()
+
+    assert await cache.get_or_load(Author, 1, load_author) == AUTHOR
+    assert await cache.get_or_load(Author, 1, load_author) == AUTHOR
+    # Другой процесс (пустой L1) читает автора из L2.
+    assert await other_cache.get_or_load(Author, 1, load_author) == AUTHOR
+    stats = cache.get_stats()
+    assert (stats["l1_hits"], stats["l2_hits"], stats["misses"]) == (1, 1, 1)
+
+    # Изменение удаляет автора из L1 своего процесса и из L2.
+    await cache.invalidate(Author, [1])
+    assert cache.get_local(("authors", 1)) is None
+    assert (await store.get(("authors", 1)))[0] is None
+
+
+@pytest.mark.asyncio
+async def test_entity_cache_single_flight() -> None:
+    cache = make_cache(None)
+    loads = []
+
+    async def load() -> dict:
+        loads.append(1)
+        await asyncio.sleep(0.05)
+        return AUTHOR
+
+    results = await asyncio.gather(*(cache.get_or_load(Author, 1, load) for _ in range(10)))
+
+    assert len(loads) == 1
+    assert all(result == AUTHOR for result in results)
+
+
+@pytest.mark.asyncio
+async def test_entity_cache_fill_after_invalidation() -> None:
+    # Два процесса с общим L2: второй изменяет автора во время загрузки первым.
+    store = MemoryEntityStore()
+    cache, other_cache = make_cache(store), make_cache(store)
+
+    async def load_before_update() -> dict:
+        await other_cache.invalidate(Author, [1])
+        return AUTHOR
+
+    async def load_before_model_update() -> dict:
+        await other_cache.invalidate_model(Author)
+        return AUTHOR
+
+    for load in (load_before_update, load_before_model_update):
+        assert await cache.get_or_load(Author, 1, load) == AUTHOR
+        assert (await store.get(("authors", 1)))[0] is None
+        cache.clear()
+
+    async def load_after_update() -> dict:
+        return {"id": 1, "name": "Новый автор"}
+
+    assert await other_cache.get_or_load(Author, 1, load_after_update) == {"id": 1, "name": "Новый автор"}
+    assert await cache.get_or_load(Author, 1, load_before_update) == {"id": 1, "name": "Новый автор"}
+
+
+@pytest.mark.asyncio
+async def test_entity_cache_replica_fill() -> None:
+    store = MemoryEntityStore()
+    cache = make_cache(store)
+
+    # Прочитанный с реплики автор сохраняется только в L1.
+    assert await cache.get_or_load(Author, 1, load_author, from_replica=lambda: True) == AUTHOR
+    assert (await store.get(("authors", 1)))[0] is None
+    assert cache.get_local(("authors", 1)) == AUTHOR
+
+
+class FailingEntityStore(MemoryEntityStore):
+    async def get(self, key):
+        raise ConnectionError("L2 is unavailable")
+
+    async def invalidate(self, keys, ttl):
+        raise ConnectionError("L2 is unavailable")
+
+
+@pytest.mark.asyncio
+async def test_entity_cache_l2_errors() -> None:
+    cache = make_cache(FailingEntityStore())
+
+    # Ошибки L2 не прерывают запрос: объект читается из базы данных.
+    assert await cache.get_or_load(Author, 1, load_author) == AUTHOR
+    await cache.invalidate(Author, [1])
+    assert cache.get_local(("authors", 1)) is None
@@ -0,0 +1,52 @@
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519
+
+from src.auth.services.token_service import JWTokenManager
+from src.core.config import settings
+
+
+def write_key_pair(private_key, directory, name: str) -> tuple:
+    private_path, public_path = directory / f"{name}_private.pem", directory / f"{name}_public.pem"
+    private_path.write_bytes(
+        private_key.private_bytes(
+            serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+        )
+    )
+    public_path.write_bytes(
+        private_key.public_key().public_bytes(
+            serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+        )
+    )
+    return private_path, public_path
+
+
+def use_key(monkeypatch, private_path, public_path, algorithm: str, key_id: str, previous: dict) -> JWTokenManager:
+    monkeypatch.setattr(settings.auth_jwt, "private_key_path", private_path)
+    monkeypatch.setattr(settings.auth_jwt, "public_key_path", public_path)
+    monkeypatch.setattr(settings.auth_jwt, "algorithm", algorithm)
+    monkeypatch.setattr(settings.auth_jwt, "key_id", key_id)
+    monkeypatch.setattr(settings.auth_jwt, "previous_public_key_paths", previous)
+    return JWTokenManager(verified_cache_size=10)
+
+
+def test_key_rotation(monkeypatch, tmp_path) -> None:
+    old_private, old_public = write_key_pair(ec.generate_private_key(ec.SECP256R1()), tmp_path, "old")
+    new_private, new_public = write_key_pair(ed25519.Ed25519PrivateKey.generate(), tmp_path, "new")
+
+    old_manager = use_key(monkeypatch, old_private, old_public, "ES256", key_id="old", previous={})
+    old_token = old_manager.encode_jwt(payload={"sub": "1"}, expire_seconds=60)
+
+    # После ротации токены старого ключа принимаются, пока его kid указан в previous_public_key_paths.
+    manager = use_key(monkeypatch, new_private, new_public, "EdDSA", key_id="new", previous={"old": old_public})
+    new_token = manager.encode_jwt(payload={"sub": "2"}, expire_seconds=60)
+    assert manager.decode_jwt(old_token)["sub"] == "1"
+    assert manager.decode_jwt(new_token)["sub"] == "2"
+    assert new_token in manager._verified
+
+    manager = use_key(monkeypatch, new_private, new_public, "EdDSA", key_id="new", previous={})
+    assert manager.decode_jwt(old_token) is None
+
+    manager = use_key(monkeypatch, new_private, new_public, "ES256", key_id="new", previous={})
+    with pytest.raises(ValueError):
+        manager.encode_jwt(payload={"sub": "2"}, expire_seconds=60)